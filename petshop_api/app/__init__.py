@@ -1,58 +1,55 @@
 # File: app/__init__.py
 
-from flask import Flask, request
-from config import Config
+from flask import Flask
+from config import config_by_name
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
-import logging
+from .database import RoutingSession, configure_engines
+from .request_logging import init_request_logging
+from .metrics import init_metrics
+from .compression import init_compression
+from .json_provider import PetshopJSONProvider
+from .passwords import init_password_hashing
+import os
 
 # Inisialisasi Database
-db = SQLAlchemy()
+# RoutingSession: query GET dari blueprint tertentu bisa dibaca dari read replica
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
-def create_app(config_class=Config):
+def create_app(config_class=None):
     app = Flask(__name__)
+    # Tanpa argumen: pilih profil dari APP_ENV (default: Config)
+    if config_class is None:
+        config_class = config_by_name[os.environ.get('APP_ENV', 'default')]
     app.config.from_object(config_class)
 
+    # JSON cepat (orjson) + format datetime/date seragam untuk semua jsonify()
+    app.json = PetshopJSONProvider(app)
+
     # Aktifkan CORS supaya Flutter bisa akses
     CORS(app)
 
+    configure_engines(app)
     db.init_app(app)
 
     # ============================================================
-    # MULAI KODE LOGGER (DEBUG TERMINAL)
+    # LOGGER REQUEST (JSON, lewat antrian supaya tidak memblokir request)
     # ============================================================
-    
-    # 1. Setting Format Log biar Rapi
-    # Format: [WAKTU] - [TIPE] - [PESAN]
-    logging.basicConfig(level=logging.INFO, 
-                        format='%(asctime)s - %(levelname)s - %(message)s')
-    
-    # 2. CCTV Masuk (Mencatat Request dari HP/Flutter)
-    @app.before_request
-    def log_request_info():
-        # Jangan log request gambar (biar terminal gak penuh spam)
-        if not request.path.startswith('/static'):
-            app.logger.info('================================================')
-            app.logger.info(f'📢 TERIMA REQUEST: {request.method} {request.url}')
-            # Cek kalau ada data JSON yang dikirim
-            if request.is_json:
-                app.logger.info(f'📦 DATA MASUK: {request.get_json()}')
-    
-    # 3. CCTV Keluar (Mencatat Respon ke HP/Flutter)
-    @app.after_request
-    def log_response_info(response):
-        if not request.path.startswith('/static'):
-            status = response.status_code
-            if status >= 400:
-                app.logger.error(f'❌ GAGAL/ERROR: Status {status}')
-            else:
-                app.logger.info(f'✅ SUKSES: Status {status}')
-            app.logger.info('================================================\n')
-        return response
+    # Setiap request dicatat 1 baris JSON: method, path, status, durasi,
+    # dan body JSON (password disensor, ukuran dibatasi).
+    # Atur lewat LOG_SAMPLE_RATE, LOG_SLOW_MS, LOG_BODY_MAX_BYTES di Config.
+    init_request_logging(app)
 
-    # ============================================================
-    # SELESAI KODE LOGGER
-    # ============================================================
+    # Profil SQL per request, header Server-Timing & GET /metrics (Prometheus).
+    # Dipasang SETELAH logger supaya ringkasan SQL sudah ada saat request dicatat.
+    init_metrics(app)
+
+    # Kompresi gzip/brotli sesuai Accept-Encoding (body besar saja, dengan jatah CPU).
+    # Dipasang SETELAH metrik supaya waktu kompresi ikut terhitung di Server-Timing.
+    init_compression(app)
+
+    # Hash password di pool terpisah dengan parameter dari Config
+    init_password_hashing(app)
 
     # -----------------------------------------------------------
     # PENDAFTARAN BLUEPRINT (JANGAN DIHAPUS/DIUBAH)
@@ -82,4 +79,55 @@ def create_app(config_class=Config):
     from .api import admin_routes
     app.register_blueprint(admin_routes.bp)
 
+    # 7. Cart Routes
+    from .api import cart_routes
+    app.register_blueprint(cart_routes.bp)
+
+    # 8. Media Routes (varian gambar upload: GET /media/<file>)
+    from .api import media_routes
+    app.register_blueprint(media_routes.bp)
+
+    # Perintah CLI migrasi: flask --app run db-upgrade / db-status / db-revision
+    from .migrate import db_upgrade_command, db_status_command, db_revision_command
+    app.cli.add_command(db_upgrade_command)
+    app.cli.add_command(db_status_command)
+    app.cli.add_command(db_revision_command)
+
+    # Cek rencana query endpoint hot (EXPLAIN): flask --app run db-explain-check
+    from .query_plans import db_explain_check_command
+    app.cli.add_command(db_explain_check_command)
+
+    # Statistik dashboard: perintah rebuild manual + rekonsiliasi berkala
+    from .stats import stats_rebuild_command, start_reconciler
+    app.cli.add_command(stats_rebuild_command)
+    start_reconciler(app)
+
+    # Isi slot booking: perintah rebuild manual
+    from .booking_slots import slots_rebuild_command
+    app.cli.add_command(slots_rebuild_command)
+
+    # Ringkasan order (kolom snapshot checkout): isi order lama per batch
+    from .order_summary import orders_backfill_summary_command
+    app.cli.add_command(orders_backfill_summary_command)
+
+    # Order/booking belum dibayar: sweeper background + perintah manual
+    from .expiry import expire_unpaid_command, start_expiry_scheduler
+    app.cli.add_command(expire_unpaid_command)
+    start_expiry_scheduler(app)
+
+    # Gambar upload: pool pembuat varian + perintah rebuild/import asset bawaan
+    from .images import init_images, images_rebuild_command, images_import_assets_command
+    init_images(app)
+    app.cli.add_command(images_rebuild_command)
+    app.cli.add_command(images_import_assets_command)
+
+    # Arsip order/booking lama: perintah manual + jadwal background (opsional)
+    from .archive import archive_run_command, start_archiver
+    app.cli.add_command(archive_run_command)
+    start_archiver(app)
+
+    # Idempotency-Key kadaluarsa: perintah hapus manual (juga dihapus oleh sweeper)
+    from .idempotency import idempotency_purge_command
+    app.cli.add_command(idempotency_purge_command)
+
     return app
\ No newline at end of file
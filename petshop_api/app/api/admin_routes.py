@@ -1,8 +1,20 @@
 # File: app/api/admin_routes.py
 
 from flask import Blueprint, jsonify, request, current_app
-from app.models import Order, Booking, User, Item, db
-from sqlalchemy import func
+from app.models import Order, Booking, User, Item, OrderArchive, BookingArchive, db
+from app.service_cache import service_catalog
+from app.images import image_url
+from app.database import pool_status
+from app import stats
+from app import order_summary
+from app.archive import page_with_archive
+from app.catalog_cache import catalog_cache
+from app.status_flow import (ORDER_TRANSITIONS, BOOKING_TRANSITIONS, MAX_BULK_IDS, TransitionConflict,
+                             bulk_update_orders, bulk_update_bookings)
+from app.pagination import (PaginationError, parse_limit, parse_date, parse_statuses,
+                            decode_cursor, date_range_filter)
+from sqlalchemy.orm import joinedload, selectinload, lazyload
+from datetime import date
 
 bp = Blueprint('admin_api', __name__, url_prefix='/api/admin')
 
@@ -11,30 +23,15 @@ bp = Blueprint('admin_api', __name__, url_prefix='/api/admin')
 # ---------------------------------------------------------------------
 @bp.route('/stats', methods=['GET'])
 def get_stats():
-    # 1. Hitung Total Uang dari ORDERS (Jual Beli Barang)
-    order_revenue = db.session.query(func.sum(Order.total_harga)).scalar() or 0
- 
-    # 2. Hitung Total Uang dari BOOKINGS (Jasa Grooming/Hotel)
-    booking_revenue = db.session.query(func.sum(Booking.total_harga)).scalar() or 0
+    # Semua angka dibaca dari tabel ringkasan daily_stats (diupdate setiap
+    # ada order/booking baru atau status berubah), bukan hitung ulang
+    # tabel orders/bookings. Pendapatan tidak termasuk yang 'batal'.
+    days = max(1, min(request.args.get('days', 7, type=int), 90))
+    result = stats.summary(days)
 
-    # 3. Gabungkan keduanya
-    total_revenue = order_revenue + booking_revenue
+    current_app.logger.info(f"📊 ADMIN MEMBUKA DASHBOARD (Total Omzet: Rp {result['revenue']})")
 
-    # Hitung jumlah data lain
-    total_orders = Order.query.count()
-    total_bookings = Booking.query.count()
-    
-    # Menghitung user client saja (selain admin)
-    total_users = User.query.filter(User.role != 'admin').count()
-
-    current_app.logger.info(f"📊 ADMIN MEMBUKA DASHBOARD (Total Omzet: Rp {total_revenue})")
-
-    return jsonify({
-        'revenue': int(total_revenue),      # Pastikan jadi integer
-        'total_orders': total_orders,
-        'total_bookings': total_bookings,
-        'total_users': total_users
-    })
+    return jsonify(result)
 
 
 # ---------------------------------------------------------------------
@@ -42,22 +39,44 @@ def get_stats():
 # ---------------------------------------------------------------------
 @bp.route('/orders', methods=['GET'])
 def get_all_orders():
-    orders = Order.query.order_by(Order.created_at.desc()).all()
+    # Paging pakai cursor (keyset) di (created_at, id), bukan OFFSET,
+    # jadi halaman ke-100 sama cepatnya dengan halaman pertama.
+    # Filter: ?status=a,b &date_from=YYYY-MM-DD &date_to=YYYY-MM-DD
+    #         &user_id=<id> &customer=<nama> &limit=20 &cursor=<next_cursor>
+    try:
+        limit = parse_limit(request.args)
+        statuses = parse_statuses(request.args)
+        date_from = parse_date(request.args.get('date_from'), 'date_from')
+        date_to = parse_date(request.args.get('date_to'), 'date_to')
+        cursor = request.args.get('cursor')
+        cursor_value = decode_cursor(cursor) if cursor else None
+    except PaginationError as e:
+        return jsonify({'message': str(e)}), 400
+
+    # Daftar cukup dari tabel orders (kolom ringkasan ditulis saat checkout):
+    # detail & item tidak dimuat, nama customer 1 query IN per halaman.
+    # Filter yang sama dipakai untuk tabel arsip (orders_archive).
+    def build(model):
+        query = model.query.options(
+            selectinload(model.user),
+            lazyload(model.details)
+        )
+        if statuses:
+            query = query.filter(model.status.in_(statuses))
+        query = query.filter(*date_range_filter(model.created_at, date_from, date_to))
+        if request.args.get('user_id', type=int):
+            query = query.filter(model.user_id == request.args.get('user_id', type=int))
+        if request.args.get('customer'):
+            query = query.join(User, model.user_id == User.id).filter(
+                User.nama_lengkap.ilike(f"%{request.args['customer']}%"))
+        return query
+
+    # Order selesai/batal yang lama ada di arsip; dibaca hanya kalau paging sampai ke sana
+    orders, next_cursor = page_with_archive(build, Order, OrderArchive, 'created_at', limit, cursor_value)
+
     result = []
-    
     for order in orders:
-        items_str = []
-        first_image = None 
-
-        # Ambil detail barang yang dibeli
-        for d in order.details:
-            item_obj = Item.query.get(d.item_id)
-            if item_obj:
-                items_str.append(f"{item_obj.nama} ({d.jumlah}x)")
-                # Ambil gambar dari item pertama yang ketemu
-                if not first_image:
-                    first_image = item_obj.gambar_url
-
+        items_summary, first_image = order_summary.list_fields(order)
         result.append({
             'id': order.id,
             # [FIX] Ganti order.customer jadi order.user
@@ -66,26 +85,99 @@ def get_all_orders():
             'status': order.status,
             'bank': order.bank_name,
             'va': order.va_number,
-            'date': order.created_at.strftime('%Y-%m-%d %H:%M'),
-            'items': ", ".join(items_str),
+            'date': order.created_at,  # format dari JSON_DATETIME_FORMAT
+            'items': items_summary,
             'image': first_image,
             'cancel_reason': order.cancel_reason
         })
-    return jsonify(result), 200
+    return jsonify({'data': result, 'next_cursor': next_cursor}), 200
+
+
+def _run_status_change(kind, ids, data):
+    """
+    Jalankan perubahan status (1 atau banyak ID) dalam 1 transaksi.
+    Mengembalikan (laporan per ID, ada perubahan?) atau response error.
+    """
+    transitions, apply = ((ORDER_TRANSITIONS, bulk_update_orders) if kind == 'order'
+                          else (BOOKING_TRANSITIONS, bulk_update_bookings))
+    target = data.get('status')
+    if target not in transitions:
+        return None, (jsonify({'message': f"Status tidak dikenal. Pilihan: {', '.join(sorted(transitions))}"}), 400)
+
+    try:
+        report, changed = apply(ids, target, reason=data.get('reason'), strict=bool(data.get('strict')))
+        if changed:
+            db.session.commit()
+            if kind == 'order' and target == 'batal':
+                catalog_cache.bump()  # stok berubah
+        else:
+            db.session.rollback()
+        return (report, changed), None
+    except TransitionConflict:
+        db.session.rollback()
+        return None, (jsonify({'message': 'Status data berubah saat diproses, silakan coba lagi'}), 409)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"❌ Error Update Status {kind}: {e}")
+        return None, (jsonify({'message': 'Gagal update status', 'error': str(e)}), 500)
+
+
+def _bulk_ids(data):
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids or len(ids) > MAX_BULK_IDS:
+        return None
+    try:
+        # Urutan dipertahankan, ID dobel dibuang
+        return list(dict.fromkeys(int(i) for i in ids))
+    except (TypeError, ValueError):
+        return None
+
+
+def _single_status_response(kind, id):
+    data = request.get_json(silent=True) or {}
+    result, error = _run_status_change(kind, [id], data)
+    if error:
+        return error
+    (entry,), _ = result
+    if entry['ok']:
+        current_app.logger.info(f"🔄 ADMIN UBAH STATUS {kind} #{id}: {entry['from']} -> {data['status']}")
+        return jsonify({'message': 'Status updated'}), 200
+    if 'from' not in entry:
+        return jsonify({'message': 'Not found'}), 404
+    return jsonify({'message': entry['error']}), 400
+
+
+def _bulk_status_response(kind):
+    # Body: {"ids": [1, 2, 3], "status": "dikirim", "reason": "...", "strict": false}
+    # strict=true -> kalau ada 1 ID yang tidak valid, tidak ada yang diubah
+    data = request.get_json(silent=True) or {}
+    ids = _bulk_ids(data)
+    if ids is None:
+        return jsonify({'message': f'ids wajib berupa list 1-{MAX_BULK_IDS} angka'}), 400
+
+    result, error = _run_status_change(kind, ids, data)
+    if error:
+        return error
+    report, _ = result
+    updated = sum(1 for entry in report if entry['ok'])
+    current_app.logger.info(f"🔄 ADMIN BULK STATUS {kind}: {updated}/{len(ids)} -> {data['status']}")
+    return jsonify({
+        'status': data['status'],
+        'updated': updated,
+        'failed': len(ids) - updated,
+        'results': report
+    }), 200
 
 
 @bp.route('/orders/<int:id>/status', methods=['PUT'])
 def update_order_status(id):
-    data = request.get_json()
-    order = Order.query.get(id)
-    if not order: return jsonify({'message': 'Not found'}), 404
-    
-    order.status = data.get('status')
-    reason = data.get('reason')
-    if reason: order.cancel_reason = reason
-        
-    db.session.commit()
-    return jsonify({'message': 'Status updated'}), 200
+    # Transisi divalidasi (lihat status_flow.ORDER_TRANSITIONS); batal -> stok kembali
+    return _single_status_response('order', id)
+
+
+@bp.route('/orders/status', methods=['POST'])
+def bulk_update_order_status():
+    return _bulk_status_response('order')
 
 
 # ---------------------------------------------------------------------
@@ -93,12 +185,37 @@ def update_order_status(id):
 # ---------------------------------------------------------------------
 @bp.route('/bookings', methods=['GET'])
 def get_all_bookings():
-    bookings = Booking.query.order_by(Booking.booking_date.desc()).all()
+    # Kontrak paging sama dengan /orders, keyset di (booking_date, id)
+    try:
+        limit = parse_limit(request.args)
+        statuses = parse_statuses(request.args)
+        date_from = parse_date(request.args.get('date_from'), 'date_from')
+        date_to = parse_date(request.args.get('date_to'), 'date_to')
+        cursor = request.args.get('cursor')
+        cursor_value = decode_cursor(cursor, date) if cursor else None
+    except PaginationError as e:
+        return jsonify({'message': str(e)}), 400
+
+    def build(model):
+        query = model.query.options(joinedload(model.user))
+        if statuses:
+            query = query.filter(model.status.in_(statuses))
+        query = query.filter(*date_range_filter(model.booking_date, date_from, date_to))
+        if request.args.get('user_id', type=int):
+            query = query.filter(model.user_id == request.args.get('user_id', type=int))
+        if request.args.get('customer'):
+            query = query.join(User, model.user_id == User.id).filter(
+                User.nama_lengkap.ilike(f"%{request.args['customer']}%"))
+        return query
+
+    bookings, next_cursor = page_with_archive(build, Booking, BookingArchive, 'booking_date', limit, cursor_value)
+
     result = []
     for b in bookings:
-        # Cari Item berdasarkan nama layanan untuk ambil Harga & Gambar
-        service_item = Item.query.filter_by(nama=b.service_name).first()
-        service_image = service_item.gambar_url if service_item else None
+        # Ambil Harga & Gambar dari cache katalog layanan
+        service_item = service_catalog.get(b.service_name)
+        service_image = (image_url(service_item.gambar_key, 'thumb', service_item.gambar_url)
+                         if service_item else None)
         service_price = service_item.harga if service_item else 0 # Ambil Harga
 
         result.append({
@@ -109,23 +226,29 @@ def get_all_bookings():
             'image': service_image,
             'price': service_price, 
             'pet': f"{b.pet_name} ({b.pet_type})",
-            'date': str(b.booking_date),
+            'date': b.booking_date,
             'time': b.booking_time,
             'status': b.status,
             'cancel_reason': b.cancel_reason
         })
-    return jsonify(result), 200
+    return jsonify({'data': result, 'next_cursor': next_cursor}), 200
 
 
 @bp.route('/bookings/<int:id>/status', methods=['PUT'])
 def update_booking_status(id):
-    data = request.get_json()
-    booking = Booking.query.get(id)
-    if not booking: return jsonify({'message': 'Not found'}), 404
-    
-    booking.status = data.get('status')
-    reason = data.get('reason')
-    if reason: booking.cancel_reason = reason
-        
-    db.session.commit()
-    return jsonify({'message': 'Status updated'}), 200
\ No newline at end of file
+    # Transisi divalidasi (lihat status_flow.BOOKING_TRANSITIONS); batal -> slot dilepas
+    return _single_status_response('booking', id)
+
+
+@bp.route('/bookings/status', methods=['POST'])
+def bulk_update_booking_status():
+    return _bulk_status_response('booking')
+
+
+# ---------------------------------------------------------------------
+# 4. MONITORING POOL KONEKSI DATABASE
+# ---------------------------------------------------------------------
+@bp.route('/db/pool', methods=['GET'])
+def get_db_pool_status():
+    # Kalau checked_out sering = size + overflow dan wait naik -> pool kekecilan
+    return jsonify(pool_status(db)), 200
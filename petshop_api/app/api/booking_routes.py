@@ -1,7 +1,17 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app import db
-from app.models import Booking, Item
-from datetime import datetime
+from app.models import Booking, BookingArchive
+from app.service_cache import service_catalog
+from app import stats
+from app import booking_slots
+from app.booking_slots import SlotError, SlotFull
+from app.streaming import wants_stream, json_list_response
+from app.idempotency import idempotent
+from app.images import image_url
+from app.archive import page_with_archive, all_with_archive, iter_with_archive
+from app.status_flow import BOOKING_FINAL_STATUSES
+from app.pagination import PaginationError, parse_limit, decode_cursor
+from datetime import datetime, date
 import random
 
 bp = Blueprint('booking_api', __name__, url_prefix='/api/bookings')
@@ -10,6 +20,7 @@ bp = Blueprint('booking_api', __name__, url_prefix='/api/bookings')
 # 1. CREATE BOOKING (Booking Baru)
 # ---------------------------------------------------------------------
 @bp.route('', methods=['POST'])
+@idempotent
 def create_booking():
     # Gunakan silent=True agar tidak Error 415 jika Header tertinggal
     data = request.get_json(silent=True) 
@@ -17,19 +28,22 @@ def create_booking():
     if not data:
         return jsonify({'message': 'Data JSON tidak ditemukan'}), 400
 
-    print("----- DATA BOOKING MASUK -----")
-    print(data)
-    print("------------------------------")
-
     try:
         # 1. Validasi Tanggal
         if 'booking_date' not in data:
             return jsonify({'message': 'Tanggal booking wajib diisi'}), 400
             
         date_obj = datetime.strptime(data['booking_date'], '%Y-%m-%d').date()
+
+        # Jam dibakukan ke 'HH:MM' (24 jam) dan harus masuk salah satu slot
+        try:
+            booking_time = booking_slots.normalize_time(data['booking_time'])
+            slot_time = booking_slots.slot_for(booking_time)
+        except SlotError as e:
+            return jsonify({'message': str(e)}), 400
         
         # 2. Cari Harga Layanan
-        service_item = Item.query.filter_by(nama=data['service_name']).first()
+        service_item = service_catalog.get(data['service_name'])
         harga_layanan = service_item.harga if service_item else 50000 
         
         # 3. Metode Pembayaran & VA
@@ -49,7 +63,7 @@ def create_booking():
             pet_type=data.get('pet_type', 'Unknown'),
             pet_color=data.get('pet_color', '-'),
             booking_date=date_obj,
-            booking_time=data['booking_time'],
+            booking_time=booking_time,
             keluhan=data.get('keluhan', '-'),
             status='menunggu_pembayaran', 
             total_harga=harga_layanan,
@@ -58,10 +72,13 @@ def create_booking():
             va_number=va_generated
         )
 
+        # Ambil 1 tempat di slot (atomic); penuh -> SlotFull, tidak ada yang tersimpan
+        booking_slots.reserve_slot(data['service_name'], date_obj, slot_time)
         db.session.add(new_booking)
+        stats.record_transition('booking', date_obj, None, 'menunggu_pembayaran', harga_layanan)
         db.session.commit()
         
-        print(f">>> SUKSES SIMPAN BOOKING ID: {new_booking.id}")
+        current_app.logger.info(f"📅 BOOKING BARU: ID {new_booking.id} | {new_booking.service_name} (User ID: {new_booking.user_id})")
         
         return jsonify({
             'message': 'Booking berhasil dibuat', 
@@ -70,50 +87,98 @@ def create_booking():
             'total_harga': harga_layanan
         }), 201
     
+    except SlotFull:
+        db.session.rollback()
+        return jsonify({'message': 'Slot jam ini sudah penuh, silakan pilih jam lain'}), 409
     except Exception as e:
         db.session.rollback()
-        print(f"!!! ERROR SAAT BOOKING: {e}") 
+        current_app.logger.error(f"❌ Error Booking: {e}")
         return jsonify({'message': 'Gagal memproses booking', 'error': str(e)}), 500
 
 
+# ---------------------------------------------------------------------
+# 1b. CEK SLOT KOSONG
+# ---------------------------------------------------------------------
+# GET /api/bookings/availability?service_name=Grooming&days=7&start=2025-01-01
+@bp.route('/availability', methods=['GET'])
+def get_availability():
+    service_name = request.args.get('service_name')
+    if not service_name:
+        return jsonify({'message': 'service_name wajib diisi'}), 400
+
+    max_days = current_app.config.get('BOOKING_AVAILABILITY_MAX_DAYS', 31)
+    days = request.args.get('days', 7, type=int)
+    if not 1 <= days <= max_days:
+        return jsonify({'message': f'days harus antara 1 dan {max_days}'}), 400
+
+    try:
+        start = date.fromisoformat(request.args['start']) if 'start' in request.args else date.today()
+    except ValueError:
+        return jsonify({'message': 'Format start harus YYYY-MM-DD'}), 400
+
+    return jsonify({
+        'service_name': service_name,
+        'days': booking_slots.availability(service_name, start, days)
+    }), 200
+
+
 # ---------------------------------------------------------------------
 # 2. GET USER BOOKINGS (Riwayat) - FIX SESUAI DATABASE
 # ---------------------------------------------------------------------
+def _booking_to_dict(b):
+    # --- LOGIKA MENCARI GAMBAR (dari cache katalog, bukan query per baris) ---
+    item = service_catalog.get(b.service_name)
+    
+    # [FIX] Menggunakan .gambar_url (Sesuai tabel items di database kamu)
+    gambar_layanan = image_url(item.gambar_key, 'thumb', item.gambar_url) if item else None
+    # -----------------------------
+
+    return {
+        'id': b.id,
+        'service_name': b.service_name,
+        'pet_name': b.pet_name,
+        'pet_type': b.pet_type,
+        'booking_date': b.booking_date,
+        'booking_time': b.booking_time,
+        'status': b.status,
+        'total_harga': b.total_harga, 
+        'payment_method': b.payment_method,
+        'bank_name': b.bank_name,
+        'va_number': b.va_number,
+        'keluhan': b.keluhan,
+        'cancel_reason': b.cancel_reason,
+        
+        # Kirim URL gambar ke Flutter
+        'image_url': gambar_layanan
+    }
+
+
 @bp.route('/user/<int:user_id>', methods=['GET'])
 def get_user_bookings(user_id):
+    def build(model):
+        return model.query.filter_by(user_id=user_id).order_by(model.id.desc())
+
     try:
-        bookings = Booking.query.filter_by(user_id=user_id).order_by(Booking.id.desc()).all()
-        result = []
-        
-        for b in bookings:
-            # --- LOGIKA MENCARI GAMBAR ---
-            item = Item.query.filter_by(nama=b.service_name).first()
-            
-            # [FIX] Menggunakan .gambar_url (Sesuai tabel items di database kamu)
-            gambar_layanan = item.gambar_url if item else None 
-            # -----------------------------
-
-            result.append({
-                'id': b.id,
-                'service_name': b.service_name,
-                'pet_name': b.pet_name,
-                'pet_type': b.pet_type,
-                'booking_date': str(b.booking_date),
-                'booking_time': b.booking_time,
-                'status': b.status,
-                'total_harga': b.total_harga, 
-                'payment_method': b.payment_method,
-                'bank_name': b.bank_name,
-                'va_number': b.va_number,
-                'keluhan': b.keluhan,
-                'cancel_reason': b.cancel_reason,
-                
-                # Kirim URL gambar ke Flutter
-                'image_url': gambar_layanan
-            })
+        # ?limit=20&cursor=...: {'data', 'next_cursor'}; arsip hanya dibaca kalau
+        # paging sudah melewati booking yang masih ada di tabel bookings
+        if 'limit' in request.args or 'cursor' in request.args:
+            try:
+                limit = parse_limit(request.args)
+                cursor = request.args.get('cursor')
+                cursor_value = decode_cursor(cursor, int) if cursor else None
+            except PaginationError as e:
+                return jsonify({'message': str(e)}), 400
+            bookings, next_cursor = page_with_archive(build, Booking, BookingArchive, 'id', limit, cursor_value)
+            return jsonify({'data': [_booking_to_dict(b) for b in bookings], 'next_cursor': next_cursor}), 200
+
+        # Tanpa paging: seluruh riwayat (hot + arsip) seperti sebelumnya
+        if wants_stream():
+            return json_list_response(iter_with_archive(build, Booking, BookingArchive, 'id'), _booking_to_dict)
+
+        result = [_booking_to_dict(b) for b in all_with_archive(build, Booking, BookingArchive, 'id')]
         return jsonify(result), 200
     except Exception as e:
-        print(f"Error Get History: {e}")
+        current_app.logger.error(f"❌ Error Get History Booking: {e}")
         return jsonify({'message': 'Gagal ambil data', 'error': str(e)}), 500
 
 
@@ -133,14 +198,26 @@ def cancel_booking(booking_id):
     alasan = data.get('reason', 'Dibatalkan oleh Pengguna')
 
     try:
-        if booking.status in ['selesai', 'batal']:
+        if booking.status in BOOKING_FINAL_STATUSES:
             return jsonify({'message': 'Pesanan sudah tidak bisa dibatalkan'}), 400
 
-        booking.status = 'batal'
-        booking.cancel_reason = alasan
+        # Ubah status secara kondisional dari status yang tadi dibaca: kalau ada cancel
+        # lain / sweeper kadaluarsa / bayar di antaranya, hanya satu yang berhasil,
+        # jadi slot tidak dilepas 2x dan statistik dihitung dari status yang benar
+        claimed = (Booking.query
+                   .filter(Booking.id == booking_id, Booking.status == booking.status)
+                   .update({'status': 'batal', 'cancel_reason': alasan}, synchronize_session=False))
+        if not claimed:
+            db.session.rollback()
+            return jsonify({'message': 'Status pesanan berubah, muat ulang lalu coba lagi'}), 409
+
+        # Lepas slot supaya bisa dipakai pelanggan lain (booking.status di objek masih status lama)
+        booking_slots.change_status(booking, 'batal')
+        stats.record_transition('booking', booking.booking_date, booking.status, 'batal', booking.total_harga)
         db.session.commit()
         return jsonify({'message': 'Booking berhasil dibatalkan'}), 200
     except Exception as e:
+        db.session.rollback()
         return jsonify({'message': 'Gagal cancel', 'error': str(e)}), 500
 
 
@@ -148,6 +225,7 @@ def cancel_booking(booking_id):
 # 4. PAY BOOKING
 # ---------------------------------------------------------------------
 @bp.route('/<int:booking_id>/pay', methods=['PUT'])
+@idempotent
 def pay_booking(booking_id):
     booking = Booking.query.get(booking_id)
     if not booking: 
@@ -157,8 +235,19 @@ def pay_booking(booking_id):
         if booking.status != 'menunggu_pembayaran':
             return jsonify({'message': 'Status pesanan tidak valid untuk pembayaran'}), 400
 
-        booking.status = 'diproses' 
+        # Ubah status secara kondisional: booking yang sudah dibatalkan sweeper
+        # kadaluarsa/cancel (slot sudah dilepas) tidak boleh aktif lagi lewat bayar
+        paid = (Booking.query
+                .filter(Booking.id == booking_id, Booking.status == 'menunggu_pembayaran')
+                .update({'status': 'diproses'}, synchronize_session=False))
+        if not paid:
+            db.session.rollback()
+            return jsonify({'message': 'Pesanan sudah dibatalkan atau statusnya berubah'}), 409
+
+        stats.record_transition('booking', booking.booking_date, 'menunggu_pembayaran', 'diproses',
+                                booking.total_harga)
         db.session.commit()
         return jsonify({'message': 'Pembayaran berhasil dikonfirmasi'}), 200
     except Exception as e:
+        db.session.rollback()
         return jsonify({'message': 'Gagal update status', 'error': str(e)}), 500
\ No newline at end of file
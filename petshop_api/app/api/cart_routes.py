@@ -0,0 +1,114 @@
+# File: app/api/cart_routes.py
+
+from flask import Blueprint, request, jsonify, current_app
+from app import db
+from app.models import Cart, Item
+from app.database import upsert_stmt
+from app.images import image_url
+from datetime import datetime
+
+bp = Blueprint('cart_api', __name__, url_prefix='/api/cart')
+
+cart_table = Cart.__table__
+
+
+def _cart_payload(user_id):
+    # Keranjang + harga & stok terbaru dari tabel items, 1 query (JOIN)
+    rows = (db.session.query(Cart.item_id, Cart.jumlah, Item.nama, Item.tipe,
+                             Item.harga, Item.stok, Item.gambar_url, Item.gambar_key)
+            .join(Item, Item.id == Cart.item_id)
+            .filter(Cart.user_id == user_id)
+            .order_by(Cart.created_at, Cart.id)
+            .all())
+    items = []
+    total = 0
+    for r in rows:
+        subtotal = r.harga * r.jumlah
+        total += subtotal
+        items.append({
+            'item_id': r.item_id,
+            'nama': r.nama,
+            'tipe': r.tipe,
+            'harga': r.harga,
+            'stok': r.stok,
+            'jumlah': r.jumlah,
+            'subtotal': subtotal,
+            'gambar_url': image_url(r.gambar_key, 'medium', r.gambar_url),
+            'thumb_url': image_url(r.gambar_key, 'thumb', r.gambar_url),
+            'tersedia': r.stok >= r.jumlah
+        })
+    return {'user_id': user_id, 'items': items, 'total_harga': total}
+
+
+# ---------------------------------------------------------------------
+# 1. LIHAT KERANJANG
+# ---------------------------------------------------------------------
+@bp.route('/user/<int:user_id>', methods=['GET'])
+def get_cart(user_id):
+    return jsonify(_cart_payload(user_id)), 200
+
+
+# ---------------------------------------------------------------------
+# 2. SINKRON KERANJANG (Bulk, 1 request = 1 transaksi)
+# ---------------------------------------------------------------------
+# Body:
+# {
+#   "mode": "merge",                      # atau "replace"
+#   "items": [{"item_id": 1, "jumlah": 3}, ...],   # jumlah akhir (bukan selisih)
+#   "remove": [5, 6]                      # item yang dihapus (opsional)
+# }
+# merge   : item di "items" di-set jumlahnya (insert/update), item lain tetap
+# replace : keranjang di server dibuat persis sama dengan "items"
+# jumlah <= 0 dianggap hapus. Balasan berisi keranjang terbaru.
+@bp.route('/user/<int:user_id>/sync', methods=['POST'])
+def sync_cart(user_id):
+    data = request.get_json(silent=True) or {}
+    mode = data.get('mode', 'merge')
+    if mode not in ('merge', 'replace'):
+        return jsonify({'message': "mode harus 'merge' atau 'replace'"}), 400
+
+    try:
+        wanted = {}
+        for entry in data.get('items', []):
+            wanted[int(entry['item_id'])] = int(entry.get('jumlah', 1))
+        remove_ids = {int(i) for i in data.get('remove', [])}
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'message': 'Format items/remove tidak valid'}), 400
+
+    remove_ids |= {item_id for item_id, jumlah in wanted.items() if jumlah <= 0}
+    wanted = {item_id: jumlah for item_id, jumlah in wanted.items() if jumlah > 0}
+
+    try:
+        # Item yang tidak ada di katalog diabaikan (dilaporkan di 'ignored')
+        existing = set()
+        if wanted:
+            existing = {row.id for row in db.session.query(Item.id).filter(Item.id.in_(wanted.keys()))}
+        ignored = sorted(set(wanted) - existing)
+
+        if mode == 'replace':
+            delete = cart_table.delete().where(cart_table.c.user_id == user_id)
+            if existing:
+                delete = delete.where(cart_table.c.item_id.notin_(existing))
+            db.session.execute(delete)
+        elif remove_ids:
+            db.session.execute(cart_table.delete().where(
+                cart_table.c.user_id == user_id, cart_table.c.item_id.in_(remove_ids)))
+
+        if existing:
+            now = datetime.utcnow()
+            stmt = upsert_stmt(db.engine.dialect.name, cart_table, ['user_id', 'item_id'],
+                               lambda new: {'jumlah': new.jumlah})
+            db.session.execute(stmt, [
+                {'user_id': user_id, 'item_id': item_id, 'jumlah': wanted[item_id], 'created_at': now}
+                for item_id in sorted(existing)
+            ])
+
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"❌ Error Sync Keranjang: {e}")
+        return jsonify({'message': 'Gagal sinkron keranjang', 'error': str(e)}), 500
+
+    payload = _cart_payload(user_id)
+    payload['ignored'] = ignored
+    return jsonify(payload), 200
@@ -1,26 +1,126 @@
 # File: app/api/item_routes.py
 
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, jsonify, request, current_app, stream_with_context
 from app.models import Item, db
+from app import item_io
+from app.streaming import wants_stream, json_list_response
+from datetime import datetime
+from app.service_cache import service_catalog
+from app.catalog_cache import catalog_cache
+from app.search_index import search_index, SORTS
+from app.pagination import PaginationError, parse_limit
+from app import images
+from app.images import image_url
+from app.compression import etag_matches
 
 bp = Blueprint('item_api', __name__, url_prefix='/api/items')
 
+def _catalog_changed(item=None, removed_id=None):
+    # Dipanggil setelah commit di endpoint tulis: buang semua cache katalog.
+    # Index pencarian diperbarui per item; tanpa item (import massal) dibangun ulang.
+    service_catalog.invalidate()
+    catalog_cache.bump()
+    if item is not None:
+        search_index.upsert(item)
+    elif removed_id is not None:
+        search_index.remove(removed_id)
+    else:
+        search_index.invalidate()
+
+
+# Parameter yang membuat GET /api/items masuk mode pencarian
+SEARCH_PARAMS = ('q', 'tipe', 'min_harga', 'max_harga', 'sort', 'limit', 'offset')
+
+
+def _int_arg(name):
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise PaginationError(f'Parameter {name} harus angka')
+
+
+def _search_items():
+    sort = request.args.get('sort', 'terbaru')
+    if sort not in SORTS:
+        raise PaginationError(f"sort harus salah satu dari: {', '.join(SORTS)}")
+    tipe = {t.strip() for t in request.args.get('tipe', '').split(',') if t.strip()}
+    limit = parse_limit(request.args)
+    offset = max(0, _int_arg('offset') or 0)
+
+    ids, total = search_index.search(
+        q=request.args.get('q'), tipe=tipe, sort=sort, offset=offset, limit=limit,
+        min_harga=_int_arg('min_harga'), max_harga=_int_arg('max_harga'))
+
+    # Isi item (stok, harga terbaru) tetap dari database: 1 query by primary key
+    rows = {item.id: item for item in Item.query.filter(Item.id.in_(ids))} if ids else {}
+    return {
+        'data': [_item_to_dict(rows[i]) for i in ids if i in rows],
+        'total': total,
+        'next_offset': offset + limit if offset + limit < total else None,
+    }
+
+
+def _item_to_dict(item, media_base=None):
+    return {
+        'id': item.id,
+        'nama': item.nama,
+        'tipe': item.tipe, # 'produk' atau 'layanan'
+        'harga': item.harga,
+        'stok': item.stok,
+        'deskripsi': item.deskripsi,
+        # Gambar upload -> URL varian (medium untuk detail, thumb untuk daftar);
+        # selain itu dua-duanya path asset bawaan seperti sebelumnya
+        'gambar_url': image_url(item.gambar_key, 'medium', item.gambar_url, media_base),
+        'thumb_url': image_url(item.gambar_key, 'thumb', item.gambar_url, media_base),
+        'kapasitas_slot': item.kapasitas_slot
+    }
+
+
+def _build_items_json():
+    # Body dipakai semua client: URL gambar tanpa host request (lihat images.with_media_base)
+    media_base = images.cache_base_url()
+    items = Item.query.order_by(Item.created_at.desc()).all()
+    return current_app.json.dumps([_item_to_dict(item, media_base) for item in items])
+
+
 # 1. AMBIL SEMUA ITEM (Untuk Client & Admin)
 @bp.route('', methods=['GET'])
 def get_items():
-    items = Item.query.order_by(Item.created_at.desc()).all()
-    result = []
-    for item in items:
-        result.append({
-            'id': item.id,
-            'nama': item.nama,
-            'tipe': item.tipe, # 'produk' atau 'layanan'
-            'harga': item.harga,
-            'stok': item.stok,
-            'deskripsi': item.deskripsi,
-            'gambar_url': item.gambar_url
-        })
-    return jsonify(result), 200
+    # Mode pencarian: ?q=kucing&tipe=makanan&min_harga=10000&sort=harga_asc&limit=20&offset=0
+    # Balasan {'data', 'total', 'next_offset'}; tanpa parameter tetap list penuh seperti biasa.
+    if any(name in request.args for name in SEARCH_PARAMS):
+        try:
+            return jsonify(_search_items()), 200
+        except PaginationError as e:
+            return jsonify({'message': str(e)}), 400
+
+    # Mode streaming: baca langsung dari database per batch, tanpa cache
+    if wants_stream():
+        return json_list_response(Item.query.order_by(Item.created_at.desc()), _item_to_dict)
+
+    # Client kirim If-None-Match dengan ETag lama -> 304 tanpa query database
+    cached_etag = catalog_cache.peek_etag()
+    if cached_etag:
+        cached_etag = images.media_etag(cached_etag)
+    if cached_etag and etag_matches(cached_etag):
+        response = current_app.response_class(status=304)
+    else:
+        body, etag = catalog_cache.get(_build_items_json)
+        etag = images.media_etag(etag)
+        if etag_matches(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(images.with_media_base(body), status=200,
+                                                  mimetype='application/json')
+        cached_etag = etag
+
+    response.set_etag(cached_etag)
+    # Boleh disimpan client, tapi wajib validasi ulang ke server tiap kali dipakai
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 # 2. TAMBAH ITEM BARU (Khusus Admin)
 @bp.route('', methods=['POST'])
@@ -34,10 +134,12 @@ def add_item():
             harga=data['harga'],
             stok=data.get('stok', 0),
             deskripsi=data.get('deskripsi', ''),
-            gambar_url=data.get('gambar_url', 'assets/images/pet_avatar.png')
+            gambar_url=data.get('gambar_url', 'assets/images/pet_avatar.png'),
+            kapasitas_slot=data.get('kapasitas_slot')
         )
         db.session.add(new_item)
         db.session.commit()
+        _catalog_changed(item=new_item)
         current_app.logger.info(f"📦 ADMIN TAMBAH ITEM: {new_item.nama} (Stok: {new_item.stok})")
         return jsonify({'message': 'Item berhasil ditambahkan!'}), 201
     except Exception as e:
@@ -58,9 +160,15 @@ def update_item(id):
         item.harga = data.get('harga', item.harga)
         item.stok = data.get('stok', item.stok)
         item.deskripsi = data.get('deskripsi', item.deskripsi)
-        item.gambar_url = data.get('gambar_url', item.gambar_url)
+        # Form admin mengirim balik gambar_url yang sedang tampil; hanya kalau
+        # berbeda (mis. pilih asset lain) gambar upload-nya dilepas
+        if 'gambar_url' in data and data['gambar_url'] != image_url(item.gambar_key, 'medium', item.gambar_url):
+            item.gambar_url = data['gambar_url']
+            item.gambar_key = None
+        item.kapasitas_slot = data.get('kapasitas_slot', item.kapasitas_slot)
         
         db.session.commit()
+        _catalog_changed(item=item)
         return jsonify({'message': 'Item berhasil diupdate!'}), 200
     except Exception as e:
         return jsonify({'message': 'Gagal update', 'error': str(e)}), 500
@@ -74,6 +182,122 @@ def delete_item(id):
     try:
         db.session.delete(item)
         db.session.commit()
+        _catalog_changed(removed_id=id)
         return jsonify({'message': 'Item berhasil dihapus!'}), 200
     except Exception as e:
-        return jsonify({'message': 'Gagal hapus (Mungkin item ini ada di riwayat pesanan)', 'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'message': 'Gagal hapus (Mungkin item ini ada di riwayat pesanan)', 'error': str(e)}), 500
+
+# 5. IMPORT MASSAL (Khusus Admin) - NDJSON / CSV, streaming
+# Contoh: curl -X POST --data-binary @katalog.csv -H "Content-Type: text/csv" \
+#              "http://localhost:5000/api/items/import?format=csv&chunk_size=1000"
+# Tiap baris: id (opsional), nama, tipe, harga, stok, deskripsi, gambar_url.
+# Ada id / nama sudah ada -> update, selain itu -> item baru.
+@bp.route('/import', methods=['POST'])
+def import_items():
+    fmt = _io_format()
+    if fmt is None:
+        return jsonify({'message': "format harus 'ndjson' atau 'csv'"}), 400
+    chunk_size = request.args.get('chunk_size', current_app.config.get('ITEM_IMPORT_CHUNK_SIZE', 1000), type=int)
+    chunk_size = max(1, min(chunk_size, 10000))
+
+    inserted = updated = total = error_count = 0
+    errors = []
+    chunk = []
+    created_at = datetime.utcnow()
+
+    def report(errs):
+        nonlocal error_count
+        error_count += len(errs)
+        errors.extend(errs[:max(0, item_io.MAX_REPORTED_ERRORS - len(errors))])
+
+    def flush():
+        nonlocal inserted, updated
+        # 1 chunk = 1 transaksi; chunk yang gagal tidak membatalkan chunk sebelumnya
+        try:
+            ins, upd, errs = item_io.apply_chunk(chunk, created_at)
+            db.session.commit()
+            inserted += ins
+            updated += upd
+            report(errs)
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"❌ Error Import Chunk: {e}")
+            report([{'line': line_no, 'error': f'Chunk gagal disimpan: {e}'} for line_no, _ in chunk])
+        chunk.clear()
+
+    for line_no, row in item_io.iter_rows(request.stream, fmt):
+        total += 1
+        if isinstance(row, item_io.RowError):
+            report([{'line': line_no, 'error': str(row)}])
+            continue
+        try:
+            chunk.append((line_no, item_io.clean_row(row)))
+        except item_io.RowError as e:
+            report([{'line': line_no, 'error': str(e)}])
+            continue
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+
+    if inserted or updated:
+        _catalog_changed()
+    current_app.logger.info(f"📦 IMPORT ITEM: {total} baris | {inserted} baru | {updated} update | {error_count} error")
+    return jsonify({
+        'total_rows': total,
+        'inserted': inserted,
+        'updated': updated,
+        'error_count': error_count,
+        'errors': errors
+    }), 200
+
+
+# 6. EXPORT SEMUA ITEM - NDJSON / CSV, streaming
+@bp.route('/export', methods=['GET'])
+def export_items():
+    fmt = _io_format()
+    if fmt is None:
+        return jsonify({'message': "format harus 'ndjson' atau 'csv'"}), 400
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    response = current_app.response_class(stream_with_context(item_io.iter_export(fmt)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=items.{fmt}'
+    return response
+
+
+# 7. UPLOAD GAMBAR ITEM (Khusus Admin)
+# Contoh: curl -F "file=@kalung.jpg" http://localhost:5000/api/items/5/gambar
+# Varian thumb/medium dibuat di background; URL-nya langsung bisa dipakai.
+@bp.route('/<int:id>/gambar', methods=['POST'])
+def upload_item_image(id):
+    item = Item.query.get(id)
+    if not item: return jsonify({'message': 'Item tidak ditemukan'}), 404
+
+    try:
+        key = images.save_request_image()
+    except images.ImageTooLarge as e:
+        return jsonify({'message': str(e)}), 413
+    except images.InvalidImage as e:
+        return jsonify({'message': str(e)}), 400
+
+    try:
+        item.gambar_key = key
+        db.session.commit()
+        _catalog_changed(item=item)
+        current_app.logger.info(f"🖼️ UPLOAD GAMBAR ITEM: {item.nama} ({key})")
+        return jsonify({
+            'message': 'Gambar item berhasil diupload!',
+            'gambar_url': image_url(key, 'medium'),
+            'thumb_url': image_url(key, 'thumb')
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"❌ Error Upload Gambar Item: {e}")
+        return jsonify({'message': 'Gagal simpan gambar item', 'error': str(e)}), 500
+
+
+def _io_format():
+    # ?format=csv|ndjson, atau ditebak dari Content-Type
+    fmt = request.args.get('format')
+    if not fmt:
+        fmt = 'csv' if 'csv' in (request.content_type or '') else 'ndjson'
+    return fmt if fmt in ('csv', 'ndjson') else None
@@ -0,0 +1,31 @@
+# File: app/api/media_routes.py
+
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from flask import Blueprint, jsonify, current_app, send_file
+from app.images import get_pipeline
+
+bp = Blueprint('media_api', __name__, url_prefix='/media')
+
+
+# ----------------------------------------------------------------------
+# VARIAN GAMBAR (thumb/medium) - URL berisi hash, boleh di-cache selamanya
+# ----------------------------------------------------------------------
+@bp.route('/<filename>', methods=['GET'])
+def get_media(filename):
+    pipeline = get_pipeline()
+    try:
+        path = pipeline.variant_path(filename)
+    except FutureTimeout:
+        return jsonify({'message': 'Gambar masih diproses, coba lagi'}), 503
+    except Exception as e:
+        current_app.logger.error(f"❌ Gagal menyiapkan gambar {filename}: {e}")
+        return jsonify({'message': 'Gagal menyiapkan gambar'}), 500
+    if path is None:
+        return jsonify({'message': 'Gambar tidak ditemukan'}), 404
+
+    max_age = current_app.config.get('IMAGE_CACHE_MAX_AGE', 31536000)
+    response = send_file(path, mimetype=pipeline.mimetype, conditional=True, max_age=max_age)
+    # Isi file untuk URL ini tidak akan pernah berubah -> client tidak perlu validasi ulang
+    response.headers['Cache-Control'] = f'public, max-age={max_age}, immutable'
+    return response
@@ -2,14 +2,27 @@
 
 from flask import Blueprint, request, jsonify, current_app
 from app import db
-from app.models import Order, OrderDetail, Item, Cart
+from app.models import Order, OrderDetail, Item, Cart, OrderArchive, OrderDetailArchive
+from app.catalog_cache import catalog_cache
+from app import stats
+from app import order_summary
+from app.streaming import wants_stream, json_list_response
+from app.idempotency import idempotent
+from app.images import image_url
+from app.archive import page_with_archive, all_with_archive, iter_with_archive
+from app.pagination import PaginationError, parse_limit, decode_cursor
+from app.stock import StockError, aggregate_quantities, reserve_stock, release_stock
+from sqlalchemy.orm import selectinload
 from datetime import datetime
 import random
 
 bp = Blueprint('order_api', __name__, url_prefix='/api/orders')
 
 # 1. CREATE ORDER (Checkout)
+# Header Idempotency-Key: checkout yang diulang client (jaringan putus) tidak
+# membuat order/VA baru dan tidak memotong stok lagi
 @bp.route('', methods=['POST'])
+@idempotent
 def create_order():
     data = request.get_json()
     
@@ -26,29 +39,40 @@ def create_order():
         return jsonify({'message': 'Data tidak lengkap (user_id / items_list)'}), 400
 
     try:
-        total_harga_order = 0
+        quantities = aggregate_quantities(items_data)
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'message': f'Data item tidak valid: {e}'}), 400
 
-        # 1. Cek Stok & Hitung Total Dulu (Validasi)
-        for item_info in items_data:
-            item_db = Item.query.get(item_info['item_id'])
-            
-            if not item_db:
-                return jsonify({'message': f"Item ID {item_info['item_id']} tidak ditemukan"}), 404
-            
-            if item_db.stok < item_info['jumlah']:
-                current_app.logger.warning(f"❌ Stok Kurang: {item_db.nama} sisa {item_db.stok}")
-                return jsonify({'message': f"Stok {item_db.nama} tidak cukup (Sisa: {item_db.stok})"}), 400
-            
-            subtotal = item_db.harga * item_info['jumlah']
-            total_harga_order += subtotal
+    try:
+        # 1. Ambil harga semua item sekaligus (1 query) & hitung total
+        items_by_id = {
+            row.id: row for row in
+            db.session.query(Item.id, Item.nama, Item.harga, Item.gambar_url, Item.gambar_key)
+            .filter(Item.id.in_(quantities.keys()))
+        }
+        for item_id in quantities:
+            if item_id not in items_by_id:
+                return jsonify({'message': f"Item ID {item_id} tidak ditemukan"}), 404
+
+        total_harga_order = sum(items_by_id[i].harga * n for i, n in quantities.items())
 
-        # 2. Generate VA Number
+        # 2. Potong stok semua item secara atomik (cek stok + kurangi di 1 statement)
+        try:
+            reserve_stock(quantities)
+        except StockError as e:
+            current_app.logger.warning(f"❌ Stok Kurang: {e.nama} sisa {e.sisa}")
+            return jsonify({'message': str(e)}), 400
+
+        # 3. Generate VA Number
         bank_codes = {'BCA': '8800', 'BRI': '1234', 'MANDIRI': '9000', 'BNI': '8810', 'CIMB': '1199'}
         prefix = bank_codes.get(bank_name, '8800')
         random_suffix = random.randint(1000000000, 9999999999)
         va_generated = f"{prefix}{random_suffix}"
 
-        # 3. Buat Order Header
+        # 4. Buat Order Header + ringkasan untuk daftar order (tanpa baca detail lagi)
+        summary = order_summary.summarize([
+            (items_by_id[i].nama, n, items_by_id[i].gambar_url, items_by_id[i].gambar_key)
+            for i, n in quantities.items()])
         new_order = Order(
             user_id=user_id,
             total_harga=total_harga_order,
@@ -56,33 +80,38 @@ def create_order():
             bank_name=bank_name,
             va_number=va_generated,
             payment_method=payment_method, 
-            created_at=datetime.utcnow()
+            created_at=datetime.utcnow(),
+            **summary
         )
         db.session.add(new_order)
         db.session.flush() 
 
-        # 4. Buat Detail Order & KURANGI STOK
-        for item_info in items_data:
-            item_db = Item.query.get(item_info['item_id'])
-            
-            # [LOG STOCK] Logika Logger disini sudah benar
-            stok_awal = item_db.stok
-            item_db.stok -= item_info['jumlah']
-            current_app.logger.info(f"   📉 Stok '{item_db.nama}' Berkurang: {stok_awal} -> {item_db.stok}")
+        # 5. Buat Detail Order (stok sudah dipotong di langkah 2)
+        for item_id, jumlah in quantities.items():
+            item_db = items_by_id[item_id]
+            current_app.logger.info(f"   📉 Stok '{item_db.nama}' Berkurang: -{jumlah}")
             
             detail = OrderDetail(
                 order_id=new_order.id,
-                item_id=item_db.id,
-                jumlah=item_info['jumlah'],
-                subtotal=item_db.harga * item_info['jumlah']
+                item_id=item_id,
+                jumlah=jumlah,
+                subtotal=item_db.harga * jumlah,
+                # Snapshot saat beli
+                nama_barang=item_db.nama,
+                harga=item_db.harga
             )
             db.session.add(detail)
 
-        # 5. Hapus Keranjang User
-        ids_to_remove = [item['item_id'] for item in items_data]
+        # Update ringkasan dashboard admin (ikut transaksi yang sama)
+        stats.record_transition('order', new_order.created_at, None, 'menunggu_pembayaran', total_harga_order)
+
+        # 6. Hapus Keranjang User
+        ids_to_remove = list(quantities.keys())
         Cart.query.filter(Cart.user_id == user_id, Cart.item_id.in_(ids_to_remove)).delete(synchronize_session=False)
 
         db.session.commit()
+        # Stok berubah -> cache katalog GET /api/items sudah basi
+        catalog_cache.bump()
 
         # [LOG FINAL] Print lama sudah dihapus, pakai logger saja
         current_app.logger.info(f"✅ ORDER SUKSES! ID: {new_order.id} | Total: Rp {total_harga_order}")
@@ -102,36 +131,67 @@ def create_order():
         return jsonify({'message': 'Gagal membuat order', 'error': str(e)}), 500
 
 # 2. GET USER ORDERS (Riwayat)
+def _order_to_dict(order):
+    items = []
+    for detail in order.details:
+        items.append({
+            # Nama saat beli; order lama yang belum di-backfill pakai nama item sekarang
+            'nama_barang': detail.nama_barang or detail.item.nama,
+            'jumlah': detail.jumlah,
+            'subtotal': detail.subtotal
+        })
+    items_summary, image = order_summary.list_fields(order)
+
+    return {
+        'id': order.id,
+        'total_harga': order.total_harga,
+        'status': order.status,
+        'payment_method': getattr(order, 'payment_method', 'transfer'), 
+        'tgl_transaksi': order.created_at,  # format dari JSON_DATETIME_FORMAT
+        'items': items,
+        'items_summary': items_summary,
+        'image': image,
+        'bank_name': order.bank_name,
+        'va_number': order.va_number,
+        'cancel_reason': order.cancel_reason 
+    }
+
+
+_DETAIL_MODELS = {Order: OrderDetail, OrderArchive: OrderDetailArchive}
+
+
 @bp.route('/user/<int:user_id>', methods=['GET'])
 def get_user_orders(user_id):
-    orders = Order.query.filter_by(user_id=user_id).order_by(Order.created_at.desc()).all()
-    result = []
-    
-    for order in orders:
-        items = []
-        for detail in order.details:
-            items.append({
-                'nama_barang': detail.item.nama,
-                'jumlah': detail.jumlah,
-                'subtotal': detail.subtotal
-            })
-            
-        result.append({
-            'id': order.id,
-            'total_harga': order.total_harga,
-            'status': order.status,
-            'payment_method': getattr(order, 'payment_method', 'transfer'), 
-            'tgl_transaksi': order.created_at.strftime('%Y-%m-%d %H:%M'),
-            'items': items,
-            'bank_name': order.bank_name,
-            'va_number': order.va_number,
-            'cancel_reason': order.cancel_reason 
-        })
-    
+    # orders (1 query, index user_id+created_at) + details (1 query IN). Nama, harga &
+    # gambar sudah ada di snapshot, jadi tabel items tidak di-JOIN lagi
+    def build(model):
+        return (model.query
+                .options(selectinload(model.details).lazyload(_DETAIL_MODELS[model].item))
+                .filter_by(user_id=user_id)
+                .order_by(model.created_at.desc(), model.id.desc()))
+
+    # ?limit=20&cursor=...: {'data', 'next_cursor'}; arsip hanya dibaca kalau
+    # paging sudah melewati order yang masih ada di tabel orders
+    if 'limit' in request.args or 'cursor' in request.args:
+        try:
+            limit = parse_limit(request.args)
+            cursor = request.args.get('cursor')
+            cursor_value = decode_cursor(cursor) if cursor else None
+        except PaginationError as e:
+            return jsonify({'message': str(e)}), 400
+        orders, next_cursor = page_with_archive(build, Order, OrderArchive, 'created_at', limit, cursor_value)
+        return jsonify({'data': [_order_to_dict(o) for o in orders], 'next_cursor': next_cursor}), 200
+
+    # Tanpa paging: seluruh riwayat (hot + arsip) seperti sebelumnya
+    if wants_stream():
+        return json_list_response(iter_with_archive(build, Order, OrderArchive, 'created_at'), _order_to_dict)
+
+    result = [_order_to_dict(order) for order in all_with_archive(build, Order, OrderArchive, 'created_at')]
     return jsonify(result), 200
 
 # 3. PAY ORDER (Bayar via VA)
 @bp.route('/<int:order_id>/pay', methods=['PUT'])
+@idempotent
 def pay_order(order_id):
     order = Order.query.get(order_id)
     if not order:
@@ -141,7 +201,17 @@ def pay_order(order_id):
         return jsonify({'message': 'Status order tidak valid untuk pembayaran'}), 400
 
     try:
-        order.status = 'menunggu_konfirmasi' 
+        # Ubah status secara kondisional (seperti cancel): kalau sweeper kadaluarsa atau
+        # cancel lain sudah membatalkan order ini (stok sudah dikembalikan), bayar ditolak
+        paid = (Order.query
+                .filter(Order.id == order_id, Order.status == 'menunggu_pembayaran')
+                .update({'status': 'menunggu_konfirmasi'}, synchronize_session=False))
+        if not paid:
+            db.session.rollback()
+            return jsonify({'message': 'Order sudah dibatalkan atau statusnya berubah'}), 409
+
+        stats.record_transition('order', order.created_at, 'menunggu_pembayaran', 'menunggu_konfirmasi',
+                                order.total_harga)
         db.session.commit()
         
         # [LOG PAYMENT] Sudah benar
@@ -168,16 +238,28 @@ def cancel_order(order_id):
 
     try:
         current_app.logger.info(f"🚫 Membatalkan Order #{order_id}...")
+        # Ubah status secara kondisional dari status yang barusan dibaca: kalau ada
+        # request lain yang mengubah status di antaranya (cancel bersamaan, bayar,
+        # admin), hanya satu yang berhasil, jadi stok tidak dikembalikan 2x dan
+        # statistik dicatat dari status asal yang benar
+        old_status = order.status
+        claimed = (Order.query
+                   .filter(Order.id == order_id, Order.status == old_status)
+                   .update({'status': 'batal', 'cancel_reason': reason}, synchronize_session=False))
+        if not claimed:
+            db.session.rollback()
+            return jsonify({'message': 'Status order berubah, muat ulang lalu coba lagi'}), 409
+
+        stats.record_transition('order', order.created_at, old_status, 'batal', order.total_harga)
+
+        quantities = {}
         for detail in order.details:
-            item = Item.query.get(detail.item_id)
-            if item:
-                item.stok += detail.jumlah
-                current_app.logger.info(f"   📈 Stok '{item.nama}' Dikembalikan: +{detail.jumlah}")
-        
-        order.status = 'batal'
-        order.cancel_reason = reason
+            quantities[detail.item_id] = quantities.get(detail.item_id, 0) + detail.jumlah
+        release_stock(quantities)
+        current_app.logger.info(f"   📈 Stok Dikembalikan: {quantities}")
         
         db.session.commit()
+        catalog_cache.bump()
         current_app.logger.info(f"✅ Order #{order_id} Berhasil Dibatalkan.")
         return jsonify({'message': 'Order dibatalkan & stok dikembalikan'}), 200
     except Exception as e:
@@ -188,16 +270,31 @@ def cancel_order(order_id):
 # 5. GET ORDER DETAIL
 @bp.route('/<int:order_id>', methods=['GET'])
 def get_order_detail(order_id):
-    order = Order.query.get(order_id)
+    # Order selesai/batal yang sudah lama dipindah ke arsip (ID tetap sama)
+    for model in (Order, OrderArchive):
+        order = (model.query
+                 .options(selectinload(model.details).lazyload(_DETAIL_MODELS[model].item))
+                 .filter_by(id=order_id)
+                 .first())
+        if order:
+            break
     if not order:
         return jsonify({'message': 'Order tidak ditemukan'}), 404
 
+    # Nama & harga dari snapshot saat checkout; dari item hanya kolom gambar
+    # (+ nama/harga untuk detail lama yang belum di-backfill), 1 query by PK
+    items = {row.id: row for row in db.session.query(Item.id, Item.nama, Item.harga,
+                                                     Item.gambar_key, Item.gambar_url)
+             .filter(Item.id.in_({d.item_id for d in order.details}))}
+
     details = []
     for d in order.details:
+        item = items.get(d.item_id)
         details.append({
-            'nama': d.item.nama,
-            'gambar': d.item.gambar_url,
-            'harga': d.item.harga,
+            'nama': d.nama_barang or (item.nama if item else '-'),
+            'gambar': image_url(item.gambar_key, 'thumb', item.gambar_url) if item else None,
+            # Harga satuan saat beli, bukan harga item sekarang
+            'harga': d.harga if d.harga is not None else (item.harga if item else None),
             'jumlah': d.jumlah,
             'subtotal': d.subtotal
         })
@@ -3,6 +3,9 @@
 from flask import Blueprint, request, jsonify, current_app
 from app.models import Pet
 from app import db
+from app.streaming import wants_stream, json_list_response
+from app import images
+from app.images import image_url
 
 bp = Blueprint('pet_api', __name__, url_prefix='/api/pets')
 
@@ -44,26 +47,32 @@ def add_pet():
 # ----------------------------------------------------------------------
 # 2. AMBIL DAFTAR HEWAN USER (Read)
 # ----------------------------------------------------------------------
+def _pet_to_dict(p):
+    return {
+        'id': p.id,
+        'user_id': p.user_id,
+        'nama_hewan': p.nama_hewan,
+        'jenis': p.jenis,
+        'warna': p.warna,
+        'usia': p.usia,
+        # Foto upload -> URL varian; selain itu avatar asset bawaan
+        'foto_url': image_url(p.foto_key, 'medium', p.foto_url),
+        'thumb_url': image_url(p.foto_key, 'thumb', p.foto_url)
+    }
+
+
 @bp.route('/user/<int:user_id>', methods=['GET'])
 def get_user_pets(user_id):
     try:
         # Urutkan berdasarkan ID (ID besar = Inputan baru)
-        pets = Pet.query.filter_by(user_id=user_id).order_by(Pet.id.desc()).all()
-        
-        result = []
-        for p in pets:
-            result.append({
-                'id': p.id,
-                'user_id': p.user_id,
-                'nama_hewan': p.nama_hewan,
-                'jenis': p.jenis,
-                'warna': p.warna,
-                'usia': p.usia,
-                'foto_url': p.foto_url
-            })
+        query = Pet.query.filter_by(user_id=user_id).order_by(Pet.id.desc())
+        if wants_stream():
+            return json_list_response(query, _pet_to_dict)
+
+        result = [_pet_to_dict(p) for p in query.all()]
         return jsonify(result), 200
     except Exception as e:
-        print(f"Error ambil data: {e}")
+        current_app.logger.error(f"❌ Gagal ambil data hewan: {e}")
         return jsonify({'message': 'Gagal ambil data', 'error': str(e)}), 500
 
 # ----------------------------------------------------------------------
@@ -83,7 +92,10 @@ def update_pet(pet_id):
         if 'jenis' in data: pet.jenis = data['jenis']
         if 'warna' in data: pet.warna = data['warna']
         if 'usia' in data: pet.usia = data['usia']
-        if 'foto_url' in data: pet.foto_url = data['foto_url']
+        # Foto upload hanya dilepas kalau foto_url yang dikirim berbeda dari yang tampil
+        if 'foto_url' in data and data['foto_url'] != image_url(pet.foto_key, 'medium', pet.foto_url):
+            pet.foto_url = data['foto_url']
+            pet.foto_key = None
             
         db.session.commit()
         return jsonify({'message': 'Data hewan berhasil diupdate!'}), 200
@@ -106,4 +118,35 @@ def delete_pet(pet_id):
         return jsonify({'message': 'Hewan berhasil dihapus!'}), 200
     except Exception as e:
         db.session.rollback()
-        return jsonify({'message': 'Gagal hapus hewan', 'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'message': 'Gagal hapus hewan', 'error': str(e)}), 500
+
+# ----------------------------------------------------------------------
+# 5. UPLOAD FOTO HEWAN
+# ----------------------------------------------------------------------
+# Contoh: curl -F "file=@milo.jpg" http://localhost:5000/api/pets/3/foto
+@bp.route('/<int:pet_id>/foto', methods=['POST'])
+def upload_pet_photo(pet_id):
+    pet = Pet.query.get(pet_id)
+    if not pet:
+        return jsonify({'message': 'Hewan tidak ditemukan'}), 404
+
+    try:
+        key = images.save_request_image()
+    except images.ImageTooLarge as e:
+        return jsonify({'message': str(e)}), 413
+    except images.InvalidImage as e:
+        return jsonify({'message': str(e)}), 400
+
+    try:
+        pet.foto_key = key
+        db.session.commit()
+        current_app.logger.info(f"🖼️ UPLOAD FOTO HEWAN: {pet.nama_hewan} ({key})")
+        return jsonify({
+            'message': 'Foto hewan berhasil diupload!',
+            'foto_url': image_url(key, 'medium'),
+            'thumb_url': image_url(key, 'thumb')
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"❌ Gagal upload foto hewan: {e}")
+        return jsonify({'message': 'Gagal simpan foto hewan', 'error': str(e)}), 500
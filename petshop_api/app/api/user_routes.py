@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify,current_app
 from app import db
 from app.models import User
-from werkzeug.security import generate_password_hash, check_password_hash
+from app import stats
+from app.passwords import HashingBusy, get_hasher
 
 bp = Blueprint('user_api', __name__, url_prefix='/api/users')
 
@@ -18,7 +19,10 @@ def register():
     if User.query.filter_by(email=data['email']).first():
         return jsonify({'message': 'Email sudah terdaftar'}), 400
 
-    hashed_password = generate_password_hash(data['password'], method='pbkdf2:sha256')
+    try:
+        hashed_password = get_hasher().hash(data['password'])
+    except HashingBusy:
+        return jsonify({'message': 'Server sedang sibuk, coba lagi sebentar'}), 503
     
     new_user = User(
         nama_lengkap=data['nama_lengkap'],
@@ -30,6 +34,8 @@ def register():
 
     try:
         db.session.add(new_user)
+        db.session.flush()
+        stats.record_transition('user', new_user.created_at, None, new_user.role)
         db.session.commit()
         current_app.logger.info(f"👤 USER BARU DAFTAR: {data['nama_lengkap']} ({data['email']})")
         return jsonify({'message': 'Registrasi berhasil'}), 201
@@ -46,10 +52,23 @@ def login():
         return jsonify({'message': 'Email dan password wajib diisi'}), 400
 
     user = User.query.filter_by(email=data['email']).first()
-
-    if not user or not check_password_hash(user.password, data['password']):
+    if not user:
         return jsonify({'message': 'Email atau password salah'}), 401
 
+    hasher = get_hasher()
+    try:
+        valid, needs_rehash = hasher.verify(user.password, data['password'])
+        if not valid:
+            return jsonify({'message': 'Email atau password salah'}), 401
+
+        # Parameter hash di Config sudah berubah -> simpan ulang dengan parameter baru
+        if needs_rehash:
+            user.password = hasher.hash(data['password'])
+            db.session.commit()
+            current_app.logger.info(f"🔐 Password user ID {user.id} di-hash ulang ({hasher.prefix})")
+    except HashingBusy:
+        return jsonify({'message': 'Server sedang sibuk, coba lagi sebentar'}), 503
+
     return jsonify({
         'message': 'Login berhasil',
         'user': {
@@ -94,10 +113,13 @@ def update_user(user_id):
         
         # Jika ganti password
         if 'password' in data and data['password']:
-             user.password = generate_password_hash(data['password'], method='pbkdf2:sha256')
+             user.password = get_hasher().hash(data['password'])
 
         db.session.commit()
         return jsonify({'message': 'Profil berhasil diupdate'}), 200
+    except HashingBusy:
+        db.session.rollback()
+        return jsonify({'message': 'Server sedang sibuk, coba lagi sebentar'}), 503
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': 'Gagal update', 'error': str(e)}), 500
\ No newline at end of file
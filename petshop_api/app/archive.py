@@ -0,0 +1,227 @@
+# File: app/archive.py
+
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta
+
+import click
+import sqlalchemy as sa
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app import db
+from app import order_summary
+from app.models import Order, OrderDetail, Booking, OrderArchive, OrderDetailArchive, BookingArchive
+from app.pagination import keyset_filter, page_result
+# Status akhir (tidak bisa berubah lagi) -> aman dipindah ke arsip
+from app.status_flow import ORDER_FINAL_STATUSES, BOOKING_FINAL_STATUSES
+
+
+# ----------------------------------------------------------------------
+# PEMINDAHAN KE ARSIP
+# ----------------------------------------------------------------------
+def _copy(source, archive, where, archived_at):
+    """INSERT INTO arsip SELECT kolom yang sama FROM sumber WHERE ..."""
+    names = [c.name for c in archive.columns if c.name != 'archived_at']
+    select = sa.select(*(source.c[name] for name in names),
+                       sa.literal(archived_at, sa.DateTime).label('archived_at')).where(where)
+    db.session.execute(archive.insert().from_select(names + ['archived_at'], select))
+
+
+def _high_water_ids(model, *extra):
+    """
+    ID yang tidak boleh diarsipkan: baris dengan ID terbesar. SQLite (tanpa
+    AUTOINCREMENT) dan MySQL < 8.0 (setelah restart) memberi ID baru max(id)+1;
+    selama baris ID terbesar tetap di tabel hot, ID yang sudah ada di arsip
+    tidak pernah dipakai lagi oleh data baru.
+    """
+    ids = {db.session.query(sa.func.max(model.id)).scalar()}
+    ids.update(query.scalar() for query in extra)
+    return sorted(i for i in ids if i is not None)
+
+
+def archive_orders(cutoff, batch_size=1000):
+    """
+    Pindahkan order selesai/batal dengan created_at < cutoff (berikut detailnya)
+    ke tabel arsip. 1 batch = 1 transaksi (salin lalu hapus), jadi kalau proses
+    berhenti di tengah, tidak ada yang hilang/dobel dan cukup dijalankan lagi.
+    """
+    orders, details = Order.__table__, OrderDetail.__table__
+    # Order pemilik detail ID terbesar juga tetap di hot (ID order_details sama halnya)
+    keep = _high_water_ids(Order, db.session.query(OrderDetail.order_id)
+                           .order_by(OrderDetail.id.desc()).limit(1))
+    moved = 0
+    while True:
+        rows = (db.session.query(Order.id, Order.line_count)
+                .filter(Order.status.in_(ORDER_FINAL_STATUSES), Order.created_at < cutoff,
+                        Order.id.notin_(keep))
+                .limit(batch_size)
+                .all())
+        if not rows:
+            break
+        ids = [row.id for row in rows]
+        # Arsip dibaca tanpa JOIN ke items: pastikan ringkasan & snapshot sudah terisi
+        order_summary.fill([row.id for row in rows if row.line_count is None])
+        archived_at = datetime.utcnow()
+        _copy(orders, OrderArchive.__table__, orders.c.id.in_(ids), archived_at)
+        _copy(details, OrderDetailArchive.__table__, details.c.order_id.in_(ids), archived_at)
+        db.session.execute(details.delete().where(details.c.order_id.in_(ids)))
+        db.session.execute(orders.delete().where(orders.c.id.in_(ids)))
+        db.session.commit()
+        moved += len(ids)
+    return moved
+
+
+def archive_bookings(cutoff, batch_size=1000):
+    """Sama seperti archive_orders untuk booking selesai/batal dengan booking_date < cutoff."""
+    bookings = Booking.__table__
+    keep = _high_water_ids(Booking)
+    moved = 0
+    while True:
+        ids = [booking_id for (booking_id,) in
+               db.session.query(Booking.id)
+               .filter(Booking.status.in_(BOOKING_FINAL_STATUSES), Booking.booking_date < cutoff.date(),
+                       Booking.id.notin_(keep))
+               .limit(batch_size)]
+        if not ids:
+            break
+        _copy(bookings, BookingArchive.__table__, bookings.c.id.in_(ids), datetime.utcnow())
+        db.session.execute(bookings.delete().where(bookings.c.id.in_(ids)))
+        db.session.commit()
+        moved += len(ids)
+    return moved
+
+
+def run_archive(config, now=None):
+    """Arsipkan order & booking yang lebih tua dari ARCHIVE_AFTER_DAYS. Mengembalikan (order, booking)."""
+    cutoff = (now or datetime.utcnow()) - timedelta(days=config.get('ARCHIVE_AFTER_DAYS', 180))
+    batch_size = config.get('ARCHIVE_BATCH_SIZE', 1000)
+    return archive_orders(cutoff, batch_size), archive_bookings(cutoff, batch_size)
+
+
+def start_archiver(app):
+    """Jalankan run_archive() tiap ARCHIVE_INTERVAL detik di thread background (0 = mati)."""
+    interval = app.config.get('ARCHIVE_INTERVAL', 0)
+    if not interval or app.config.get('TESTING'):
+        return None
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    orders, bookings = run_archive(app.config)
+                    if orders or bookings:
+                        app.logger.info(f"🗄️ Diarsipkan: {orders} order, {bookings} booking")
+                except Exception as e:
+                    # Worker lain bisa mengarsipkan batch yang sama bersamaan: batch ini
+                    # batal (rollback), sisanya diambil di putaran berikutnya
+                    db.session.rollback()
+                    app.logger.error(f"❌ Arsip order/booking gagal: {e}")
+                finally:
+                    db.session.remove()
+
+    thread = threading.Thread(target=loop, name='archiver', daemon=True)
+    thread.start()
+    return thread
+
+
+# ----------------------------------------------------------------------
+# BACA: DATA HOT DULU, ARSIP HANYA KALAU DIBUTUHKAN
+# ----------------------------------------------------------------------
+def _sort_key(sort_attr):
+    # NULL dianggap paling kecil (paling akhir di urutan DESC), sama seperti SQLite/MySQL
+    def key(row):
+        value = getattr(row, sort_attr)
+        return (value is not None, value, row.id)
+    return key
+
+
+def page_with_archive(build, hot_model, archive_model, sort_attr, limit, cursor_value=None):
+    """
+    Keyset paging (sort_attr DESC, id DESC) yang lanjut ke tabel arsip.
+
+    `build(model)` mengembalikan query ber-filter untuk model hot atau arsip
+    (kolomnya sama). Tabel arsip hanya dibaca kalau halaman ini tidak penuh
+    dari data hot, atau kalau baris arsip terbaru masih masuk rentang halaman
+    ini; halaman-halaman awal cukup 1 query index ke tabel hot yang kecil.
+    Mengembalikan (rows, next_cursor) seperti pagination.paginate.
+    """
+    def fetch(model):
+        sort_col = getattr(model, sort_attr)
+        query = build(model)
+        if cursor_value:
+            query = query.filter(keyset_filter(sort_col, model.id, *cursor_value))
+        return query.order_by(sort_col.desc(), model.id.desc()).limit(limit + 1).all()
+
+    key = _sort_key(sort_attr)
+    rows = fetch(hot_model)
+    if len(rows) > limit:
+        sort_col = getattr(archive_model, sort_attr)
+        newest = (db.session.query(sort_col, archive_model.id)
+                  .order_by(sort_col.desc(), archive_model.id.desc())
+                  .first())
+        if newest is None or key(rows[-1]) > (newest[0] is not None, newest[0], newest[1]):
+            return page_result(rows, limit, sort_attr)
+
+    archived = fetch(archive_model)
+    if archived:
+        # Baris yang sedang dipindah bisa terbaca di kedua tabel: ambil sekali
+        seen = {row.id for row in rows}
+        rows = sorted(rows + [row for row in archived if row.id not in seen], key=key, reverse=True)
+    return page_result(rows[:limit + 1], limit, sort_attr)
+
+
+def all_with_archive(build, hot_model, archive_model, sort_attr):
+    """Semua baris hot + arsip, urut sort_attr DESC, id DESC (untuk endpoint tanpa paging)."""
+    key = _sort_key(sort_attr)
+    rows = build(hot_model).all()
+    seen = {row.id for row in rows}
+    rows += [row for row in build(archive_model).all() if row.id not in seen]
+    return sorted(rows, key=key, reverse=True)
+
+
+def iter_with_archive(build, hot_model, archive_model, sort_attr):
+    """
+    Seperti all_with_archive tapi sebagai iterator untuk response streaming:
+    kedua tabel dibaca per batch (keyset, STREAM_JSON_BATCH_SIZE baris) lalu digabung
+    dengan heapq.merge, jadi urutannya tetap sort_attr DESC, id DESC
+    dan memori hanya sekitar 2 batch. Tidak memakai 2 server-side cursor
+    sekaligus (MySQL tidak bisa di 1 koneksi).
+    """
+    batch_size = current_app.config.get('STREAM_JSON_BATCH_SIZE', 500)
+
+    def batches(model):
+        sort_col = getattr(model, sort_attr)
+        cursor_value = None
+        while True:
+            query = build(model)
+            if cursor_value:
+                query = query.filter(keyset_filter(sort_col, model.id, *cursor_value))
+            rows = query.order_by(sort_col.desc(), model.id.desc()).limit(batch_size).all()
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            cursor_value = (getattr(rows[-1], sort_attr), rows[-1].id)
+
+    # Baris yang sedang dipindah bisa terbaca di kedua tabel; urutannya sama
+    # persis, jadi duplikatnya selalu berurutan dan cukup dibandingkan dengan baris sebelumnya
+    previous_id = None
+    for row in heapq.merge(batches(hot_model), batches(archive_model), key=_sort_key(sort_attr), reverse=True):
+        if row.id != previous_id:
+            previous_id = row.id
+            yield row
+
+
+@click.command('archive-run')
+@click.option('--days', type=int, default=None, help='Umur minimal (hari), default ARCHIVE_AFTER_DAYS')
+@with_appcontext
+def archive_run_command(days):
+    """Pindahkan order/booking selesai & batal yang sudah lama ke tabel arsip (aman diulang)."""
+    config = dict(current_app.config)
+    if days is not None:
+        config['ARCHIVE_AFTER_DAYS'] = days
+    started = time.perf_counter()
+    orders, bookings = run_archive(config)
+    click.echo(f'✅ Diarsipkan: {orders} order, {bookings} booking ({time.perf_counter() - started:.1f} detik)')
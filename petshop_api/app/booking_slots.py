@@ -0,0 +1,228 @@
+# File: app/booking_slots.py
+
+import re
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import update, func, case
+from app import db
+from app.database import upsert_stmt
+from app.models import Booking, BookingSlot
+from app.service_cache import service_catalog
+
+slots_table = BookingSlot.__table__
+
+# Status booking yang TIDAK memakai slot
+RELEASED_STATUSES = ('batal',)
+
+# '10:30', '9.30', '10:30 AM', '2:00 pm'
+_TIME_RE = re.compile(r'^\s*(\d{1,2})[:.](\d{2})\s*([AaPp][Mm])?\s*$')
+
+
+class SlotError(ValueError):
+    """Jam booking tidak bisa dibaca / di luar jadwal layanan."""
+
+
+class SlotFull(Exception):
+    """Slot yang diminta sudah penuh."""
+
+    def __init__(self, service_name, day, slot_time):
+        super().__init__(f"Slot {service_name} {day} jam {slot_time} sudah penuh")
+        self.service_name = service_name
+        self.day = day
+        self.slot_time = slot_time
+
+
+def holds_slot(status):
+    return status not in RELEASED_STATUSES
+
+
+def _to_minutes(text):
+    match = _TIME_RE.match(text or '')
+    if not match:
+        raise SlotError(f"Format jam tidak dikenal: {text!r}")
+    hour, minute, ampm = int(match.group(1)), int(match.group(2)), match.group(3)
+    if ampm:
+        if not 1 <= hour <= 12:
+            raise SlotError(f"Format jam tidak dikenal: {text!r}")
+        hour = hour % 12 + (12 if ampm.lower() == 'pm' else 0)
+    if hour > 23 or minute > 59:
+        raise SlotError(f"Format jam tidak dikenal: {text!r}")
+    return hour * 60 + minute
+
+
+def _fmt(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def slot_starts():
+    """Jam mulai semua slot dalam menit, urut."""
+    return sorted(_to_minutes(t) for t in current_app.config['BOOKING_SLOT_TIMES'])
+
+
+def normalize_time(text):
+    """'2:30 PM' -> '14:30' (disimpan di bookings.booking_time)."""
+    return _fmt(_to_minutes(text))
+
+
+def slot_for(text):
+    """Jam booking -> jam mulai slot-nya ('10:30' -> '10:00'). SlotError kalau di luar jadwal."""
+    minutes = _to_minutes(text)
+    length = current_app.config['BOOKING_SLOT_MINUTES']
+    for start in reversed(slot_starts()):
+        if start <= minutes < start + length:
+            return _fmt(start)
+    raise SlotError(f"Jam {_fmt(minutes)} di luar jadwal layanan")
+
+
+def capacity_for(service_name):
+    service = service_catalog.get(service_name)
+    if service and service.kapasitas_slot is not None:
+        return service.kapasitas_slot
+    return current_app.config['BOOKING_SLOT_CAPACITY']
+
+
+def _key(service_name, day, slot_time):
+    return ((slots_table.c.service_name == service_name)
+            & (slots_table.c.booking_date == day)
+            & (slots_table.c.slot_time == slot_time))
+
+
+def reserve_slot(service_name, day, slot_time):
+    """
+    Ambil 1 tempat di slot, di transaksi yang sedang aktif.
+
+    Baris slot dibuat dulu kalau belum ada (upsert tanpa perubahan), lalu
+    UPDATE ... SET terisi = terisi + 1 WHERE terisi < kapasitas. Cek dan
+    tambah terjadi di 1 statement, jadi 2 booking bersamaan tidak bisa
+    sama-sama mendapat tempat terakhir. SlotFull kalau sudah penuh.
+    """
+    ensure = upsert_stmt(db.engine.dialect.name, slots_table,
+                         ['service_name', 'booking_date', 'slot_time'],
+                         lambda new: {'terisi': slots_table.c.terisi})
+    db.session.execute(ensure, {'service_name': service_name, 'booking_date': day,
+                                'slot_time': slot_time, 'terisi': 0})
+
+    taken = db.session.execute(
+        update(slots_table)
+        .where(_key(service_name, day, slot_time),
+               slots_table.c.terisi < capacity_for(service_name))
+        .values(terisi=slots_table.c.terisi + 1)).rowcount
+    if taken != 1:
+        raise SlotFull(service_name, day, slot_time)
+
+
+def release_slot(service_name, day, slot_time, count=1):
+    """Kembalikan `count` tempat di slot (tidak pernah di bawah 0)."""
+    db.session.execute(
+        update(slots_table)
+        .where(_key(service_name, day, slot_time), slots_table.c.terisi > 0)
+        .values(terisi=case((slots_table.c.terisi > count, slots_table.c.terisi - count), else_=0)))
+
+
+def release_bookings(bookings):
+    """
+    Lepas slot banyak booking sekaligus (pembatalan massal): digabung per
+    slot, jadi 1 UPDATE per slot berapapun jumlah bookingnya.
+    bookings = [(service_name, booking_date, booking_time), ...]
+    """
+    counts = {}
+    for service_name, day, booking_time in bookings:
+        try:
+            key = (service_name, day, slot_for(booking_time))
+        except SlotError:
+            continue
+        counts[key] = counts.get(key, 0) + 1
+    for (service_name, day, slot_time), count in sorted(counts.items()):
+        release_slot(service_name, day, slot_time, count)
+
+
+def change_status(booking, new_status):
+    """
+    Sesuaikan isi slot saat status booking berubah (panggil SEBELUM
+    booking.status diganti). Jadi 'batal' -> slot dilepas; dari 'batal'
+    diaktifkan lagi -> slot diambil lagi (bisa SlotFull).
+    """
+    was_held, now_held = holds_slot(booking.status), holds_slot(new_status)
+    if was_held == now_held:
+        return
+    try:
+        slot_time = slot_for(booking.booking_time)
+    except SlotError:
+        # Booking lama dengan jam di luar jadwal tidak pernah tercatat di slot
+        return
+    if now_held:
+        reserve_slot(booking.service_name, booking.booking_date, slot_time)
+    else:
+        release_slot(booking.service_name, booking.booking_date, slot_time)
+
+
+def availability(service_name, start, days):
+    """
+    Sisa tempat per slot untuk 1 layanan, `days` hari mulai `start`.
+    1 query ke booking_slots (kunci unik service_name, booking_date, slot_time).
+    """
+    end = start + timedelta(days=days - 1)
+    rows = (db.session.query(BookingSlot.booking_date, BookingSlot.slot_time, BookingSlot.terisi)
+            .filter(BookingSlot.service_name == service_name,
+                    BookingSlot.booking_date.between(start, end))
+            .all())
+    filled = {(row.booking_date, row.slot_time): row.terisi for row in rows}
+
+    capacity = capacity_for(service_name)
+    now = datetime.now()
+    today, now_minutes = now.date(), now.hour * 60 + now.minute
+    result = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        if day < today:
+            continue
+        slots = []
+        for minutes in slot_starts():
+            # Slot hari ini yang jamnya sudah lewat tidak ditawarkan lagi
+            if day == today and minutes <= now_minutes:
+                continue
+            slot_time = _fmt(minutes)
+            terisi = filled.get((day, slot_time), 0)
+            slots.append({'time': slot_time, 'kapasitas': capacity,
+                          'terisi': terisi, 'sisa': max(0, capacity - terisi)})
+        result.append({'date': day.isoformat(), 'slots': slots})
+    return result
+
+
+def rebuild(conn):
+    """
+    Hitung ulang booking_slots dari tabel bookings (memakai index
+    service_name, booking_date, booking_time). Dipakai migrasi & perbaikan manual.
+    """
+    rows = conn.execute(
+        db.select(Booking.service_name, Booking.booking_date, Booking.booking_time,
+                  func.count().label('jumlah'))
+        .where(Booking.status.is_(None) | Booking.status.notin_(RELEASED_STATUSES))
+        .group_by(Booking.service_name, Booking.booking_date, Booking.booking_time)).all()
+
+    counts = {}
+    for row in rows:
+        try:
+            key = (row.service_name, row.booking_date, slot_for(row.booking_time))
+        except SlotError:
+            continue
+        counts[key] = counts.get(key, 0) + row.jumlah
+
+    conn.execute(slots_table.delete())
+    if counts:
+        conn.execute(slots_table.insert(), [
+            {'service_name': s, 'booking_date': d, 'slot_time': t, 'terisi': n}
+            for (s, d, t), n in counts.items()])
+    return len(counts)
+
+
+@click.command('slots-rebuild')
+@with_appcontext
+def slots_rebuild_command():
+    """Hitung ulang tabel booking_slots dari bookings."""
+    with db.engine.begin() as conn:
+        count = rebuild(conn)
+    click.echo(f'✅ booking_slots dibangun ulang ({count} slot)')
@@ -0,0 +1,56 @@
+# File: app/catalog_cache.py
+
+import hashlib
+import threading
+import time
+from flask import current_app
+
+
+class CatalogCache:
+    """
+    Cache body JSON untuk GET /api/items.
+
+    Setiap kali admin tambah/edit/hapus item, versi katalog dinaikkan
+    (bump) dan body lama dibuang. Selama versi belum berubah, request
+    berikutnya dilayani dari body yang sudah jadi tanpa query ke database.
+
+    ETag dihitung dari isi body, jadi semua worker yang isinya sama
+    memberi ETag yang sama. CATALOG_CACHE_TTL membatasi berapa lama worker
+    lain bisa tertinggal kalau perubahan terjadi di proses berbeda.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self._entry = None  # (version, loaded_at, body, etag)
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+            self._entry = None
+
+    def _fresh(self, entry):
+        if entry is None or entry[0] != self.version:
+            return False
+        ttl = current_app.config.get('CATALOG_CACHE_TTL', 60)
+        return (time.monotonic() - entry[1]) <= ttl
+
+    def peek_etag(self):
+        """ETag body yang sedang di-cache (None kalau cache kosong/kadaluarsa)."""
+        entry = self._entry
+        return entry[3] if self._fresh(entry) else None
+
+    def get(self, build_body):
+        """
+        Kembalikan (body, etag). build_body() hanya dipanggil kalau cache
+        kosong; lock memastikan hanya 1 thread yang membangun ulang.
+        """
+        with self._lock:
+            if not self._fresh(self._entry):
+                body = build_body()
+                etag = hashlib.sha1(body.encode('utf-8')).hexdigest()
+                self._entry = (self.version, time.monotonic(), body, etag)
+            return self._entry[2], self._entry[3]
+
+
+catalog_cache = CatalogCache()
@@ -0,0 +1,162 @@
+# File: app/compression.py
+
+import gzip
+import threading
+import time
+from collections import OrderedDict
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli opsional; tanpa itu hanya gzip
+    brotli = None
+
+_COMPRESSIBLE = ('application/json', 'text/', 'application/javascript', 'image/svg+xml')
+_ENCODINGS = ('gzip', 'br')
+
+
+class CpuBudget:
+    """
+    Token bucket waktu CPU untuk kompresi (per proses worker).
+
+    Setiap detik bertambah `ms_per_second` milidetik jatah; setiap kompresi
+    memotong jatah sebesar waktu yang benar-benar dipakai. Kalau jatah
+    habis, response dikirim tanpa kompresi (tetap benar, hanya lebih besar)
+    supaya kompresi tidak memakan CPU yang dibutuhkan untuk melayani request.
+    """
+
+    def __init__(self, ms_per_second):
+        self.rate = ms_per_second / 1000.0
+        self._lock = threading.Lock()
+        self._tokens = self.rate
+        self._updated = time.monotonic()
+        self.skipped = 0
+
+    def available(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens > 0:
+                return True
+            self.skipped += 1
+            return False
+
+    def spend(self, seconds):
+        with self._lock:
+            self._tokens -= seconds
+
+
+class CompressedCache:
+    """Body terkompresi per (ETag, encoding), supaya katalog yang sama tidak dikompres ulang."""
+
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            body = self._data.get(key)
+            if body is not None:
+                self._data.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        with self._lock:
+            self._data[key] = body
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+
+def choose_encoding(accept_encodings, allow_brotli=True):
+    """Pilih 'br' atau 'gzip' dari header Accept-Encoding (None = jangan kompres)."""
+    if allow_brotli and brotli is not None and accept_encodings['br'] > 0:
+        return 'br'
+    if accept_encodings['gzip'] > 0:
+        return 'gzip'
+    return None
+
+
+def encoded_etag(etag, encoding):
+    """ETag versi terkompresi: byte-nya beda, jadi validatornya juga beda ('<hash>-gzip')."""
+    return f'{etag}-{encoding}'
+
+
+def etag_matches(etag):
+    """If-None-Match cocok dengan `etag` atau salah satu versi terkompresinya."""
+    if_none_match = request.if_none_match
+    return (if_none_match.contains(etag)
+            or any(if_none_match.contains(encoded_etag(etag, e)) for e in _ENCODINGS))
+
+
+def compress(body, encoding, gzip_level=5, brotli_quality=4):
+    if encoding == 'br':
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def init_compression(app):
+    """
+    Kompres response (gzip/brotli sesuai Accept-Encoding client).
+
+    Dilewati untuk body kecil (< COMPRESS_MIN_BYTES), tipe yang tidak perlu
+    (gambar, dll), response streaming, 304, dan saat jatah CPU habis.
+    Response dengan ETag (mis. katalog GET /api/items) disimpan versi
+    terkompresinya, jadi body yang sama cukup dikompres sekali, dan ETag-nya
+    diberi akhiran encoding (lihat encoded_etag). Endpoint yang membalas 304
+    sendiri membandingkan If-None-Match dengan etag_matches().
+    """
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+
+    min_bytes = app.config.get('COMPRESS_MIN_BYTES', 1024)
+    gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', 5)
+    brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', 4)
+    allow_brotli = app.config.get('COMPRESS_BROTLI', True)
+    budget = CpuBudget(app.config.get('COMPRESS_CPU_BUDGET_MS', 250))
+    cache = CompressedCache(app.config.get('COMPRESS_CACHE_SIZE', 32))
+    app.extensions['compression_budget'] = budget
+
+    @app.after_request
+    def _compress_response(response):
+        if response.status_code == 304:
+            # 304 membawa validator yang sama dengan yang dipegang client
+            etag, weak = response.get_etag()
+            for encoding in _ENCODINGS if etag else ():
+                if request.if_none_match.contains(encoded_etag(etag, encoding)):
+                    response.set_etag(encoded_etag(etag, encoding), weak)
+                    break
+            return response
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers
+                or not (response.mimetype or '').startswith(_COMPRESSIBLE)):
+            return response
+
+        # Isi response bisa beda per Accept-Encoding -> cache perantara harus membedakan
+        response.vary.add('Accept-Encoding')
+        if response.content_length is not None and response.content_length < min_bytes:
+            return response
+        encoding = choose_encoding(request.accept_encodings, allow_brotli)
+        if encoding is None:
+            return response
+
+        etag, weak = response.get_etag()
+        cache_key = (etag, encoding) if etag else None
+        body = cache.get(cache_key) if cache_key else None
+        if body is None:
+            if not budget.available():
+                return response
+            started = time.perf_counter()
+            body = compress(response.get_data(), encoding, gzip_level, brotli_quality)
+            budget.spend(time.perf_counter() - started)
+            if cache_key:
+                cache.put(cache_key, body)
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            response.set_etag(encoded_etag(etag, encoding), weak)
+        return response
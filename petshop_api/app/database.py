@@ -0,0 +1,138 @@
+# File: app/database.py
+
+import threading
+import time
+
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+# Opsi yang hanya berlaku untuk QueuePool (tidak dipakai SQLite)
+_POOL_ONLY_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout')
+
+
+class PoolStats:
+    """Statistik checkout koneksi dari pool (berapa lama request menunggu koneksi)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited, timed_out=False):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            if timed_out:
+                self.timeouts += 1
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool biasa yang mencatat waktu tunggu setiap checkout koneksi."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - started)
+        return conn
+
+
+def configure_engines(app):
+    """
+    Siapkan opsi engine sebelum db.init_app():
+    - SQLite: buang opsi khusus QueuePool
+    - Database lain: pakai InstrumentedQueuePool supaya ada metrik pool
+    - Daftarkan read replica sebagai bind 'replica' kalau dikonfigurasi
+    """
+    uris = [app.config['SQLALCHEMY_DATABASE_URI']]
+    replica_url = app.config.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        app.config['SQLALCHEMY_BINDS'] = {**app.config.get('SQLALCHEMY_BINDS', {}), 'replica': replica_url}
+        uris.append(replica_url)
+
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    if any(uri.startswith('sqlite') for uri in uris):
+        for key in _POOL_ONLY_OPTIONS:
+            options.pop(key, None)
+    else:
+        options.setdefault('poolclass', InstrumentedQueuePool)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def _use_replica():
+    if not has_request_context():
+        return False
+    return (request.method in ('GET', 'HEAD')
+            and request.blueprint in current_app.config.get('READ_REPLICA_BLUEPRINTS', ()))
+
+
+class RoutingSession(Session):
+    """
+    Session yang mengarahkan query baca dari blueprint GET-heavy ke replica.
+    Flush (INSERT/UPDATE/DELETE) selalu ke database utama.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and _use_replica():
+            replica = self._db.engines.get('replica')
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def pool_status(db):
+    """Ringkasan kondisi pool tiap engine (utama & replica)."""
+    result = {}
+    for key, engine in db.engines.items():
+        pool = engine.pool
+        info = {'pool_class': type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            info.update({
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': pool.overflow(),
+            })
+        stats = getattr(pool, 'stats', None)
+        if stats is not None:
+            info.update({
+                'checkouts': stats.checkouts,
+                'timeouts': stats.timeouts,
+                'wait_avg_ms': round(stats.wait_total / stats.checkouts * 1000, 3) if stats.checkouts else 0.0,
+                'wait_max_ms': round(stats.wait_max * 1000, 3),
+            })
+        result[key or 'default'] = info
+    return result
+
+
+def upsert_stmt(dialect_name, table, conflict_columns, build_set):
+    """
+    INSERT yang berubah jadi UPDATE kalau baris dengan kunci unik yang sama
+    sudah ada (MySQL: ON DUPLICATE KEY UPDATE, SQLite/PostgreSQL: ON CONFLICT).
+
+    build_set(inserted) mengembalikan {kolom: ekspresi}; `inserted` menunjuk
+    nilai baris yang mau di-insert (mis. table.c.jumlah + inserted.jumlah).
+    Statement bisa dijalankan dengan 1 dict atau list dict (executemany).
+    """
+    if dialect_name == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        return stmt.on_duplicate_key_update(**build_set(stmt.inserted))
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(index_elements=conflict_columns, set_=build_set(stmt.excluded))
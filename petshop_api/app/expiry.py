@@ -0,0 +1,109 @@
+# File: app/expiry.py
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app import db
+from app.models import Order, Booking
+from app.catalog_cache import catalog_cache
+from app.idempotency import purge_expired
+from app.status_flow import TransitionConflict, bulk_update_orders, bulk_update_bookings
+
+UNPAID_STATUS = 'menunggu_pembayaran'
+EXPIRED_REASON = 'Dibatalkan otomatis: batas waktu pembayaran habis'
+
+
+def _claim(model, cutoff, batch_size, *extra_filters):
+    """
+    Ambil (dan kunci) 1 batch ID yang sudah kadaluarsa, paling lama dulu.
+
+    FOR UPDATE SKIP LOCKED: baris yang sedang dikunci instance lain dilewati,
+    jadi beberapa instance bisa menyapu bersamaan tanpa saling menunggu dan
+    tanpa memproses baris yang sama. Pakai index (status, created_at).
+    """
+    rows = (db.session.query(model.id)
+            .filter(model.status == UNPAID_STATUS, model.created_at < cutoff, *extra_filters)
+            .order_by(model.created_at, model.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True))
+    return [row.id for row in rows]
+
+
+def _sweep(model, bulk_update, ttl_minutes, batch_size, *extra_filters):
+    cutoff = datetime.utcnow() - timedelta(minutes=ttl_minutes)
+    total = 0
+    while True:
+        try:
+            ids = _claim(model, cutoff, batch_size, *extra_filters)
+            if not ids:
+                db.session.rollback()
+                break
+            report, changed = bulk_update(ids, 'batal', reason=EXPIRED_REASON)
+            db.session.commit()
+        except TransitionConflict:
+            # Ada yang baru dibayar di antara SELECT dan UPDATE; ulangi batch ini
+            db.session.rollback()
+            continue
+        except Exception:
+            db.session.rollback()
+            raise
+        if changed:
+            total += sum(1 for entry in report if entry['ok'])
+        if len(ids) < batch_size:
+            break
+    return total
+
+
+def expire_unpaid(config):
+    """
+    Batalkan order & booking VA yang belum dibayar melewati batas waktu.
+    Stok order dikembalikan (1 UPDATE massal per batch), slot booking dilepas.
+    Mengembalikan (jumlah order, jumlah booking) yang dibatalkan.
+    """
+    batch_size = config.get('EXPIRY_BATCH_SIZE', 200)
+    orders = _sweep(Order, bulk_update_orders, config['UNPAID_ORDER_TTL_MINUTES'], batch_size)
+    if orders:
+        catalog_cache.bump()  # stok berubah
+    # Booking "Bayar di Tempat" tidak punya VA dan tidak ikut kadaluarsa
+    bookings = _sweep(Booking, bulk_update_bookings, config['UNPAID_BOOKING_TTL_MINUTES'], batch_size,
+                      Booking.va_number.isnot(None))
+    return orders, bookings
+
+
+def start_expiry_scheduler(app):
+    """Jalankan expire_unpaid() tiap EXPIRY_SWEEP_INTERVAL detik di thread background."""
+    interval = app.config.get('EXPIRY_SWEEP_INTERVAL', 0)
+    if not interval or app.config.get('TESTING'):
+        return None
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    orders, bookings = expire_unpaid(app.config)
+                    if orders or bookings:
+                        app.logger.info(f"⏰ Kadaluarsa dibatalkan: {orders} order, {bookings} booking")
+                    # Sekalian bersihkan Idempotency-Key yang sudah lewat TTL
+                    purge_expired()
+                except Exception as e:
+                    app.logger.error(f"❌ Sweeper order kadaluarsa gagal: {e}")
+                finally:
+                    db.session.remove()
+
+    thread = threading.Thread(target=loop, name='unpaid-expiry', daemon=True)
+    thread.start()
+    return thread
+
+
+@click.command('expire-unpaid')
+@with_appcontext
+def expire_unpaid_command():
+    """Batalkan order/booking yang belum dibayar melewati batas waktu (sekali jalan)."""
+    orders, bookings = expire_unpaid(current_app.config)
+    click.echo(f'✅ Dibatalkan: {orders} order, {bookings} booking')
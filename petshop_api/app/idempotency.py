@@ -0,0 +1,337 @@
+# File: app/idempotency.py
+
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app, request, jsonify, g, has_request_context
+from flask.cli import with_appcontext
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import IdempotencyKey
+
+keys_table = IdempotencyKey.__table__
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 100
+
+
+class StoredResponse:
+    __slots__ = ('fingerprint', 'status_code', 'body', 'mimetype', 'expires_at', 'claimed_at', 'committed_at')
+
+    def __init__(self, fingerprint, status_code, body, mimetype, expires_at, claimed_at=None, committed_at=None):
+        self.fingerprint = fingerprint
+        self.status_code = status_code
+        self.body = body
+        self.mimetype = mimetype
+        self.expires_at = expires_at
+        self.claimed_at = claimed_at
+        self.committed_at = committed_at
+
+
+class ClaimLost(Exception):
+    """Klaim sudah diambil alih request lain (lease habis): commit handler dibatalkan."""
+
+
+class _Claim:
+    """Klaim milik request ini; claimed_at dipakai sebagai token di setiap UPDATE/DELETE."""
+    __slots__ = ('scope', 'key', 'claimed_at', 'committed')
+
+    def __init__(self, scope, key, claimed_at):
+        self.scope = scope
+        self.key = key
+        self.claimed_at = claimed_at
+        self.committed = False
+
+    def where(self):
+        return (keys_table.c.scope == self.scope, keys_table.c.key == self.key,
+                keys_table.c.claimed_at == self.claimed_at)
+
+
+class IdempotencyStore:
+    """
+    Penyimpan response per (scope, Idempotency-Key).
+
+    - Database (tabel idempotency_keys) adalah sumber kebenaran, berlaku
+      lintas worker/instance; baris dibuat SEBELUM handler jalan (klaim),
+      kunci unik memastikan hanya 1 request yang menang.
+    - Klaim punya lease (claimed_at): kalau proses pemiliknya mati sebelum
+      response tersimpan, request ulang mengambil alih setelah
+      IDEMPOTENCY_LEASE_SECONDS. committed_at ditulis di transaksi yang sama
+      dengan perubahan data handler, jadi handler yang datanya sudah
+      ter-commit tidak pernah dijalankan ulang.
+    - LRU in-process di depannya untuk replay tanpa query database.
+    - Request kembar di proses yang sama menunggu Event milik request
+      pertama; di proses lain menunggu dengan polling baris database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()
+        self._inflight = {}
+
+    # -- LRU -----------------------------------------------------------
+
+    def _lru_get(self, cache_key):
+        with self._lock:
+            entry = self._lru.get(cache_key)
+            if entry is None:
+                return None
+            if entry.expires_at < datetime.utcnow():
+                del self._lru[cache_key]
+                return None
+            self._lru.move_to_end(cache_key)
+            return entry
+
+    def _lru_put(self, cache_key, entry):
+        size = current_app.config.get('IDEMPOTENCY_LRU_SIZE', 10000)
+        with self._lock:
+            self._lru[cache_key] = entry
+            self._lru.move_to_end(cache_key)
+            while len(self._lru) > size:
+                self._lru.popitem(last=False)
+
+    # -- database (koneksi sendiri, commit langsung, terpisah dari db.session) --
+
+    def _claim(self, scope, key, fingerprint):
+        """_Claim kalau request ini yang memegang key (baris baru / ambil alih), selain itu None."""
+        # Detik bulat: claimed_at dibandingkan persis (=), DATETIME MySQL tanpa pecahan detik
+        now = datetime.utcnow().replace(microsecond=0)
+        ttl = timedelta(hours=current_app.config.get('IDEMPOTENCY_TTL_HOURS', 24))
+        try:
+            with db.engine.begin() as conn:
+                # Key lama yang sudah kadaluarsa boleh dipakai ulang
+                conn.execute(delete(keys_table).where(keys_table.c.scope == scope, keys_table.c.key == key,
+                                                      keys_table.c.expires_at < now))
+                conn.execute(keys_table.insert().values(scope=scope, key=key, fingerprint=fingerprint,
+                                                        created_at=now, claimed_at=now, expires_at=now + ttl))
+            return _Claim(scope, key, now)
+        except IntegrityError:
+            pass
+
+        # Klaim ditinggal (lease habis, data handler belum ter-commit): ambil alih.
+        # UPDATE kondisional, jadi dari beberapa request ulang hanya 1 yang menang.
+        lease = timedelta(seconds=current_app.config.get('IDEMPOTENCY_LEASE_SECONDS', 30))
+        with db.engine.begin() as conn:
+            taken = conn.execute(update(keys_table)
+                                 .where(keys_table.c.scope == scope, keys_table.c.key == key,
+                                        keys_table.c.status_code.is_(None),
+                                        keys_table.c.committed_at.is_(None),
+                                        keys_table.c.claimed_at < now - lease)
+                                 .values(fingerprint=fingerprint, claimed_at=now)).rowcount
+        return _Claim(scope, key, now) if taken else None
+
+    def _load(self, scope, key):
+        with db.engine.connect() as conn:
+            row = conn.execute(select(keys_table).where(keys_table.c.scope == scope,
+                                                        keys_table.c.key == key)).first()
+        if row is None:
+            return None
+        return StoredResponse(row.fingerprint, row.status_code, row.response_body, row.mimetype, row.expires_at,
+                              row.claimed_at, row.committed_at)
+
+    def _save(self, claim, response):
+        with db.engine.begin() as conn:
+            conn.execute(update(keys_table)
+                         .where(*claim.where())
+                         .values(status_code=response.status_code,
+                                 response_body=response.get_data(as_text=True),
+                                 mimetype=response.mimetype))
+
+    def _release(self, claim):
+        """Handler gagal sebelum commit (5xx/exception): hapus klaim supaya client bisa coba lagi."""
+        with db.engine.begin() as conn:
+            conn.execute(delete(keys_table).where(*claim.where(), keys_table.c.status_code.is_(None),
+                                                  keys_table.c.committed_at.is_(None)))
+
+    def _abandoned(self, stored):
+        lease = timedelta(seconds=current_app.config.get('IDEMPOTENCY_LEASE_SECONDS', 30))
+        return stored.claimed_at is None or stored.claimed_at < datetime.utcnow() - lease
+
+    def _wait_for_other(self, scope, key):
+        """
+        Tunggu request pertama (di proses lain) selesai. Mengembalikan baris
+        terakhir: selesai, dihapus (None), atau klaim yang ditinggal; False
+        kalau masih diproses sampai batas waktu.
+        """
+        deadline = time.monotonic() + current_app.config.get('IDEMPOTENCY_WAIT_TIMEOUT', 10)
+        delay = 0.05
+        while time.monotonic() < deadline:
+            stored = self._load(scope, key)
+            if stored is None or stored.status_code is not None or self._abandoned(stored):
+                return stored
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+        return False
+
+    # -- alur utama ------------------------------------------------------
+
+    def run(self, scope, key, fingerprint, handler):
+        cache_key = (scope, key)
+        while True:
+            stored = self._lru_get(cache_key)
+            if stored is not None:
+                return self._replay(stored, fingerprint)
+
+            # Request kembar di proses yang sama: tunggu yang pertama selesai
+            with self._lock:
+                event = self._inflight.get(cache_key)
+                if event is None:
+                    event = self._inflight[cache_key] = threading.Event()
+                    owner = True
+                else:
+                    owner = False
+            if not owner:
+                event.wait(current_app.config.get('IDEMPOTENCY_WAIT_TIMEOUT', 10))
+                if self._lru_get(cache_key) is None and self._inflight.get(cache_key) is event:
+                    return _still_processing()
+                continue
+
+            try:
+                claim = self._claim(scope, key, fingerprint)
+                if claim is not None:
+                    return self._execute(claim, fingerprint, handler)
+
+                # Sudah ada di database: selesai -> replay, masih jalan -> tunggu
+                stored = self._load(scope, key)
+                if stored is not None and stored.status_code is None:
+                    stored = self._wait_for_other(scope, key)
+                    if stored is False:
+                        return _still_processing()
+                if stored is None:
+                    continue  # klaim lama dihapus (handler gagal); coba klaim lagi
+                if stored.status_code is None:
+                    if stored.committed_at is not None:
+                        # Data sudah ter-commit tapi response tidak tersimpan: jangan diulang
+                        return _already_processed()
+                    continue  # klaim ditinggal: ambil alih lewat _claim
+                self._lru_put(cache_key, stored)
+                return self._replay(stored, fingerprint)
+            finally:
+                with self._lock:
+                    self._inflight.pop(cache_key, None)
+                event.set()
+
+    def _execute(self, claim, fingerprint, handler):
+        # Dibaca _mark_committed saat handler memanggil db.session.commit()
+        g.idempotency_claim = claim
+        try:
+            response = current_app.make_response(handler())
+        except Exception:
+            if not claim.committed:
+                self._release(claim)
+            raise
+        finally:
+            g.pop('idempotency_claim', None)
+        if response.is_streamed or (response.status_code >= 500 and not claim.committed):
+            if not claim.committed:
+                self._release(claim)
+            return response
+
+        try:
+            self._save(claim, response)
+        except Exception as e:
+            # Data handler sudah ter-commit; request ulang dibalas _already_processed()
+            current_app.logger.error(f"❌ Gagal menyimpan response {HEADER} {claim.key}: {e}")
+            return response
+        ttl = timedelta(hours=current_app.config.get('IDEMPOTENCY_TTL_HOURS', 24))
+        self._lru_put((claim.scope, claim.key), StoredResponse(fingerprint, response.status_code,
+                                                   response.get_data(as_text=True), response.mimetype,
+                                                   datetime.utcnow() + ttl))
+        return response
+
+    def _replay(self, stored, fingerprint):
+        if stored.fingerprint != fingerprint:
+            return jsonify({'message': f'{HEADER} sudah dipakai untuk request yang berbeda'}), 422
+        response = current_app.response_class(stored.body, status=stored.status_code, mimetype=stored.mimetype)
+        response.headers['Idempotent-Replayed'] = 'true'
+        return response
+
+    def clear_memory(self):
+        with self._lock:
+            self._lru.clear()
+
+
+def _still_processing():
+    # Retry-After: client boleh kirim ulang dengan key yang SAMA (bukan key baru)
+    return jsonify({'message': 'Request yang sama masih diproses, coba lagi sebentar'}), 409, {'Retry-After': '1'}
+
+
+def _already_processed():
+    return jsonify({'message': 'Request ini sudah diproses sebelumnya, cek riwayat pesanan'}), 409
+
+
+def _mark_committed(session):
+    """
+    before_commit db.session: tandai klaim Idempotency-Key request ini sebagai
+    committed di transaksi yang sama dengan perubahan data handler. Kalau klaim
+    sudah diambil alih request lain (lease habis), commit dibatalkan.
+    """
+    if not has_request_context():
+        return
+    claim = g.get('idempotency_claim')
+    if claim is None or claim.committed:
+        return
+    marked = session.execute(update(keys_table)
+                             .where(*claim.where(), keys_table.c.committed_at.is_(None))
+                             .values(committed_at=datetime.utcnow())).rowcount
+    if not marked:
+        raise ClaimLost(f'{HEADER} {claim.key} sudah diambil alih request lain')
+    session.info['idempotency_claim'] = claim
+
+
+def _commit_done(session):
+    claim = session.info.pop('idempotency_claim', None)
+    if claim is not None:
+        claim.committed = True
+
+
+def _commit_failed(session):
+    session.info.pop('idempotency_claim', None)
+
+
+event.listen(db.session, 'before_commit', _mark_committed)
+event.listen(db.session, 'after_commit', _commit_done)
+event.listen(db.session, 'after_rollback', _commit_failed)
+
+
+idempotency_store = IdempotencyStore()
+
+
+def idempotent(view):
+    """
+    Decorator endpoint tulis: kalau client mengirim header Idempotency-Key,
+    request ulang dengan key & body yang sama dibalas dengan response
+    pertama tanpa menjalankan handler lagi. Tanpa header: jalan seperti biasa.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({'message': f'{HEADER} maksimal {MAX_KEY_LENGTH} karakter'}), 400
+
+        scope = f'{request.method} {request.path}'
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        return idempotency_store.run(scope, key, fingerprint, lambda: view(*args, **kwargs))
+    return wrapper
+
+
+def purge_expired():
+    """Hapus key yang sudah lewat TTL. Mengembalikan jumlah baris yang dihapus."""
+    with db.engine.begin() as conn:
+        return conn.execute(delete(keys_table).where(keys_table.c.expires_at < datetime.utcnow())).rowcount
+
+
+@click.command('idempotency-purge')
+@with_appcontext
+def idempotency_purge_command():
+    """Hapus Idempotency-Key yang sudah kadaluarsa."""
+    click.echo(f'✅ {purge_expired()} key kadaluarsa dihapus')
@@ -0,0 +1,358 @@
+# File: app/images.py
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from flask import current_app, request
+from flask.cli import with_appcontext
+from PIL import Image, ImageOps
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app import db
+
+_CHUNK_BYTES = 64 * 1024
+# Format file asli yang diterima saat upload
+_UPLOAD_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+# Format varian -> ekstensi file/URL
+_EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+_MIMETYPES = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+
+class ImageTooLarge(Exception):
+    """File upload melebihi IMAGE_MAX_UPLOAD_BYTES (balas 413)."""
+
+
+class InvalidImage(Exception):
+    """File upload bukan gambar yang didukung (balas 400)."""
+
+
+class ImagePipeline:
+    """
+    Simpan gambar upload & buat varian kecilnya (thumb, medium) di pool worker.
+
+    - File asli disimpan sebagai MEDIA_DIR/originals/<key>, dengan key = 20
+      karakter awal SHA-256 isinya. Upload gambar yang sama = key yang sama.
+    - Varian disimpan sebagai MEDIA_DIR/<key>-<varian>-<ukuran>.<ext>. Nama
+      file ikut berubah kalau isi gambar atau ukuran varian berubah, jadi URL-nya
+      boleh di-cache selamanya (Cache-Control: immutable).
+    - Varian dibuat di background setelah upload; kalau diminta sebelum jadi
+      (atau file-nya hilang), GET /media menunggu/membuatnya saat itu juga.
+    """
+
+    def __init__(self, root, variants, fmt, quality, workers, max_bytes, max_pixels,
+                 wait_timeout, logger=None):
+        self.root = root
+        self.originals = os.path.join(root, 'originals')
+        self.variants = dict(variants)
+        self.format = fmt
+        self.ext = _EXTENSIONS[fmt]
+        self.mimetype = _MIMETYPES[fmt]
+        self.quality = quality
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.wait_timeout = wait_timeout
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = {}  # key -> Future yang sedang membuat varian
+        self._name_re = re.compile(
+            r'^(?P<key>[0-9a-f]{20})-(?P<variant>[a-z]+)-(?P<size>\d+)\.' + re.escape(self.ext) + '$')
+
+    @classmethod
+    def from_config(cls, config, logger=None):
+        return cls(root=config['MEDIA_DIR'],
+                   variants=config.get('IMAGE_VARIANTS', {'thumb': 240, 'medium': 960}),
+                   fmt=config.get('IMAGE_FORMAT', 'webp'),
+                   quality=config.get('IMAGE_QUALITY', 80),
+                   workers=config.get('IMAGE_WORKERS', 2),
+                   max_bytes=config.get('IMAGE_MAX_UPLOAD_BYTES', 10 * 1024 * 1024),
+                   max_pixels=config.get('IMAGE_MAX_PIXELS', 40_000_000),
+                   wait_timeout=config.get('IMAGE_VARIANT_WAIT_TIMEOUT', 10),
+                   logger=logger)
+
+    def _pool(self):
+        # Dibuat saat pertama dipakai (aman untuk worker gunicorn hasil fork)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='image-variants')
+            return self._executor
+
+    # ------------------------------------------------------------------
+    # FILE ASLI
+    # ------------------------------------------------------------------
+    def original_path(self, key):
+        return os.path.join(self.originals, key)
+
+    def save(self, stream):
+        """Tulis stream ke disk per potongan sambil di-hash; kembalikan key gambar."""
+        os.makedirs(self.originals, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.originals, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                while True:
+                    chunk = stream.read(_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise ImageTooLarge(f'Ukuran gambar maksimal {self.max_bytes // (1024 * 1024)} MB')
+                    digest.update(chunk)
+                    out.write(chunk)
+            if size == 0:
+                raise InvalidImage('File gambar kosong')
+            self._validate(tmp_path)
+            key = digest.hexdigest()[:20]
+            # Isi sama = nama sama, jadi aman ditimpa (upload ulang / request paralel)
+            os.replace(tmp_path, self.original_path(key))
+            return key
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _validate(self, path):
+        try:
+            with Image.open(path) as img:
+                if img.format not in _UPLOAD_FORMATS:
+                    raise InvalidImage(f"Format gambar harus salah satu dari: {', '.join(_UPLOAD_FORMATS)}")
+                if img.width * img.height > self.max_pixels:
+                    raise InvalidImage('Resolusi gambar terlalu besar')
+                img.verify()
+        except InvalidImage:
+            raise
+        except Exception as e:
+            raise InvalidImage('File bukan gambar yang valid') from e
+
+    # ------------------------------------------------------------------
+    # VARIAN
+    # ------------------------------------------------------------------
+    def variant_name(self, key, variant):
+        return f'{key}-{variant}-{self.variants[variant]}.{self.ext}'
+
+    def _prepare_mode(self, img):
+        has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        if not has_alpha:
+            return img if img.mode == 'RGB' else img.convert('RGB')
+        img = img.convert('RGBA')
+        if self.format == 'webp':
+            return img
+        # JPEG tidak punya transparansi: tempel di atas latar putih
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel('A'))
+        return background
+
+    def render(self, key, variant):
+        """Buat 1 varian (kalau belum ada) dan kembalikan path-nya."""
+        path = os.path.join(self.root, self.variant_name(key, variant))
+        if os.path.exists(path):
+            return path
+        size = self.variants[variant]
+        with Image.open(self.original_path(key)) as img:
+            # JPEG: decode langsung di resolusi mendekati ukuran target (jauh lebih cepat)
+            img.draft('RGB', (size, size))
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=3.0)
+            img = self._prepare_mode(img)
+            options = {'method': 4} if self.format == 'webp' else {'optimize': True, 'progressive': True}
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.part')
+            os.close(fd)
+            try:
+                img.save(tmp_path, format=self.format.upper(), quality=self.quality, **options)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        return path
+
+    def render_all(self, key):
+        return [self.render(key, variant) for variant in self.variants]
+
+    def _render_job(self, key):
+        try:
+            return self.render_all(key)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"❌ Gagal membuat varian gambar {key}: {e}")
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def submit(self, key):
+        """Antrikan pembuatan semua varian key ini (1 job per key, tidak dobel)."""
+        pool = self._pool()
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = pool.submit(self._render_job, key)
+            return future
+
+    def variant_path(self, filename):
+        """
+        Path file untuk GET /media/<filename>, atau None kalau tidak dikenal.
+        Varian yang belum jadi ditunggu (maks IMAGE_VARIANT_WAIT_TIMEOUT detik).
+        """
+        match = self._name_re.match(filename)
+        if not match or self.variants.get(match['variant']) != int(match['size']):
+            return None
+        path = os.path.join(self.root, filename)
+        if os.path.exists(path):
+            return path
+        if not os.path.exists(self.original_path(match['key'])):
+            return None
+        self.submit(match['key']).result(timeout=self.wait_timeout)
+        return path if os.path.exists(path) else None
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+def init_images(app):
+    app.extensions['image_pipeline'] = ImagePipeline.from_config(app.config, app.logger)
+
+
+def get_pipeline():
+    return current_app.extensions['image_pipeline']
+
+
+def save_request_image():
+    """
+    Simpan gambar dari request upload dan antrikan pembuatan variannya.
+
+    Diterima: multipart/form-data field 'file' (atau file pertama), atau body
+    mentah dengan Content-Type image/* (langsung di-stream ke disk).
+    """
+    pipeline = get_pipeline()
+    # Batas ukuran body dicek werkzeug sebelum multipart diurai (sisa 64 KB untuk header form)
+    request.max_content_length = pipeline.max_bytes + _CHUNK_BYTES
+    if request.mimetype.startswith('image/'):
+        key = pipeline.save(request.stream)
+    else:
+        try:
+            files = request.files
+        except RequestEntityTooLarge:
+            raise ImageTooLarge(f'Ukuran gambar maksimal {pipeline.max_bytes // (1024 * 1024)} MB')
+        upload = files.get('file') or next(iter(files.values()), None)
+        if upload is None:
+            raise InvalidImage("Kirim gambar lewat field multipart 'file' atau body image/*")
+        key = pipeline.save(upload.stream)
+    pipeline.submit(key)
+    return key
+
+
+# Pengganti host request di body yang di-cache bersama (catalog_cache): host
+# baru dipasang per request oleh with_media_base(), jadi isi cache tidak
+# bergantung pada header Host client yang kebetulan mengisinya pertama kali
+MEDIA_BASE_MARKER = '@@MEDIA_BASE@@'
+
+
+def _base_url():
+    # MEDIA_BASE_URL untuk CDN; tanpa itu pakai host request ini
+    # (Flutter hanya memuat gambar dari network kalau URL diawali 'http')
+    return current_app.config.get('MEDIA_BASE_URL') or request.host_url + 'media'
+
+
+def cache_base_url():
+    """Base URL untuk body yang di-cache: MEDIA_BASE_URL, atau penanda host."""
+    return current_app.config.get('MEDIA_BASE_URL') or MEDIA_BASE_MARKER
+
+
+def with_media_base(body):
+    """Ganti penanda di body cache dengan base URL request ini."""
+    if current_app.config.get('MEDIA_BASE_URL'):
+        return body
+    return body.replace(MEDIA_BASE_MARKER, _base_url())
+
+
+def media_etag(etag):
+    """
+    ETag body cache setelah with_media_base(). Tanpa MEDIA_BASE_URL isi body
+    ikut host request, jadi ETag juga (304 & cache kompresi per host).
+    """
+    if current_app.config.get('MEDIA_BASE_URL'):
+        return etag
+    return hashlib.sha1(f'{etag}|{_base_url()}'.encode('utf-8')).hexdigest()
+
+
+def image_url(key, variant, fallback=None, base=None):
+    """URL varian gambar upload, atau `fallback` (mis. path asset bawaan) kalau tidak ada."""
+    if not key:
+        return fallback
+    return f'{base or _base_url()}/{get_pipeline().variant_name(key, variant)}'
+
+
+# ----------------------------------------------------------------------
+# PERINTAH CLI
+# ----------------------------------------------------------------------
+def _image_columns():
+    from app.models import Item, Pet
+    # (model, kolom URL lama, kolom key gambar)
+    return [(Item, 'gambar_url', 'gambar_key'), (Pet, 'foto_url', 'foto_key')]
+
+
+@click.command('images-rebuild')
+@with_appcontext
+def images_rebuild_command():
+    """Buat varian yang belum ada untuk semua gambar (mis. setelah IMAGE_VARIANTS diubah)."""
+    pipeline = get_pipeline()
+    keys = set()
+    for model, _, key_column in _image_columns():
+        column = getattr(model, key_column)
+        keys.update(k for (k,) in db.session.query(column).filter(column.isnot(None)).distinct())
+    missing = [k for k in sorted(keys) if not os.path.exists(pipeline.original_path(k))]
+    for future in [pipeline.submit(k) for k in sorted(keys - set(missing))]:
+        future.result()
+    for key in missing:
+        click.echo(f'⚠️ File asli {key} tidak ada di {pipeline.originals}')
+    click.echo(f'✅ Varian {len(keys) - len(missing)} gambar siap')
+
+
+@click.command('images-import-assets')
+@click.argument('assets_root', default=os.path.join(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))), 'petshop_app'))
+@with_appcontext
+def images_import_assets_command(assets_root):
+    """
+    Proses gambar asset bawaan aplikasi (gambar_url/foto_url 'assets/...')
+    lewat pipeline, supaya daftar item/hewan bisa memakai thumbnail.
+    ASSETS_ROOT = folder proyek Flutter (default ../petshop_app).
+    """
+    pipeline = get_pipeline()
+    keys = {}  # path asset -> key, 1 file dipakai banyak item cukup diproses sekali
+    updated = 0
+    for model, url_column, key_column in _image_columns():
+        rows = model.query.filter(getattr(model, key_column).is_(None),
+                                  getattr(model, url_column).like('assets/%')).all()
+        for row in rows:
+            path = os.path.join(assets_root, getattr(row, url_column))
+            if path not in keys:
+                if not os.path.isfile(path):
+                    click.echo(f'⚠️ Asset tidak ditemukan: {path}')
+                    keys[path] = None
+                    continue
+                with open(path, 'rb') as f:
+                    keys[path] = pipeline.save(f)
+            if keys[path]:
+                setattr(row, key_column, keys[path])
+                updated += 1
+    db.session.commit()
+
+    for future in [pipeline.submit(k) for k in set(keys.values()) if k]:
+        future.result()
+    from app.catalog_cache import catalog_cache
+    from app.service_cache import service_catalog
+    service_catalog.invalidate()
+    catalog_cache.bump()
+    click.echo(f'✅ {updated} baris memakai gambar hasil pipeline ({len([k for k in keys.values() if k])} file)')
@@ -0,0 +1,184 @@
+# File: app/item_io.py
+#
+# Import & export katalog items dalam format NDJSON (1 objek JSON per baris)
+# atau CSV. Keduanya streaming: file tidak pernah dimuat utuh ke memori.
+
+import csv
+import io
+import json
+
+from sqlalchemy import bindparam, select, update
+
+from app import db
+from app.models import Item
+
+items_table = Item.__table__
+
+COLUMNS = ['id', 'nama', 'tipe', 'harga', 'stok', 'deskripsi', 'gambar_url']
+REQUIRED_FOR_INSERT = ('nama', 'tipe', 'harga')
+MAX_REPORTED_ERRORS = 1000
+
+
+class RowError(ValueError):
+    pass
+
+
+# ----------------------------------------------------------------------
+# PARSING
+# ----------------------------------------------------------------------
+def iter_rows(stream, fmt):
+    """Baca upload baris demi baris. Menghasilkan (nomor_baris, dict) atau (nomor_baris, RowError)."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {k.strip(): v for k, v in row.items() if k}
+        return
+
+    for line_no, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, RowError(f'JSON tidak valid: {e.msg}')
+            continue
+        if not isinstance(row, dict):
+            yield line_no, RowError('Setiap baris harus objek JSON')
+            continue
+        yield line_no, row
+
+
+def _to_int(row, key):
+    value = row[key]
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise RowError(f"{key} harus angka")
+    if number < 0:
+        raise RowError(f"{key} tidak boleh negatif")
+    return number
+
+
+def clean_row(row):
+    """Validasi 1 baris; hanya kolom yang dikirim (dan tidak kosong) yang dipakai."""
+    values = {}
+    for key in COLUMNS:
+        if key not in row or row[key] is None or row[key] == '':
+            continue
+        if key in ('id', 'harga', 'stok'):
+            values[key] = _to_int(row, key)
+        else:
+            values[key] = str(row[key]).strip()
+    if 'nama' in values and len(values['nama']) > 100:
+        raise RowError('nama maksimal 100 karakter')
+    if 'tipe' in values and len(values['tipe']) > 20:
+        raise RowError('tipe maksimal 20 karakter')
+    if 'id' not in values and 'nama' not in values:
+        raise RowError('Wajib ada id atau nama')
+    return values
+
+
+# ----------------------------------------------------------------------
+# UPSERT PER CHUNK
+# ----------------------------------------------------------------------
+def _bulk_update(rows):
+    """UPDATE per kelompok kolom yang sama, masing-masing 1 executemany."""
+    groups = {}
+    for row in rows:
+        cols = tuple(sorted(k for k in row if k != 'id'))
+        if cols:
+            groups.setdefault(cols, []).append(row)
+    for cols, group in groups.items():
+        stmt = (update(items_table)
+                .where(items_table.c.id == bindparam('b_id'))
+                .values({c: bindparam(f'b_{c}') for c in cols}))
+        db.session.execute(stmt, [{f'b_{k}': v for k, v in r.items()} | {'b_id': r['id']} for r in group])
+
+
+def apply_chunk(rows, created_at):
+    """
+    Simpan 1 chunk (list of (line_no, values)). Kembalikan (inserted, updated, errors).
+
+    - Ada id           -> UPDATE item dengan id tsb (kalau tidak ada -> error baris)
+    - Tanpa id, nama sudah ada -> UPDATE item tsb
+    - Tanpa id, nama baru      -> INSERT (wajib nama, tipe, harga)
+    """
+    errors = []
+    ids = {v['id'] for _, v in rows if 'id' in v}
+    names = {v['nama'] for _, v in rows if 'id' not in v}
+
+    existing_ids = set()
+    if ids:
+        existing_ids = set(db.session.execute(select(items_table.c.id).where(items_table.c.id.in_(ids))).scalars())
+    id_by_name = {}
+    if names:
+        # Nama kembar di katalog: pakai ID terkecil (sama dengan cache layanan)
+        for row in db.session.execute(select(items_table.c.id, items_table.c.nama)
+                                      .where(items_table.c.nama.in_(names))
+                                      .order_by(items_table.c.id.desc())):
+            id_by_name[row.nama] = row.id
+
+    to_update, to_insert = [], []
+    for line_no, values in rows:
+        if 'id' in values:
+            if values['id'] not in existing_ids:
+                errors.append({'line': line_no, 'error': f"Item ID {values['id']} tidak ditemukan"})
+                continue
+            to_update.append(values)
+        elif values['nama'] in id_by_name:
+            to_update.append({**values, 'id': id_by_name[values['nama']]})
+        else:
+            missing = [k for k in REQUIRED_FOR_INSERT if k not in values]
+            if missing:
+                errors.append({'line': line_no, 'error': f"Item baru wajib punya: {', '.join(missing)}"})
+                continue
+            to_insert.append({'nama': values['nama'], 'tipe': values['tipe'], 'harga': values['harga'],
+                              'stok': values.get('stok', 0), 'deskripsi': values.get('deskripsi', ''),
+                              'gambar_url': values.get('gambar_url', 'assets/images/pet_avatar.png'),
+                              'created_at': created_at})
+            # Nama yang sama muncul lagi di chunk ini -> jangan di-insert dua kali
+            id_by_name[values['nama']] = None
+
+    # Baris dengan nama yang baru di-insert di chunk yang sama: update setelah insert
+    pending_by_name = [v for v in to_update if v.get('id') is None]
+    to_update = [v for v in to_update if v.get('id') is not None]
+
+    if to_insert:
+        db.session.execute(items_table.insert(), to_insert)
+    if pending_by_name:
+        fresh = {r.nama: r.id for r in db.session.execute(
+            select(items_table.c.id, items_table.c.nama)
+            .where(items_table.c.nama.in_({v['nama'] for v in pending_by_name}))
+            .order_by(items_table.c.id.desc()))}
+        to_update += [{**v, 'id': fresh[v['nama']]} for v in pending_by_name]
+    if to_update:
+        _bulk_update(to_update)
+    return len(to_insert), len(to_update), errors
+
+
+# ----------------------------------------------------------------------
+# EXPORT
+# ----------------------------------------------------------------------
+def iter_export(fmt, batch_size=1000):
+    """Generator baris export. Query pakai yield_per (server-side cursor)."""
+    stmt = (select(*[items_table.c[c] for c in COLUMNS])
+            .order_by(items_table.c.id)
+            .execution_options(yield_per=batch_size))
+    result = db.session.execute(stmt)
+
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(COLUMNS)
+        yield buffer.getvalue()
+        for rows in result.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(rows)
+            yield buffer.getvalue()
+        return
+
+    for rows in result.partitions():
+        yield ''.join(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + '\n' for row in rows)
@@ -0,0 +1,71 @@
+# File: app/json_provider.py
+
+import datetime
+import decimal
+import uuid
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson opsional; tanpa itu tetap jalan dengan json bawaan
+    orjson = None
+
+
+class PetshopJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider untuk semua jsonify()/request.get_json() di app.
+
+    - Pakai orjson kalau terpasang (encode jauh lebih cepat), kalau tidak
+      kembali ke json bawaan Python dengan aturan tipe yang sama.
+    - datetime ditulis dengan JSON_DATETIME_FORMAT (default '%Y-%m-%d %H:%M',
+      format yang sudah ditampilkan apa adanya oleh aplikasi Flutter),
+      date -> 'YYYY-MM-DD', time -> 'HH:MM[:SS]', Decimal (hasil SUM MySQL) -> str.
+      Route cukup mengirim objeknya, tidak perlu strftime()/str() sendiri.
+    """
+
+    # Urutan key tidak perlu diurutkan (menghemat waktu encode)
+    sort_keys = False
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.datetime_format = app.config.get('JSON_DATETIME_FORMAT', '%Y-%m-%d %H:%M')
+        self.use_orjson = orjson is not None and app.config.get('JSON_PROVIDER', 'orjson') == 'orjson'
+        if self.use_orjson:
+            # datetime/date/time lewat _default supaya formatnya sama dengan versi json bawaan
+            self._orjson_options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def _default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.strftime(self.datetime_format)
+        if isinstance(o, (datetime.date, datetime.time)):
+            return o.isoformat()
+        if isinstance(o, (decimal.Decimal, uuid.UUID)):
+            return str(o)
+        if hasattr(o, '__html__'):
+            return str(o.__html__())
+        raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+    def dumps_bytes(self, obj):
+        if self.use_orjson:
+            return orjson.dumps(obj, default=self._default, option=self._orjson_options)
+        return self.dumps(obj).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.dumps(obj, default=self._default, option=self._orjson_options).decode('utf-8')
+        kwargs.setdefault('default', self._default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        kwargs.setdefault('separators', (',', ':'))
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        # Sama seperti jsonify bawaan, tapi bytes orjson langsung dipakai (tanpa decode/encode ulang)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
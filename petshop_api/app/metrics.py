@@ -0,0 +1,268 @@
+# File: app/metrics.py
+
+import contextvars
+import functools
+import hashlib
+import re
+import threading
+import time
+
+from flask import g, request, current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Batas bucket histogram (detik / jumlah statement)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Profil SQL request yang sedang berjalan di thread/context ini (None = tidak diprofil)
+_current_profile = contextvars.ContextVar('sql_profile', default=None)
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r'\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)')
+_SPACE_RE = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint(statement):
+    """
+    Bentuk baku statement: angka/string jadi ?, daftar IN (?, ?, ...) jadi (?),
+    spasi dirapikan. Statement yang sama dengan parameter berbeda (pola N+1)
+    menghasilkan fingerprint yang sama. Mengembalikan (id pendek, teks).
+    """
+    text = _LITERAL_RE.sub('?', statement)
+    text = _IN_LIST_RE.sub('(?)', text)
+    text = _SPACE_RE.sub(' ', text).strip()
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12], text
+
+
+class SqlProfile:
+    """Jumlah, total waktu dan rincian per fingerprint statement dalam 1 request."""
+
+    __slots__ = ('count', 'seconds', 'statements')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = {}  # fingerprint -> [jumlah, total detik, paling lama, teks]
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        fp, text = fingerprint(statement)
+        entry = self.statements.get(fp)
+        if entry is None:
+            self.statements[fp] = [1, seconds, seconds, text]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def _entry(self, fp, entry, max_sql_chars):
+        count, total, slowest, text = entry
+        return {'fingerprint': fp, 'count': count, 'total_ms': round(total * 1000, 2),
+                'max_ms': round(slowest * 1000, 2), 'sql': text[:max_sql_chars]}
+
+    def slowest(self, limit, max_sql_chars=300):
+        top = sorted(self.statements.items(), key=lambda kv: kv[1][1], reverse=True)[:limit]
+        return [self._entry(fp, entry, max_sql_chars) for fp, entry in top]
+
+    def repeated(self, threshold, max_sql_chars=300):
+        """Statement yang sama dijalankan >= threshold kali (kemungkinan besar N+1)."""
+        return [self._entry(fp, entry, max_sql_chars)
+                for fp, entry in self.statements.items() if entry[0] >= threshold]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    started = conn.info.get('query_started')
+    if started:
+        profile.record(statement, time.perf_counter() - started.pop())
+
+
+def install_sql_hooks():
+    """Pasang hook di semua Engine (utama & replica), sekali per proses."""
+    global _hooks_installed
+    with _hooks_lock:
+        if not _hooks_installed:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            _hooks_installed = True
+
+
+# ---------------------------------------------------------------------
+# HISTOGRAM (format teks Prometheus)
+# ---------------------------------------------------------------------
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=''):
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = {}  # label values -> [jumlah per bucket..., sum, count]
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            for i, bound in enumerate(self.buckets + ('+Inf',)):
+                le = f'le="{bound}"'
+                lines.append(f'{self.name}_bucket{_labels(self.label_names, labels, le)} '
+                             f'{series[i] if i < len(self.buckets) else series[-1]}')
+            lines.append(f'{self.name}_sum{_labels(self.label_names, labels)} {series[-2]}')
+            lines.append(f'{self.name}_count{_labels(self.label_names, labels)} {series[-1]}')
+        return lines
+
+
+class RequestMetrics:
+    """Kumpulan metrik per proses worker (tiap worker gunicorn punya angka sendiri)."""
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            'petshop_http_request_duration_seconds', 'Durasi request HTTP',
+            ('blueprint', 'endpoint', 'method', 'status'), DURATION_BUCKETS)
+        self.db_duration = Histogram(
+            'petshop_db_time_per_request_seconds', 'Total waktu SQL dalam 1 request',
+            ('blueprint', 'endpoint'), DURATION_BUCKETS)
+        self.db_queries = Histogram(
+            'petshop_db_queries_per_request', 'Jumlah statement SQL dalam 1 request',
+            ('blueprint', 'endpoint'), QUERY_COUNT_BUCKETS)
+        self._lock = threading.Lock()
+        self.n_plus_one = {}  # (endpoint, fingerprint) -> jumlah request
+
+    def observe(self, blueprint, endpoint, method, status, seconds, profile, repeated):
+        self.request_duration.observe((blueprint, endpoint, method, str(status)), seconds)
+        self.db_duration.observe((blueprint, endpoint), profile.seconds)
+        self.db_queries.observe((blueprint, endpoint), profile.count)
+        if repeated:
+            with self._lock:
+                for entry in repeated:
+                    key = (endpoint, entry['fingerprint'])
+                    self.n_plus_one[key] = self.n_plus_one.get(key, 0) + 1
+
+    def render(self, pool=None):
+        lines = []
+        for histogram in (self.request_duration, self.db_duration, self.db_queries):
+            lines.extend(histogram.render())
+
+        lines += ['# HELP petshop_db_repeated_statement_requests_total '
+                  'Request dengan statement yang sama berulang (indikasi N+1)',
+                  '# TYPE petshop_db_repeated_statement_requests_total counter']
+        with self._lock:
+            for (endpoint, fp), count in sorted(self.n_plus_one.items()):
+                lines.append('petshop_db_repeated_statement_requests_total'
+                             f'{_labels(("endpoint", "fingerprint"), (endpoint, fp))} {count}')
+
+        # Kondisi pool koneksi (lihat database.pool_status)
+        for key in ('checked_out', 'overflow', 'timeouts', 'wait_max_ms'):
+            rows = [(engine, info[key]) for engine, info in (pool or {}).items() if key in info]
+            if rows:
+                lines.append(f'# TYPE petshop_db_pool_{key} gauge')
+                lines += [f'petshop_db_pool_{key}{_labels(("engine",), (engine,))} {value}'
+                          for engine, value in rows]
+        return '\n'.join(lines) + '\n'
+
+
+request_metrics = RequestMetrics()
+
+
+def init_metrics(app):
+    """
+    Profil SQL per request + metrik HTTP.
+
+    - Setiap statement SQL dicatat jumlah & waktunya, dikelompokkan per fingerprint
+    - Response diberi header Server-Timing (db, app, total) -> terlihat di DevTools
+    - Ringkasan SQL disimpan di g.sql_summary dan ikut dicatat logger request
+      (request lambat & pola N+1 selalu dicatat, lengkap dengan fingerprint)
+    - GET /metrics: histogram format Prometheus
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    install_sql_hooks()
+
+    server_timing = app.config.get('SERVER_TIMING_HEADER', True)
+    threshold = app.config.get('SQL_N_PLUS_ONE_THRESHOLD', 10)
+    top_n = app.config.get('SQL_PROFILE_TOP_STATEMENTS', 3)
+    slow_ms = app.config.get('LOG_SLOW_MS', 500)
+
+    @app.before_request
+    def _start_sql_profile():
+        g.metrics_started = time.perf_counter()
+        g.sql_profile = SqlProfile()
+        g.sql_profile_token = _current_profile.set(g.sql_profile)
+
+    @app.after_request
+    def _finish_sql_profile(response):
+        profile = g.pop('sql_profile', None)
+        if profile is None:
+            return response
+        _current_profile.reset(g.pop('sql_profile_token'))
+        seconds = time.perf_counter() - g.pop('metrics_started')
+
+        repeated = profile.repeated(threshold)
+        if request.endpoint != 'metrics':
+            request_metrics.observe(request.blueprint or '-', request.endpoint or '-', request.method,
+                                    response.status_code, seconds, profile, repeated)
+
+        # Dibaca request_logging (after_request-nya jalan setelah yang ini)
+        summary = {'queries': profile.count, 'db_ms': round(profile.seconds * 1000, 2)}
+        if repeated:
+            summary['n_plus_one'] = repeated
+        if repeated or seconds * 1000 >= slow_ms:
+            summary['slowest'] = profile.slowest(top_n)
+        g.sql_summary = summary
+
+        if server_timing:
+            db_ms = profile.seconds * 1000
+            total_ms = seconds * 1000
+            response.headers.add('Server-Timing', f'db;dur={db_ms:.2f};desc="{profile.count} queries"')
+            response.headers.add('Server-Timing', f'app;dur={max(0.0, total_ms - db_ms):.2f}')
+            response.headers.add('Server-Timing', f'total;dur={total_ms:.2f}')
+        return response
+
+    @app.teardown_request
+    def _drop_sql_profile(exc):
+        # Request gagal sebelum after_request: jangan biarkan profil menempel di thread
+        token = g.pop('sql_profile_token', None)
+        if token is not None:
+            _current_profile.reset(token)
+
+    @app.route('/metrics', methods=['GET'], endpoint='metrics')
+    def metrics():
+        from app import db
+        from app.database import pool_status
+        body = request_metrics.render(pool_status(db))
+        return current_app.response_class(body, mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,125 @@
+# File: app/migrate.py
+
+import importlib.util
+import os
+from datetime import datetime
+
+import click
+import sqlalchemy as sa
+from flask.cli import with_appcontext
+
+from app import db
+
+# Folder berisi file migrasi: migrations/0001_xxx.py, migrations/0002_xxx.py, ...
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+# Tabel pencatat migrasi yang sudah dijalankan
+_meta = sa.MetaData()
+schema_migrations = sa.Table(
+    'schema_migrations', _meta,
+    sa.Column('version', sa.String(50), primary_key=True),
+    sa.Column('applied_at', sa.DateTime, nullable=False),
+)
+
+
+def load_migrations():
+    """Baca semua file migrasi, urut berdasarkan nomor versi di nama file."""
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        if not filename.endswith('.py') or filename.startswith('_'):
+            continue
+        version = filename[:-3]
+        spec = importlib.util.spec_from_file_location(f'migrations.{version}', os.path.join(MIGRATIONS_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        migrations.append((version, module))
+    return migrations
+
+
+def applied_versions(conn):
+    schema_migrations.create(conn, checkfirst=True)
+    return {row.version for row in conn.execute(sa.select(schema_migrations.c.version))}
+
+
+def upgrade(engine):
+    """Jalankan semua migrasi yang belum pernah dijalankan. Mengembalikan daftar versi baru."""
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+
+    applied = []
+    for version, module in load_migrations():
+        if version in done:
+            continue
+        # 1 migrasi = 1 transaksi
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(version=version, applied_at=datetime.utcnow()))
+        applied.append(version)
+    return applied
+
+
+def status(engine):
+    """[(versi, waktu diterapkan atau None kalau belum)] untuk semua file migrasi."""
+    with engine.begin() as conn:
+        schema_migrations.create(conn, checkfirst=True)
+        applied = dict(conn.execute(sa.select(schema_migrations.c.version, schema_migrations.c.applied_at)).all())
+    return [(version, applied.get(version)) for version, _ in load_migrations()]
+
+
+_TEMPLATE = '''"""{message}"""
+
+import sqlalchemy as sa
+
+
+def upgrade(conn):
+    # Jalan dalam 1 transaksi; buat idempotent (checkfirst / cek inspector)
+    # supaya aman untuk database yang dibuat dari petshop_db.sql maupun create_all()
+    pass
+'''
+
+
+def new_revision(name, message=None):
+    """Buat file migrasi kosong dengan nomor versi berikutnya. Mengembalikan path-nya."""
+    numbers = [int(version.split('_', 1)[0]) for version, _ in load_migrations()]
+    slug = '_'.join(name.lower().split())
+    path = os.path.join(MIGRATIONS_DIR, f'{max(numbers, default=0) + 1:04d}_{slug}.py')
+    with open(path, 'x') as f:
+        f.write(_TEMPLATE.format(message=message or name))
+    return path
+
+
+@click.command('db-upgrade')
+@with_appcontext
+def db_upgrade_command():
+    """Jalankan migrasi database yang belum diterapkan."""
+    applied = upgrade(db.engine)
+    if applied:
+        for version in applied:
+            click.echo(f'✅ Migrasi diterapkan: {version}')
+    else:
+        click.echo('Database sudah versi terbaru.')
+
+
+@click.command('db-status')
+@click.option('--check', is_flag=True, help='exit 1 kalau masih ada migrasi yang belum diterapkan')
+@with_appcontext
+def db_status_command(check):
+    """Tampilkan migrasi yang sudah & belum diterapkan."""
+    pending = 0
+    for version, applied_at in status(db.engine):
+        if applied_at:
+            click.echo(f'  ✅ {version}  ({applied_at:%Y-%m-%d %H:%M})')
+        else:
+            pending += 1
+            click.echo(f'  ⏳ {version}  (belum)')
+    click.echo(f'{pending} migrasi belum diterapkan.' if pending else 'Database sudah versi terbaru.')
+    if check and pending:
+        raise SystemExit(1)
+
+
+@click.command('db-revision')
+@click.argument('name')
+@click.option('-m', '--message', help='deskripsi singkat (docstring file migrasi)')
+def db_revision_command(name, message):
+    """Buat file migrasi baru: flask db-revision tambah_kolom_x -m "..." """
+    click.echo(f'✅ File migrasi dibuat: {new_revision(name, message)}')
@@ -10,7 +10,7 @@ class User(db.Model):
     nama_lengkap = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False)
     password = db.Column(db.String(200), nullable=False)
-    role = db.Column(db.String(20), default='client') # client/admin
+    role = db.Column(db.String(20), default='client', index=True) # client/admin
     no_hp = db.Column(db.String(20), nullable=True)
     alamat = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -28,13 +28,15 @@ class User(db.Model):
 class Pet(db.Model):
     __tablename__ = 'pets'
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     
     nama_hewan = db.Column(db.String(100), nullable=False) 
     jenis = db.Column(db.String(50), nullable=False) # Kucing/Anjing
     warna = db.Column(db.String(50), default='-')
     usia = db.Column(db.String(50), default='-')
     foto_url = db.Column(db.String(255), nullable=True)
+    # Foto hasil upload (lihat app/images.py); kosong = foto_url (avatar asset) yang dipakai
+    foto_key = db.Column(db.String(40), nullable=True)
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -45,13 +47,23 @@ class Pet(db.Model):
 class Item(db.Model):
     __tablename__ = 'items'
     id = db.Column(db.Integer, primary_key=True)
-    nama = db.Column(db.String(100), nullable=False)
+    nama = db.Column(db.String(100), nullable=False, index=True)
     tipe = db.Column(db.String(20), nullable=False) # 'makanan', 'aksesoris', 'layanan'
     harga = db.Column(db.Integer, nullable=False)
     stok = db.Column(db.Integer, default=0)
     deskripsi = db.Column(db.Text, nullable=True)
     gambar_url = db.Column(db.String(255), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Gambar hasil upload (lihat app/images.py); kosong = gambar_url (asset) yang dipakai
+    gambar_key = db.Column(db.String(40), nullable=True)
+    # Khusus layanan: maksimal booking per jam/slot. Kosong = BOOKING_SLOT_CAPACITY
+    kapasitas_slot = db.Column(db.Integer, nullable=True)
+    # Katalog diurutkan created_at DESC
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        # Cache layanan (app/service_cache.py): WHERE tipe = 'layanan' ORDER BY id DESC
+        db.Index('ix_items_tipe_id', 'tipe', 'id'),
+    )
 
 
 # -------------------------------------------------------------------
@@ -67,6 +79,11 @@ class Cart(db.Model):
     
     item = db.relationship('Item') 
 
+    # 1 user hanya punya 1 baris per item (jumlahnya yang berubah)
+    __table_args__ = (
+        db.Index('uq_carts_user_item', 'user_id', 'item_id', unique=True),
+    )
+
 
 # -------------------------------------------------------------------
 # 5. CLASS ORDER & ORDER DETAIL (YANG DIREVISI)
@@ -86,18 +103,40 @@ class Order(db.Model):
     payment_method = db.Column(db.String(50), default='transfer') 
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Ringkasan yang ditulis saat checkout (lihat app/order_summary.py), supaya
+    # daftar order cukup membaca tabel ini. NULL = order lama belum di-backfill.
+    line_count = db.Column(db.Integer, nullable=True)
+    items_summary = db.Column(db.String(500), nullable=True)
+    first_image_url = db.Column(db.String(255), nullable=True)
+    first_image_key = db.Column(db.String(40), nullable=True)
+
+    __table_args__ = (
+        # Sweeper order kadaluarsa: WHERE status = ... AND created_at < ...
+        db.Index('ix_orders_status_created_at', 'status', 'created_at'),
+        # Riwayat order user: WHERE user_id = ... ORDER BY created_at DESC
+        db.Index('ix_orders_user_id_created_at', 'user_id', 'created_at'),
+        # Daftar order admin (keyset): ORDER BY created_at DESC, id DESC
+        db.Index('ix_orders_created_at_id', 'created_at', 'id'),
+    )
     
-    details = db.relationship('OrderDetail', backref='order', lazy=True)
+    # lazy='selectin': semua detail dari banyak order diambil dalam 1 query (IN),
+    # bukan 1 query per order (N+1)
+    details = db.relationship('OrderDetail', backref='order', lazy='selectin')
 
 class OrderDetail(db.Model):
     __tablename__ = 'order_details'
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
     item_id = db.Column(db.Integer, db.ForeignKey('items.id'), nullable=False)
     jumlah = db.Column(db.Integer, nullable=False)
     subtotal = db.Column(db.Integer, nullable=False)
+    # Nama & harga satuan saat dibeli: riwayat tidak ikut berubah kalau item diganti nama/harga
+    nama_barang = db.Column(db.String(100), nullable=True)
+    harga = db.Column(db.Integer, nullable=True)
     
-    item = db.relationship('Item')
+    # lazy='joined': data item ikut di-JOIN saat detail dimuat
+    item = db.relationship('Item', lazy='joined')
 
 
 # -------------------------------------------------------------------
@@ -123,6 +162,18 @@ class Booking(db.Model):
     va_number = db.Column(db.String(50))      
     total_harga = db.Column(db.Integer, default=0)
     cancel_reason = db.Column(db.String(255))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Cari booking per layanan + tanggal + jam (hitung ulang isi slot)
+        db.Index('ix_bookings_service_date_time', 'service_name', 'booking_date', 'booking_time'),
+        # Sweeper booking kadaluarsa
+        db.Index('ix_bookings_status_created_at', 'status', 'created_at'),
+        # Riwayat booking user: WHERE user_id = ... ORDER BY id DESC
+        db.Index('ix_bookings_user_id_id', 'user_id', 'id'),
+        # Daftar booking admin (keyset): ORDER BY booking_date DESC, id DESC
+        db.Index('ix_bookings_booking_date_id', 'booking_date', 'id'),
+    )
 
     def to_dict(self):
         return {
@@ -133,4 +184,146 @@ class Booking(db.Model):
             'booking_time': self.booking_time,
             'status': self.status,
             'total_harga': self.total_harga
-        }
\ No newline at end of file
+        }
+
+# -------------------------------------------------------------------
+# 7. CLASS DAILY STAT (Ringkasan Dashboard Admin)
+# -------------------------------------------------------------------
+# 1 baris = jumlah & total harga untuk (jenis data, tanggal, status).
+# Diupdate setiap ada order/booking baru atau status berubah, jadi
+# dashboard tidak perlu menghitung ulang tabel orders/bookings.
+class DailyStat(db.Model):
+    __tablename__ = 'daily_stats'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False) # 'order', 'booking', 'user'
+    day = db.Column(db.Date, nullable=False)
+    status = db.Column(db.String(50), nullable=False)
+    jumlah = db.Column(db.Integer, nullable=False, default=0)
+    total_harga = db.Column(db.BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('kind', 'day', 'status', name='uq_daily_stats_kind_day_status'),
+    )
+
+
+# -------------------------------------------------------------------
+# 8. CLASS BOOKING SLOT (Kapasitas Layanan per Jam)
+# -------------------------------------------------------------------
+# 1 baris = berapa booking aktif (bukan 'batal') di 1 slot layanan.
+# Diisi/dikurangi dengan UPDATE bersyarat saat booking dibuat/dibatalkan,
+# jadi cek ketersediaan cukup membaca tabel kecil ini.
+class BookingSlot(db.Model):
+    __tablename__ = 'booking_slots'
+    id = db.Column(db.Integer, primary_key=True)
+    service_name = db.Column(db.String(100), nullable=False)
+    booking_date = db.Column(db.Date, nullable=False)
+    slot_time = db.Column(db.String(5), nullable=False) # 'HH:MM' jam mulai slot
+    terisi = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('service_name', 'booking_date', 'slot_time', name='uq_booking_slots_service_date_time'),
+    )
+
+
+# -------------------------------------------------------------------
+# 9. CLASS IDEMPOTENCY KEY (Anti Request Dobel)
+# -------------------------------------------------------------------
+# 1 baris = 1 header Idempotency-Key untuk 1 endpoint. status_code kosong
+# berarti request pertama masih diproses; setelah selesai response-nya
+# disimpan dan request ulang dengan key yang sama dibalas dari sini.
+class IdempotencyKey(db.Model):
+    __tablename__ = 'idempotency_keys'
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(200), nullable=False) # 'POST /api/orders'
+    key = db.Column(db.String(100), nullable=False)
+    fingerprint = db.Column(db.String(64), nullable=False) # sha256 body request
+    status_code = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.Text, nullable=True)
+    mimetype = db.Column(db.String(100), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    # Lease klaim: request ulang boleh mengambil alih klaim yang belum selesai dan
+    # sudah lewat IDEMPOTENCY_LEASE_SECONDS, kecuali data handler sudah ter-commit
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    committed_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.UniqueConstraint('scope', 'key', name='uq_idempotency_keys_scope_key'),
+    )
+
+
+# -------------------------------------------------------------------
+# 10. ARSIP ORDER & BOOKING (DATA DINGIN)
+# -------------------------------------------------------------------
+# Salinan baris orders/order_details/bookings yang sudah 'selesai'/'batal'
+# dan lebih tua dari ARCHIVE_AFTER_DAYS, dipindah oleh app/archive.py.
+# ID tetap sama. Hanya dibaca (riwayat & detail), jadi tanpa foreign key
+# supaya pemindahan per batch murah; relasi ditulis dengan foreign() manual.
+class OrderArchive(db.Model):
+    __tablename__ = 'orders_archive'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    total_harga = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(50))
+    cancel_reason = db.Column(db.Text, nullable=True)
+    bank_name = db.Column(db.String(50), nullable=True)
+    va_number = db.Column(db.String(50), nullable=True)
+    payment_method = db.Column(db.String(50))
+    created_at = db.Column(db.DateTime)
+    line_count = db.Column(db.Integer, nullable=True)
+    items_summary = db.Column(db.String(500), nullable=True)
+    first_image_url = db.Column(db.String(255), nullable=True)
+    first_image_key = db.Column(db.String(40), nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_orders_archive_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_orders_archive_created_at_id', 'created_at', 'id'),
+    )
+
+    user = db.relationship('User', primaryjoin='foreign(OrderArchive.user_id) == User.id', viewonly=True)
+    details = db.relationship('OrderDetailArchive', lazy='selectin', viewonly=True,
+                              primaryjoin='foreign(OrderDetailArchive.order_id) == OrderArchive.id')
+
+
+class OrderDetailArchive(db.Model):
+    __tablename__ = 'order_details_archive'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    order_id = db.Column(db.Integer, nullable=False, index=True)
+    item_id = db.Column(db.Integer, nullable=False)
+    jumlah = db.Column(db.Integer, nullable=False)
+    subtotal = db.Column(db.Integer, nullable=False)
+    nama_barang = db.Column(db.String(100), nullable=True)
+    harga = db.Column(db.Integer, nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+    item = db.relationship('Item', lazy='joined', viewonly=True,
+                           primaryjoin='foreign(OrderDetailArchive.item_id) == Item.id')
+
+
+class BookingArchive(db.Model):
+    __tablename__ = 'bookings_archive'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    service_name = db.Column(db.String(100), nullable=False)
+    booking_date = db.Column(db.Date, nullable=False)
+    booking_time = db.Column(db.String(10), nullable=False)
+    keluhan = db.Column(db.String(255))
+    status = db.Column(db.String(50))
+    pet_name = db.Column(db.String(100))
+    pet_type = db.Column(db.String(50))
+    pet_color = db.Column(db.String(50))
+    payment_method = db.Column(db.String(50))
+    bank_name = db.Column(db.String(20))
+    va_number = db.Column(db.String(50))
+    total_harga = db.Column(db.Integer, default=0)
+    cancel_reason = db.Column(db.String(255))
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_bookings_archive_user_id_id', 'user_id', 'id'),
+        db.Index('ix_bookings_archive_booking_date_id', 'booking_date', 'id'),
+    )
+
+    user = db.relationship('User', primaryjoin='foreign(BookingArchive.user_id) == User.id', viewonly=True)
@@ -0,0 +1,117 @@
+# File: app/order_summary.py
+
+import time
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import bindparam
+
+from app import db
+from app.images import image_url
+from app.models import Order, OrderDetail, Item
+
+# Panjang maksimal orders.items_summary (kolom String(500))
+SUMMARY_MAX_CHARS = 500
+
+
+def summarize(lines):
+    """
+    Ringkasan order dari baris checkout [(nama, jumlah, gambar_url, gambar_key)],
+    disimpan di kolom orders supaya daftar order tidak perlu membaca detail/item:
+    line_count, items_summary ('Whiskas (2x), Kalung (1x)'), gambar item pertama.
+    """
+    text = ', '.join(f'{nama} ({jumlah}x)' for nama, jumlah, _, _ in lines)
+    if len(text) > SUMMARY_MAX_CHARS:
+        text = text[:SUMMARY_MAX_CHARS - 3] + '...'
+    # Sama seperti dulu: gambar dari item pertama yang punya gambar
+    first_url, first_key = next(((url, key) for _, _, url, key in lines if url or key), (None, None))
+    return {'line_count': len(lines), 'items_summary': text,
+            'first_image_url': first_url, 'first_image_key': first_key}
+
+
+def list_fields(order):
+    """
+    (items_summary, URL thumbnail) untuk daftar order. Order lama yang belum
+    di-backfill dihitung dari detail + item seperti sebelumnya (lebih lambat).
+    """
+    if order.line_count is None:
+        summary = summarize([(d.nama_barang or d.item.nama, d.jumlah, d.item.gambar_url, d.item.gambar_key)
+                             for d in order.details if d.item])
+    else:
+        summary = {'items_summary': order.items_summary, 'first_image_url': order.first_image_url,
+                   'first_image_key': order.first_image_key}
+    return (summary['items_summary'],
+            image_url(summary['first_image_key'], 'thumb', summary['first_image_url']))
+
+
+def fill(ids):
+    """
+    Isi ringkasan order `ids` dan snapshot nama/harga detailnya (tanpa commit).
+    Nama barang diambil dari item saat ini (nama saat beli tidak tercatat),
+    harga satuan dari subtotal / jumlah (harga saat beli yang sebenarnya).
+    """
+    if not ids:
+        return
+    orders_table = Order.__table__
+    details_table = OrderDetail.__table__
+    rows = (db.session.query(OrderDetail.id, OrderDetail.order_id, OrderDetail.jumlah, OrderDetail.subtotal,
+                             OrderDetail.nama_barang, OrderDetail.harga,
+                             Item.nama, Item.gambar_url, Item.gambar_key)
+            .outerjoin(Item, Item.id == OrderDetail.item_id)
+            .filter(OrderDetail.order_id.in_(ids))
+            .order_by(OrderDetail.order_id, OrderDetail.id)
+            .all())
+
+    lines = {order_id: [] for order_id in ids}
+    detail_params = []
+    for row in rows:
+        nama = row.nama_barang or row.nama or '-'
+        lines[row.order_id].append((nama, row.jumlah, row.gambar_url, row.gambar_key))
+        if row.nama_barang is None or row.harga is None:
+            harga = row.harga if row.harga is not None else row.subtotal // max(row.jumlah, 1)
+            detail_params.append({'b_id': row.id, 'b_nama': nama, 'b_harga': harga})
+
+    db.session.execute(orders_table.update().where(orders_table.c.id == bindparam('b_id')),
+                       [{'b_id': order_id, **summarize(lines[order_id])} for order_id in ids])
+    if detail_params:
+        db.session.execute(details_table.update()
+                           .where(details_table.c.id == bindparam('b_id'))
+                           .values(nama_barang=bindparam('b_nama'), harga=bindparam('b_harga')),
+                           detail_params)
+
+
+def backfill(batch_size=1000, progress=None):
+    """
+    Isi ringkasan order lama (orders.line_count masih NULL), per batch urut ID.
+    1 batch = 1 transaksi: kalau berhenti di tengah jalan, jalankan lagi dan
+    lanjut dari yang belum terisi.
+    """
+    done = 0
+    last_id = 0
+    while True:
+        ids = [order_id for (order_id,) in
+               db.session.query(Order.id)
+               .filter(Order.line_count.is_(None), Order.id > last_id)
+               .order_by(Order.id)
+               .limit(batch_size)]
+        if not ids:
+            break
+        fill(ids)
+        db.session.commit()
+
+        done += len(ids)
+        last_id = ids[-1]
+        if progress:
+            progress(done, last_id)
+    return done
+
+
+@click.command('orders-backfill-summary')
+@click.option('--batch-size', default=1000, show_default=True, help='Order per transaksi')
+@with_appcontext
+def orders_backfill_summary_command(batch_size):
+    """Isi kolom ringkasan order lama (setelah migrasi 0009). Aman dijalankan ulang."""
+    started = time.perf_counter()
+    count = backfill(batch_size, progress=lambda done, last_id: click.echo(f'   {done} order (sampai ID {last_id})'))
+    elapsed = time.perf_counter() - started
+    click.echo(f'✅ Ringkasan {count} order terisi dalam {elapsed:.1f} detik')
@@ -0,0 +1,96 @@
+# File: app/pagination.py
+
+import base64
+import json
+from datetime import datetime, date, timedelta
+from sqlalchemy import or_, and_, DateTime
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class PaginationError(ValueError):
+    """Dilempar kalau parameter paging/filter dari client tidak valid."""
+
+
+def parse_limit(args):
+    try:
+        limit = int(args.get('limit', DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        raise PaginationError('Parameter limit harus angka')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def parse_date(value, name):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise PaginationError(f'Format {name} harus YYYY-MM-DD')
+
+
+def parse_statuses(args):
+    # ?status=pending,menunggu_pembayaran -> ['pending', 'menunggu_pembayaran']
+    raw = args.get('status')
+    if not raw:
+        return []
+    return [s.strip() for s in raw.split(',') if s.strip()]
+
+
+def encode_cursor(sort_value, row_id):
+    if isinstance(sort_value, (datetime, date)):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, value_type=datetime):
+    """Kebalikan dari encode_cursor. Mengembalikan (sort_value, id)."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if value_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif value_type is date:
+            sort_value = date.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise PaginationError('Cursor tidak valid')
+
+
+def keyset_filter(sort_col, id_col, cursor_value, cursor_id):
+    # Urutan DESC: ambil baris yang posisinya setelah (cursor_value, cursor_id)
+    return or_(sort_col < cursor_value,
+               and_(sort_col == cursor_value, id_col < cursor_id))
+
+
+def date_range_filter(col, date_from, date_to):
+    """Filter rentang tanggal inklusif untuk kolom DateTime/Date."""
+    if isinstance(col.type, DateTime):
+        date_from = date_from and datetime.combine(date_from, datetime.min.time())
+        date_to = date_to and datetime.combine(date_to, datetime.min.time())
+    clauses = []
+    if date_from:
+        clauses.append(col >= date_from)
+    if date_to:
+        clauses.append(col < date_to + timedelta(days=1))
+    return clauses
+
+
+def paginate(query, limit, sort_attr):
+    """
+    Ambil limit+1 baris untuk tahu apakah masih ada halaman berikutnya.
+    Mengembalikan (rows, next_cursor).
+    """
+    return page_result(query.limit(limit + 1).all(), limit, sort_attr)
+
+
+def page_result(rows, limit, sort_attr):
+    """Potong limit+1 baris (sudah urut) jadi (rows, next_cursor)."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_attr), last.id)
+    return rows, next_cursor
@@ -0,0 +1,82 @@
+# File: app/passwords.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingBusy(Exception):
+    """Antrian hashing penuh; request sebaiknya dibalas 503 dan dicoba lagi."""
+
+
+class PasswordHasher:
+    """
+    Hash & cek password di pool worker terpisah (thread atau proses).
+
+    Jumlah hashing yang berjalan/antri dibatasi, jadi badai login tidak
+    bisa menghabiskan semua CPU/thread worker untuk blueprint lain.
+    Parameter hash (PASSWORD_HASH_METHOD) bisa dinaikkan kapan saja:
+    hash lama otomatis diganti saat user berhasil login (rehash-on-login).
+    """
+
+    def __init__(self, method, workers, max_pending, wait_timeout, use_processes=False):
+        self.method = method
+        self.workers = workers
+        self.wait_timeout = wait_timeout
+        self.use_processes = use_processes
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        # Awalan hash untuk parameter saat ini, mis. 'pbkdf2:sha256:600000'
+        self.prefix = generate_password_hash('-', method=method).split('$', 1)[0]
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(method=config.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256'),
+                   workers=config.get('PASSWORD_HASH_WORKERS', 2),
+                   max_pending=config.get('PASSWORD_HASH_MAX_PENDING', 32),
+                   wait_timeout=config.get('PASSWORD_HASH_WAIT_TIMEOUT', 5),
+                   use_processes=config.get('PASSWORD_HASH_USE_PROCESSES', False))
+
+    def _pool(self):
+        # Dibuat saat pertama dipakai (aman untuk worker gunicorn hasil fork)
+        with self._lock:
+            if self._executor is None:
+                executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+                self._executor = executor_class(max_workers=self.workers)
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.wait_timeout):
+            raise HashingBusy()
+        try:
+            return self._pool().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def needs_rehash(self, stored_hash):
+        return stored_hash.split('$', 1)[0] != self.prefix
+
+    def verify(self, stored_hash, password):
+        """Kembalikan (cocok, perlu_rehash)."""
+        ok = self._run(check_password_hash, stored_hash, password)
+        return ok, ok and self.needs_rehash(stored_hash)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+def init_password_hashing(app):
+    app.extensions['password_hasher'] = PasswordHasher.from_config(app.config)
+
+
+def get_hasher():
+    return current_app.extensions['password_hasher']
@@ -0,0 +1,36 @@
+# File: app/profiling.py
+
+from contextlib import contextmanager
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """
+    Penghitung statement SQL yang dikirim ke database.
+    Dipakai untuk memastikan endpoint tidak kena masalah N+1.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine):
+    """
+    Contoh pemakaian:
+
+        with count_queries(db.engine) as counter:
+            client.get('/api/orders/user/1')
+        print(counter.count)
+    """
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter._on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter._on_execute)
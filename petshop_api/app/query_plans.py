@@ -0,0 +1,144 @@
+# File: app/query_plans.py
+
+import re
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import event
+
+from app import db
+from app.models import Order, Item
+
+# Endpoint GET yang paling sering dipanggil. {user_id}/{order_id}/{service}
+# diisi dari data yang ada di database.
+HOT_ENDPOINTS = [
+    '/api/items',
+    '/api/items?q=kucing&limit=20',
+    '/api/users/{user_id}',
+    '/api/pets/user/{user_id}',
+    '/api/cart/user/{user_id}',
+    '/api/orders/user/{user_id}',
+    '/api/orders/{order_id}',
+    '/api/bookings/user/{user_id}',
+    '/api/bookings/availability?service_name={service}&days=7',
+    '/api/admin/stats',
+    '/api/admin/orders?limit=20',
+    '/api/admin/orders?limit=20&status=menunggu_konfirmasi',
+    '/api/admin/bookings?limit=20',
+]
+
+# Tabel yang boleh di-full scan walaupun query-nya pakai WHERE: {tabel: alasan}
+ALLOWED_FULL_SCANS = {}
+
+_SQLITE_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)(.*)$')
+
+
+def capture_selects(client, paths):
+    """Jalankan endpoint lewat test client, kumpulkan SELECT unik + parameternya."""
+    captured = {}
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and statement not in captured:
+            captured[statement] = (parameters, current_path[0])
+
+    current_path = [None]
+    event.listen(db.engine, 'before_cursor_execute', on_execute)
+    try:
+        for path in paths:
+            current_path[0] = path
+            resp = client.get(path)
+            if resp.status_code >= 500:
+                raise click.ClickException(f'{path} -> HTTP {resp.status_code}')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', on_execute)
+    return captured
+
+
+def _has_clause(statement, keyword):
+    return re.search(rf'\b{keyword}\b', statement, re.IGNORECASE) is not None
+
+
+def plan_problems(conn, statement, parameters):
+    """
+    Masalah rencana query menurut EXPLAIN: [(jenis, tabel)].
+
+    - 'full scan': query ber-WHERE tapi tabelnya dibaca utuh. SELECT tanpa
+      WHERE (mis. katalog dimuat ke cache, ringkasan daily_stats) memang
+      membaca semua baris, jadi tidak dihitung.
+    - 'sort': query ber-LIMIT (paging) yang harus mengurutkan semua hasil
+      dulu karena tidak ada index yang cocok dengan ORDER BY.
+    """
+    filtered = _has_clause(statement, 'WHERE')
+    paged = _has_clause(statement, 'LIMIT')
+    problems = []
+    dialect = conn.dialect.name
+    if dialect == 'sqlite':
+        for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all():
+            detail = row[-1]
+            match = _SQLITE_SCAN_RE.match(detail)
+            # 'SCAN t USING INDEX ix' = jalan di index (boleh); 'SCAN t' = full scan
+            if filtered and match and 'USING' not in match.group(2) and match.group(1) != 'CONSTANT':
+                problems.append(('full scan', match.group(1)))
+            if paged and detail.startswith('USE TEMP B-TREE FOR ORDER BY'):
+                problems.append(('sort', '-'))
+    elif dialect == 'mysql':
+        result = conn.exec_driver_sql(f'EXPLAIN {statement}', parameters)
+        for row in result.mappings().all():
+            if filtered and row['type'] == 'ALL':
+                problems.append(('full scan', row['table']))
+            if paged and 'filesort' in (row['Extra'] or ''):
+                problems.append(('sort', row['table']))
+    elif dialect == 'postgresql':
+        for (line,) in conn.exec_driver_sql(f'EXPLAIN {statement}', parameters).all():
+            match = re.search(r'Seq Scan on (\w+)', line)
+            if filtered and match:
+                problems.append(('full scan', match.group(1)))
+            if paged and re.search(r'\bSort\b', line):
+                problems.append(('sort', '-'))
+    else:
+        raise click.ClickException(f'EXPLAIN untuk dialect {dialect} belum didukung')
+    return problems
+
+
+def check_query_plans(app, paths=None):
+    """
+    Jalankan endpoint hot, EXPLAIN setiap SELECT yang dikirim, dan kembalikan
+    daftar masalah (lihat plan_problems): [(path, jenis, tabel, sql)].
+    """
+    with app.app_context():
+        user_id = db.session.query(Order.user_id).order_by(Order.id).limit(1).scalar() or 1
+        order_id = db.session.query(Order.id).order_by(Order.id.desc()).limit(1).scalar() or 1
+        service = (db.session.query(Item.nama).filter(Item.tipe == 'layanan').limit(1).scalar()
+                   or 'Grooming')
+        db.session.remove()
+
+    values = {'user_id': user_id, 'order_id': order_id, 'service': service}
+    with app.app_context():
+        captured = capture_selects(app.test_client(),
+                                   [p.format(**values) for p in (paths or HOT_ENDPOINTS)])
+        problems = []
+        with db.engine.connect() as conn:
+            for statement, (parameters, path) in captured.items():
+                for kind, table in plan_problems(conn, statement, parameters):
+                    if kind == 'full scan' and table in ALLOWED_FULL_SCANS:
+                        continue
+                    problems.append((path, kind, table, statement))
+    return problems, len(captured)
+
+
+@click.command('db-explain-check')
+@with_appcontext
+def db_explain_check_command():
+    """
+    EXPLAIN semua query endpoint hot; exit 1 kalau ada full table scan
+    atau paging yang harus mengurutkan semua baris (index tidak cocok).
+    Jalankan di database yang sudah berisi data (mis. hasil benchmarks.datagen),
+    karena MySQL/PostgreSQL memilih full scan untuk tabel yang hampir kosong.
+    """
+    problems, checked = check_query_plans(current_app._get_current_object())
+    for path, kind, table, statement in problems:
+        click.echo(f'❌ {kind.upper()} {table} di {path}\n   {" ".join(statement.split())[:300]}')
+    if problems:
+        raise SystemExit(1)
+    click.echo(f'✅ {checked} query dari {len(HOT_ENDPOINTS)} endpoint tidak ada yang full scan / sort tanpa index')
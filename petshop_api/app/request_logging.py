@@ -0,0 +1,151 @@
+# File: app/request_logging.py
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, request
+
+# Field yang isinya tidak boleh masuk log
+_SENSITIVE_KEYS = ('password', 'token', 'secret')
+
+# Listener dibuat sekali per proses (create_app bisa dipanggil berkali-kali)
+_listener = None
+_queue_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu baris JSON per log. Field tambahan diambil dari record.fields."""
+
+    def format(self, record):
+        data = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            data.update(fields)
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Kirim log ke antrian; yang menulis ke stderr adalah thread QueueListener.
+    Kalau antrian penuh, log dibuang (request tidak ikut tertahan).
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def redact(value):
+    """Salin data JSON dengan field sensitif (password dsb) diganti '***'."""
+    if isinstance(value, dict):
+        return {k: '***' if any(s in str(k).lower() for s in _SENSITIVE_KEYS) else redact(v)
+                for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
+
+def _request_body(max_bytes):
+    if not request.is_json:
+        return None
+    size = request.content_length or 0
+    if size > max_bytes:
+        return {'_truncated': True, 'size': size}
+    # get_json() di-cache Flask, jadi body tidak di-parse dua kali
+    body = request.get_json(silent=True)
+    return redact(body) if body is not None else None
+
+
+def _start_listener(app):
+    global _listener, _queue_handler
+    if _listener is None:
+        log_queue = queue.Queue(maxsize=app.config.get('LOG_QUEUE_SIZE', 10000))
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(JsonFormatter())
+        _queue_handler = DroppingQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, stream, respect_handler_level=False)
+        _listener.start()
+        atexit.register(_listener.stop)
+    return _queue_handler
+
+
+def init_request_logging(app):
+    """Pasang logger JSON berbasis antrian + hook pencatat request ke app."""
+    handler = _start_listener(app)
+    level = app.config.get('LOG_LEVEL', 'INFO')
+
+    app.logger.handlers = [handler]
+    app.logger.setLevel(level)
+    app.logger.propagate = False
+
+    sample_rate = app.config.get('LOG_SAMPLE_RATE', 1.0)
+    slow_ms = app.config.get('LOG_SLOW_MS', 500)
+    body_max = app.config.get('LOG_BODY_MAX_BYTES', 2048)
+    log_body = app.config.get('LOG_REQUEST_BODY', True)
+
+    @app.before_request
+    def _log_request_start():
+        g.request_started = time.perf_counter()
+        g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex[:16]
+
+    @app.after_request
+    def _log_request_end(response):
+        # Jangan log request gambar (biar log gak penuh spam)
+        if request.path.startswith('/static'):
+            return response
+        response.headers['X-Request-ID'] = g.get('request_id', '')
+        duration_ms = (time.perf_counter() - g.get('request_started', time.perf_counter())) * 1000
+        status = response.status_code
+
+        # Ringkasan SQL dari app/metrics.py (kalau aktif)
+        sql_summary = g.get('sql_summary')
+        n_plus_one = bool(sql_summary and sql_summary.get('n_plus_one'))
+
+        # Error, request lambat & pola N+1 selalu dicatat, sisanya sesuai sample rate
+        if status < 400 and duration_ms < slow_ms and not n_plus_one and random.random() >= sample_rate:
+            return response
+
+        fields = {
+            'request_id': g.get('request_id'),
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': status,
+            'duration_ms': round(duration_ms, 2),
+            'remote_addr': request.remote_addr,
+        }
+        if log_body:
+            body = _request_body(body_max)
+            if body is not None:
+                fields['body'] = body
+        if request.query_string:
+            fields['query'] = request.query_string.decode('utf-8', 'replace')[:body_max]
+        if sql_summary:
+            fields['db'] = sql_summary
+
+        level = (logging.ERROR if status >= 500
+                 else logging.WARNING if status >= 400 or n_plus_one
+                 else logging.INFO)
+        app.logger.log(level, 'request', extra={'fields': fields})
+        return response
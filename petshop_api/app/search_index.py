@@ -0,0 +1,244 @@
+# File: app/search_index.py
+
+import bisect
+import re
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from flask import current_app
+from app import db
+from app.models import Item
+
+# Data item yang dibutuhkan untuk filter & urutan (isi lengkap tetap dari database)
+SearchDoc = namedtuple('SearchDoc', ['id', 'tipe', 'harga', 'created_at', 'tokens'])
+# Salinan kolom item yang dicatat selama rebuild (bukan objek ORM milik request lain)
+_ItemRow = namedtuple('_ItemRow', ['id', 'nama', 'tipe', 'harga', 'deskripsi', 'created_at'])
+
+SORTS = ('terbaru', 'harga_asc', 'harga_desc')
+
+# Kata minimal sepanjang ini baru dicari dengan toleransi salah ketik (1 huruf)
+MIN_FUZZY_LEN = 4
+
+_TOKEN_RE = re.compile(r'\w+')
+_EPOCH = datetime(1970, 1, 1)
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall((text or '').casefold())
+
+
+def _deletes(token):
+    """Semua variasi token dengan 1 huruf dihapus ('kucing' -> 'ucing', 'kcing', ...)."""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+class _IndexData:
+    """Isi 1 versi index. Dibangun penuh di luar lock, lalu ditukar sekaligus."""
+
+    def __init__(self):
+        self.docs = {}
+        self.postings = {}
+        self.vocab = []
+        self.fuzzy = {}
+        self.orders = {}  # cache urutan ID per sort, dibuang tiap ada perubahan
+
+    def add(self, row):
+        # tuple (bukan set) supaya hemat memori; hanya dipakai saat item dihapus
+        tokens = tuple(set(tokenize(row.nama) + tokenize(row.deskripsi) + tokenize(row.tipe)))
+        self.docs[row.id] = SearchDoc(row.id, row.tipe, row.harga or 0, row.created_at or _EPOCH, tokens)
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                bisect.insort(self.vocab, token)
+                if len(token) >= MIN_FUZZY_LEN:
+                    for variant in _deletes(token):
+                        self.fuzzy.setdefault(variant, set()).add(token)
+            ids.add(row.id)
+        self.orders = {}
+
+    def remove(self, item_id):
+        doc = self.docs.pop(item_id, None)
+        if doc is None:
+            return
+        for token in doc.tokens:
+            ids = self.postings[token]
+            ids.discard(item_id)
+            if ids:
+                continue
+            # Kata tidak dipakai item manapun lagi: buang dari semua struktur
+            del self.postings[token]
+            del self.vocab[bisect.bisect_left(self.vocab, token)]
+            if len(token) >= MIN_FUZZY_LEN:
+                for variant in _deletes(token):
+                    words = self.fuzzy.get(variant)
+                    if words is not None:
+                        words.discard(token)
+                        if not words:
+                            del self.fuzzy[variant]
+        self.orders = {}
+
+    def match_token(self, token):
+        """ID item untuk 1 kata: awalan kata dulu, kalau kosong coba salah ketik 1 huruf."""
+        ids = set()
+        i = bisect.bisect_left(self.vocab, token)
+        while i < len(self.vocab) and self.vocab[i].startswith(token):
+            ids |= self.postings[self.vocab[i]]
+            i += 1
+        if ids or len(token) < MIN_FUZZY_LEN:
+            return ids
+
+        # Kata di index yang jaraknya 1 huruf (hapus/tambah/ganti 1 huruf)
+        words = set(self.fuzzy.get(token, ()))
+        for variant in _deletes(token):
+            if variant in self.postings and len(variant) >= MIN_FUZZY_LEN:
+                words.add(variant)
+            words |= self.fuzzy.get(variant, set())
+        for word in words:
+            ids |= self.postings[word]
+        return ids
+
+    def order(self, sort):
+        order = self.orders.get(sort)
+        if order is None:
+            order = [d.id for d in _sorted(self.docs.values(), sort)]
+            self.orders[sort] = order
+        return order
+
+
+def _sorted(docs, sort):
+    if sort == 'harga_asc':
+        return sorted(docs, key=lambda d: (d.harga, d.id))
+    if sort == 'harga_desc':
+        return sorted(docs, key=lambda d: (-d.harga, -d.id))
+    return sorted(docs, key=lambda d: (d.created_at, d.id), reverse=True)
+
+
+class CatalogSearchIndex:
+    """
+    Index pencarian katalog di memori proses (nama, deskripsi, tipe).
+
+    - postings: kata -> set ID item (inverted index)
+    - vocab: daftar kata terurut, untuk cari awalan kata dengan bisect
+    - fuzzy: kata-dengan-1-huruf-dihapus -> kata asli (symmetric delete),
+      jadi kata yang salah ketik 1 huruf tetap ketemu tanpa scan semua kata
+
+    Dibangun penuh dengan 1 query saat pertama dipakai, lalu diperbarui per
+    item oleh endpoint tambah/edit/hapus di proses yang sama. SEARCH_INDEX_TTL
+    membatasi berapa lama worker lain bisa tertinggal (dibangun ulang penuh).
+    Perubahan per item selama rebuild dicatat lalu diulang ke versi baru
+    sebelum ditukar, supaya tidak hilang kalau query rebuild sudah lewat.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._data = None
+        self._loaded_at = 0.0
+        self._pending = None  # list perubahan selama rebuild berjalan, None kalau tidak
+
+    def _expired(self):
+        ttl = current_app.config.get('SEARCH_INDEX_TTL', 300)
+        return self._data is None or (time.monotonic() - self._loaded_at) > ttl
+
+    def _build(self):
+        data = _IndexData()
+        rows = db.session.query(Item.id, Item.nama, Item.tipe, Item.harga,
+                                Item.deskripsi, Item.created_at)
+        for row in rows:
+            data.add(row)
+        return data
+
+    def _current(self):
+        """
+        Index yang siap dipakai. Bangun ulang hanya oleh 1 thread; selama
+        itu request lain tetap memakai versi lama tanpa menunggu. Hanya saat
+        index belum ada sama sekali request lain menunggu build pertama.
+        """
+        if not self._expired():
+            return self._data
+        if not self._build_lock.acquire(blocking=self._data is None):
+            return self._data  # thread lain sedang membangun ulang
+        try:
+            if self._expired():
+                with self._lock:
+                    self._pending = []
+                data = self._build()
+                with self._lock:
+                    # Ulang perubahan yang terjadi selama query rebuild
+                    # (upsert/remove aman diulang walau sudah ikut terbaca)
+                    for item_id, row in self._pending:
+                        data.remove(item_id)
+                        if row is not None:
+                            data.add(row)
+                    self._data = data
+                    self._loaded_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending = None
+            self._build_lock.release()
+        return self._data
+
+    def _record(self, item_id, row):
+        # Dipanggil dengan self._lock dipegang; row None = item dihapus
+        if self._pending is not None:
+            self._pending.append((item_id, row))
+        if self._data is not None:
+            self._data.remove(item_id)
+            if row is not None:
+                self._data.add(row)
+
+    def upsert(self, item):
+        """Masukkan/perbarui 1 item (dipanggil setelah commit)."""
+        row = _ItemRow(item.id, item.nama, item.tipe, item.harga, item.deskripsi, item.created_at)
+        with self._lock:
+            self._record(item.id, row)
+
+    def remove(self, item_id):
+        with self._lock:
+            self._record(item_id, None)
+
+    def invalidate(self):
+        """Perubahan massal (mis. import): bangun ulang penuh saat dipakai lagi."""
+        with self._lock:
+            self._loaded_at = float('-inf')
+
+    def search(self, q=None, tipe=None, min_harga=None, max_harga=None,
+               sort='terbaru', offset=0, limit=20):
+        """
+        Kembalikan (daftar ID untuk halaman ini, total hasil).
+        Semua kata di q harus cocok (AND); tipe boleh lebih dari satu.
+        """
+        data = self._current()
+        with self._lock:
+            docs = data.docs
+
+            candidates = None
+            for token in tokenize(q):
+                ids = data.match_token(token)
+                candidates = ids if candidates is None else candidates & ids
+                if not candidates:
+                    return [], 0
+
+            def keep(doc):
+                return ((not tipe or doc.tipe in tipe)
+                        and (min_harga is None or doc.harga >= min_harga)
+                        and (max_harga is None or doc.harga <= max_harga))
+
+            if candidates is not None and len(candidates) * 8 < len(docs):
+                # Hasil sedikit: urutkan hasilnya saja
+                ids = [d.id for d in _sorted((docs[i] for i in candidates if keep(docs[i])), sort)]
+            else:
+                # Hasil banyak: jalan di urutan yang sudah jadi
+                order = data.order(sort)
+                if candidates is None and not tipe and min_harga is None and max_harga is None:
+                    return order[offset:offset + limit], len(order)
+                ids = [i for i in order
+                       if (candidates is None or i in candidates) and keep(docs[i])]
+
+            return ids[offset:offset + limit], len(ids)
+
+
+search_index = CatalogSearchIndex()
@@ -0,0 +1,80 @@
+# File: app/service_cache.py
+
+import threading
+import time
+from collections import namedtuple
+from flask import current_app
+from app import db
+from app.models import Item
+
+# Data layanan yang dibutuhkan endpoint booking
+ServiceInfo = namedtuple('ServiceInfo', ['id', 'harga', 'gambar_url', 'gambar_key', 'kapasitas_slot'])
+
+
+class ServiceCatalogCache:
+    """
+    Cache in-process: nama layanan -> ServiceInfo(id, harga, gambar_url, gambar_key, kapasitas_slot).
+
+    Semua item tipe 'layanan' dimuat dengan 1 query, lalu disimpan selama
+    SERVICE_CACHE_TTL detik. Endpoint tambah/edit/hapus item memanggil
+    invalidate() supaya perubahan langsung terlihat di proses yang sama.
+    Query dijalankan di luar lock: selama dimuat ulang oleh 1 thread,
+    request lain tetap memakai versi lama tanpa menunggu.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._data = None
+        self._loaded_at = 0.0
+        self._generation = 0  # naik tiap invalidate(); hasil load yang basi tidak dipasang
+
+    def _expired(self):
+        ttl = current_app.config.get('SERVICE_CACHE_TTL', 300)
+        return self._data is None or (time.monotonic() - self._loaded_at) > ttl
+
+    def _load(self):
+        rows = (db.session.query(Item.id, Item.nama, Item.harga, Item.gambar_url, Item.gambar_key,
+                                 Item.kapasitas_slot)
+                .filter(Item.tipe == 'layanan')
+                .order_by(Item.id.desc())
+                .all())
+        data = {}
+        # Kalau ada nama kembar, yang menang adalah ID terkecil
+        # (sama seperti filter_by(nama=...).first() sebelumnya)
+        for row in rows:
+            data[row.nama] = ServiceInfo(row.id, row.harga, row.gambar_url, row.gambar_key,
+                                         row.kapasitas_slot)
+        return data
+
+    def _snapshot(self):
+        data = self._data
+        if not self._expired():
+            return data
+        if not self._build_lock.acquire(blocking=data is None):
+            return data  # thread lain sedang memuat ulang
+        try:
+            with self._lock:
+                if not self._expired():
+                    return self._data
+                generation = self._generation
+            data = self._load()
+            with self._lock:
+                # invalidate() di tengah load: pakai hasilnya sekali ini saja
+                if generation == self._generation:
+                    self._data = data
+                    self._loaded_at = time.monotonic()
+            return data
+        finally:
+            self._build_lock.release()
+
+    def get(self, nama):
+        return self._snapshot().get(nama)
+
+    def invalidate(self):
+        with self._lock:
+            self._data = None
+            self._generation += 1
+
+
+service_catalog = ServiceCatalogCache()
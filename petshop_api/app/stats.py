@@ -0,0 +1,223 @@
+# File: app/stats.py
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import false, func, literal, select, text
+
+from app import db
+from app.database import upsert_stmt
+from app.models import DailyStat, Order, Booking, User, OrderArchive, BookingArchive
+
+stats_table = DailyStat.__table__
+
+# Status yang tidak dihitung sebagai pendapatan
+EXCLUDED_FROM_REVENUE = ('batal',)
+
+
+def _upsert(kind, day, status, jumlah, total_harga):
+    """Tambahkan jumlah & total_harga ke baris (kind, day, status), buat kalau belum ada."""
+    stmt = upsert_stmt(db.engine.dialect.name, stats_table, ['kind', 'day', 'status'],
+                       lambda new: {'jumlah': stats_table.c.jumlah + new.jumlah,
+                                    'total_harga': stats_table.c.total_harga + new.total_harga})
+    db.session.execute(stmt, {'kind': kind, 'day': day, 'status': status or '-',
+                              'jumlah': jumlah, 'total_harga': total_harga})
+
+
+def record_transition(kind, day, old_status, new_status, amount=0):
+    """
+    Catat perubahan 1 data ke ringkasan, di transaksi yang sama dengan
+    perubahan aslinya (ikut commit/rollback bersama).
+
+    old_status=None berarti data baru dibuat.
+    """
+    if old_status == new_status:
+        return
+    if isinstance(day, datetime):
+        day = day.date()
+    day = day or datetime.utcnow().date()
+    if old_status is not None:
+        _upsert(kind, day, old_status, -1, -(amount or 0))
+    if new_status is not None:
+        _upsert(kind, day, new_status, 1, amount or 0)
+
+
+def record_transitions(kind, rows, new_status):
+    """
+    Versi massal record_transition: rows = [(day, old_status, amount), ...]
+    yang semuanya pindah ke new_status. Perubahan digabung per (tanggal,
+    status) lalu ditulis dengan 1 executemany.
+    """
+    deltas = {}
+    for day, old_status, amount in rows:
+        if old_status == new_status:
+            continue
+        if isinstance(day, datetime):
+            day = day.date()
+        day = day or datetime.utcnow().date()
+        for status, sign in ((old_status, -1), (new_status, 1)):
+            if status is None:
+                continue
+            jumlah, total = deltas.get((day, status), (0, 0))
+            deltas[(day, status)] = (jumlah + sign, total + sign * (amount or 0))
+    if not deltas:
+        return
+
+    stmt = upsert_stmt(db.engine.dialect.name, stats_table, ['kind', 'day', 'status'],
+                       lambda new: {'jumlah': stats_table.c.jumlah + new.jumlah,
+                                    'total_harga': stats_table.c.total_harga + new.total_harga})
+    db.session.execute(stmt, [{'kind': kind, 'day': day, 'status': status or '-',
+                               'jumlah': jumlah, 'total_harga': total}
+                              for (day, status), (jumlah, total) in sorted(deltas.items())])
+
+
+def summary(days=7):
+    """Ringkasan dashboard, hanya membaca tabel daily_stats."""
+    rows = db.session.query(DailyStat.kind, DailyStat.day, DailyStat.status,
+                            DailyStat.jumlah, DailyStat.total_harga).all()
+
+    by_status = {'order': {}, 'booking': {}}
+    totals = {'order': 0, 'booking': 0, 'user': 0}
+    revenue = {'order': 0, 'booking': 0}
+    start_day = datetime.utcnow().date() - timedelta(days=days - 1)
+    daily = {start_day + timedelta(days=i): {'orders': 0, 'order_revenue': 0, 'bookings': 0, 'booking_revenue': 0}
+             for i in range(days)}
+
+    for row in rows:
+        # Baris yang sudah kosong (semua datanya pindah status) dilewati
+        if not row.jumlah and not row.total_harga:
+            continue
+        totals[row.kind] = totals.get(row.kind, 0) + row.jumlah
+        if row.kind not in by_status:
+            continue
+        bucket = by_status[row.kind].setdefault(row.status, {'jumlah': 0, 'total_harga': 0})
+        bucket['jumlah'] += row.jumlah
+        bucket['total_harga'] += int(row.total_harga)
+
+        if row.status in EXCLUDED_FROM_REVENUE:
+            continue
+        revenue[row.kind] += int(row.total_harga)
+        if row.day in daily:
+            prefix = 'order' if row.kind == 'order' else 'booking'
+            daily[row.day][f'{prefix}s'] += row.jumlah
+            daily[row.day][f'{prefix}_revenue'] += int(row.total_harga)
+
+    return {
+        'revenue': revenue['order'] + revenue['booking'],
+        'order_revenue': revenue['order'],
+        'booking_revenue': revenue['booking'],
+        'total_orders': totals['order'],
+        'total_bookings': totals['booking'],
+        'total_users': totals['user'],
+        'orders_by_status': by_status['order'],
+        'bookings_by_status': by_status['booking'],
+        'daily': [{'date': str(day), **values} for day, values in sorted(daily.items())],
+    }
+
+
+def _lock_for_rebuild():
+    """
+    Kunci daily_stats sampai rebuild commit. record_transition dari request
+    lain menunggu, lalu menambahkan selisihnya di atas hasil rebuild; perubahan
+    yang sudah commit sebelumnya ikut terhitung. Tidak ada yang hilang di antara
+    hitung ulang dan tulis.
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        db.session.execute(text('LOCK TABLE daily_stats IN SHARE ROW EXCLUSIVE MODE'))
+    elif dialect == 'sqlite':
+        # Statement tulis pertama mengambil lock tulis database (writer lain menunggu)
+        db.session.execute(stats_table.update().where(false()).values(jumlah=stats_table.c.jumlah))
+    else:
+        # MySQL/InnoDB: FOR UPDATE di seluruh index juga mengunci celah (insert baris baru)
+        db.session.execute(select(stats_table.c.id).with_for_update()).all()
+
+
+def rebuild():
+    """
+    Rekonsiliasi: hitung ulang seluruh ringkasan dari tabel sumber.
+    Dipakai berkala untuk membetulkan selisih (mis. data diubah langsung di DB).
+    Order/booking yang sudah diarsipkan (app/archive.py) tetap dihitung.
+
+    Hanya baris yang selisih yang ditulis (upsert), baris yang tidak punya
+    data sumber lagi dihapus; semuanya dalam 1 transaksi yang mengunci
+    daily_stats. Mengembalikan jumlah baris ringkasan.
+    """
+    _lock_for_rebuild()
+    sources = []
+    for order_model in (Order, OrderArchive):
+        sources.append(
+            db.session.query(literal('order'), func.date(order_model.created_at), order_model.status,
+                             func.count(order_model.id), func.coalesce(func.sum(order_model.total_harga), 0))
+            .group_by(func.date(order_model.created_at), order_model.status))
+    for booking_model in (Booking, BookingArchive):
+        sources.append(
+            db.session.query(literal('booking'), booking_model.booking_date, booking_model.status,
+                             func.count(booking_model.id), func.coalesce(func.sum(booking_model.total_harga), 0))
+            .group_by(booking_model.booking_date, booking_model.status))
+    sources += [
+        db.session.query(literal('user'), func.date(User.created_at), User.role,
+                         func.count(User.id), literal(0))
+        .filter(User.role != 'admin')
+        .group_by(func.date(User.created_at), User.role),
+    ]
+    # Tabel hot & arsip bisa punya (tanggal, status) yang sama: dijumlahkan
+    totals = {}
+    for query in sources:
+        for kind, day, status, jumlah, total in query:
+            if isinstance(day, str):
+                day = date.fromisoformat(day)
+            key = (kind, day or date(1970, 1, 1), status or '-')
+            old_jumlah, old_total = totals.get(key, (0, 0))
+            totals[key] = (old_jumlah + jumlah, old_total + int(total))
+
+    current = {(row.kind, row.day, row.status): (row.id, row.jumlah, int(row.total_harga))
+               for row in db.session.execute(select(stats_table))}
+    changed = [{'kind': kind, 'day': day, 'status': status, 'jumlah': jumlah, 'total_harga': total}
+               for (kind, day, status), (jumlah, total) in totals.items()
+               if current.get((kind, day, status), (None,))[1:] != (jumlah, total)]
+    stale = [row_id for key, (row_id, _, _) in current.items() if key not in totals]
+
+    if changed:
+        stmt = upsert_stmt(db.engine.dialect.name, stats_table, ['kind', 'day', 'status'],
+                           lambda new: {'jumlah': new.jumlah, 'total_harga': new.total_harga})
+        db.session.execute(stmt, changed)
+    if stale:
+        db.session.execute(stats_table.delete().where(stats_table.c.id.in_(stale)))
+    db.session.commit()
+    return len(totals)
+
+
+def start_reconciler(app):
+    """Jalankan rebuild() tiap STATS_RECONCILE_INTERVAL detik di thread background."""
+    interval = app.config.get('STATS_RECONCILE_INTERVAL', 0)
+    if not interval or app.config.get('TESTING'):
+        return None
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    count = rebuild()
+                    app.logger.info(f"📊 Rekonsiliasi statistik selesai ({count} baris)")
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.error(f"❌ Rekonsiliasi statistik gagal: {e}")
+                finally:
+                    db.session.remove()
+
+    thread = threading.Thread(target=loop, name='stats-reconciler', daemon=True)
+    thread.start()
+    return thread
+
+
+@click.command('stats-rebuild')
+@with_appcontext
+def stats_rebuild_command():
+    """Hitung ulang tabel daily_stats dari orders, bookings & users."""
+    count = rebuild()
+    click.echo(f'✅ daily_stats dibangun ulang ({count} baris)')
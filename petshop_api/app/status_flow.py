@@ -0,0 +1,137 @@
+# File: app/status_flow.py
+
+from sqlalchemy import func
+from app import db
+from app import stats
+from app import booking_slots
+from app.models import Order, OrderDetail, Booking
+from app.stock import release_stock
+
+# Status asal -> status tujuan yang boleh dipilih admin.
+# 'selesai' dan 'batal' adalah status akhir (tidak bisa diubah lagi).
+ORDER_TRANSITIONS = {
+    'pending': {'diproses', 'batal'},
+    'menunggu_pembayaran': {'menunggu_konfirmasi', 'diproses', 'batal'},
+    'menunggu_konfirmasi': {'diproses', 'batal'},
+    'diproses': {'dikirim', 'batal'},
+    'dikirim': {'selesai'},
+    'selesai': set(),
+    'batal': set(),
+}
+
+# Booking lama memakai 'Pending'/'confirmed'/'finished', yang baru
+# 'menunggu_pembayaran'/'diproses'/'diterima'/'selesai'; keduanya didukung.
+_BOOKING_ACTIVE = {'confirmed', 'diterima'}
+_BOOKING_DONE = {'finished', 'selesai'}
+BOOKING_TRANSITIONS = {
+    'Pending': {'diproses'} | _BOOKING_ACTIVE | {'batal'},
+    'pending': {'diproses'} | _BOOKING_ACTIVE | {'batal'},
+    'menunggu_pembayaran': {'diproses'} | _BOOKING_ACTIVE | {'batal'},
+    'diproses': _BOOKING_ACTIVE | _BOOKING_DONE | {'batal'},
+    'confirmed': _BOOKING_DONE | {'batal'},
+    'diterima': _BOOKING_DONE | {'batal'},
+    'finished': set(),
+    'selesai': set(),
+    'batal': set(),
+}
+
+# Status akhir: tidak bisa pindah ke status lain lagi (tidak bisa dibatalkan/dibayar)
+ORDER_FINAL_STATUSES = sorted(s for s, nxt in ORDER_TRANSITIONS.items() if not nxt)
+BOOKING_FINAL_STATUSES = sorted(s for s, nxt in BOOKING_TRANSITIONS.items() if not nxt)
+
+# Batas jumlah ID per request bulk
+MAX_BULK_IDS = 500
+
+
+class TransitionConflict(Exception):
+    """Status sebagian data berubah oleh request lain di tengah proses bulk."""
+
+
+def _plan(ids, rows, transitions, target):
+    """Pisahkan ID yang valid dan buat laporan per ID (urut sesuai input)."""
+    valid = []
+    report = []
+    for row_id in ids:
+        row = rows.get(row_id)
+        if row is None:
+            report.append({'id': row_id, 'ok': False, 'error': 'Data tidak ditemukan'})
+        elif target not in transitions.get(row.status, ()):
+            report.append({'id': row_id, 'ok': False, 'from': row.status,
+                           'error': f"Status '{row.status}' tidak bisa diubah ke '{target}'"})
+        else:
+            valid.append(row)
+            report.append({'id': row_id, 'ok': True, 'from': row.status})
+    return valid, report
+
+
+def _apply(model, ids, target, transitions, reason, strict, columns):
+    # Kunci baris urut ID (MySQL/PostgreSQL; SQLite mengabaikan FOR UPDATE).
+    # Tidak bergantung pada kunci ini: UPDATE di bawah tetap mengecek status yang dibaca.
+    rows = {row.id: row for row in (db.session.query(model.id, model.status, *columns)
+                                    .filter(model.id.in_(ids))
+                                    .order_by(model.id)
+                                    .with_for_update())}
+    valid, report = _plan(ids, rows, transitions, target)
+    if strict and len(valid) != len(ids):
+        for entry in report:
+            if entry['ok']:
+                entry.update(ok=False, error='Tidak diubah: ada ID lain yang gagal (strict)')
+        return [], report, False
+    if not valid:
+        return [], report, False
+
+    values = {'status': target}
+    if reason:
+        values['cancel_reason'] = reason
+    # 1 UPDATE per status asal, dengan status yang dibaca tadi ikut di WHERE:
+    # kalau ada baris yang statusnya berubah di antaranya (walau ke status lain
+    # yang juga valid), jumlah baris tidak cocok dan semua dibatalkan
+    by_status = {}
+    for row in valid:
+        by_status.setdefault(row.status, []).append(row.id)
+    for status, status_ids in by_status.items():
+        updated = (model.query
+                   .filter(model.id.in_(status_ids), model.status == status)
+                   .update(values, synchronize_session=False))
+        if updated != len(status_ids):
+            raise TransitionConflict()
+    return valid, report, True
+
+
+def bulk_update_orders(ids, target, reason=None, strict=False):
+    """
+    Ubah status banyak order dalam transaksi yang sedang aktif (belum commit).
+
+    - 1 SELECT (kunci baris) + 1 UPDATE per status asal untuk order yang valid
+    - statistik dashboard digabung per tanggal & status (1 executemany)
+    - pembatalan: stok semua item dijumlahkan lalu dikembalikan sekaligus
+
+    Mengembalikan (laporan per ID, apakah ada perubahan). strict=True: kalau
+    ada 1 ID saja yang tidak valid, tidak ada yang diubah.
+    """
+    valid, report, applied = _apply(Order, ids, target, ORDER_TRANSITIONS, reason, strict,
+                                    (Order.created_at, Order.total_harga))
+    if not applied:
+        return report, False
+
+    stats.record_transitions('order', [(row.created_at, row.status, row.total_harga) for row in valid], target)
+    if target == 'batal':
+        quantities = dict(db.session.query(OrderDetail.item_id, func.sum(OrderDetail.jumlah))
+                          .filter(OrderDetail.order_id.in_([row.id for row in valid]))
+                          .group_by(OrderDetail.item_id))
+        release_stock({item_id: int(jumlah) for item_id, jumlah in quantities.items()})
+    return report, True
+
+
+def bulk_update_bookings(ids, target, reason=None, strict=False):
+    """Sama seperti bulk_update_orders; pembatalan melepas slot booking (1 UPDATE per slot)."""
+    valid, report, applied = _apply(Booking, ids, target, BOOKING_TRANSITIONS, reason, strict,
+                                    (Booking.booking_date, Booking.total_harga,
+                                     Booking.service_name, Booking.booking_time))
+    if not applied:
+        return report, False
+
+    stats.record_transitions('booking', [(row.booking_date, row.status, row.total_harga) for row in valid], target)
+    if target == 'batal':
+        booking_slots.release_bookings([(row.service_name, row.booking_date, row.booking_time) for row in valid])
+    return report, True
@@ -0,0 +1,86 @@
+# File: app/stock.py
+
+from sqlalchemy import update, bindparam
+from app import db
+from app.models import Item
+
+items_table = Item.__table__
+
+# UPDATE items SET stok = stok - :n WHERE id = :id AND stok >= :n
+# Cek & potong stok terjadi di 1 statement, jadi 2 checkout bersamaan
+# tidak bisa sama-sama lolos untuk stok terakhir (tidak ada oversell).
+_reserve_stmt = (update(items_table)
+                 .where(items_table.c.id == bindparam('b_id'),
+                        items_table.c.stok >= bindparam('b_n'))
+                 .values(stok=items_table.c.stok - bindparam('b_n')))
+
+_release_stmt = (update(items_table)
+                 .where(items_table.c.id == bindparam('b_id'))
+                 .values(stok=items_table.c.stok + bindparam('b_n')))
+
+
+class StockError(Exception):
+    """Stok salah satu item tidak cukup untuk dipesan."""
+
+    def __init__(self, nama, sisa):
+        super().__init__(f"Stok {nama} tidak cukup (Sisa: {sisa})")
+        self.nama = nama
+        self.sisa = sisa
+
+
+def aggregate_quantities(items_data):
+    """
+    Ubah [{'item_id': 1, 'jumlah': 2}, ...] jadi {item_id: total_jumlah}.
+    Item yang sama di beberapa baris dijumlahkan.
+    """
+    quantities = {}
+    for info in items_data:
+        item_id = int(info['item_id'])
+        jumlah = int(info['jumlah'])
+        if jumlah < 1:
+            raise ValueError(f"Jumlah item ID {item_id} harus lebih dari 0")
+        quantities[item_id] = quantities.get(item_id, 0) + jumlah
+    return quantities
+
+
+def _params(quantities):
+    # Selalu urut berdasarkan ID supaya urutan lock baris sama di semua
+    # transaksi -> tidak terjadi deadlock antar checkout
+    return [{'b_id': item_id, 'b_n': jumlah} for item_id, jumlah in sorted(quantities.items())]
+
+
+def _execute(stmt, params):
+    """Jalankan statement untuk banyak baris, kembalikan total baris yang berubah."""
+    if db.engine.dialect.supports_sane_multi_rowcount:
+        return db.session.execute(stmt, params).rowcount
+    # Driver yang rowcount executemany-nya tidak bisa dipercaya: satu per satu
+    return sum(db.session.execute(stmt, p).rowcount for p in params)
+
+
+def reserve_stock(quantities):
+    """
+    Potong stok semua item {item_id: jumlah} di transaksi yang sedang aktif.
+
+    Kalau ada item yang stoknya kurang, transaksi di-rollback (termasuk
+    potongan item lain yang sudah berhasil) lalu StockError dilempar.
+    """
+    params = _params(quantities)
+    if _execute(_reserve_stmt, params) == len(params):
+        return
+
+    db.session.rollback()
+    rows = (db.session.query(Item.id, Item.nama, Item.stok)
+            .filter(Item.id.in_(quantities.keys()))
+            .order_by(Item.id))
+    for row in rows:
+        if row.stok < quantities[row.id]:
+            raise StockError(row.nama, row.stok)
+    # Stok sempat kurang lalu bertambah lagi (mis. ada yang cancel) di antara
+    # UPDATE dan pengecekan ini; tetap dianggap gagal supaya client coba lagi.
+    raise StockError('item', 0)
+
+
+def release_stock(quantities):
+    """Kembalikan stok {item_id: jumlah} (untuk pembatalan) dalam 1 executemany."""
+    if quantities:
+        _execute(_release_stmt, _params(quantities))
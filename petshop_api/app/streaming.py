@@ -0,0 +1,52 @@
+# File: app/streaming.py
+
+from flask import current_app, request, stream_with_context
+
+# Berapa objek JSON digabung sebelum dikirim ke client dalam 1 potongan
+_CHUNK_ROWS = 100
+
+
+def wants_stream():
+    """
+    Apakah endpoint ini membalas dengan streaming?
+    - ?stream=1 / ?stream=0 dari client selalu menang
+    - selain itu ikut daftar STREAM_JSON_ENDPOINTS di Config
+    """
+    flag = request.args.get('stream')
+    if flag is not None:
+        return flag in ('1', 'true', 'yes')
+    return request.endpoint in current_app.config.get('STREAM_JSON_ENDPOINTS', ())
+
+
+def iter_json_array(rows, serialize):
+    """Hasilkan array JSON potong demi potong: '[', '{..},{..}', ..., ']'."""
+    dumps = current_app.json.dumps
+    yield '['
+    first = True
+    buffer = []
+    for row in rows:
+        buffer.append(dumps(serialize(row)))
+        if len(buffer) >= _CHUNK_ROWS:
+            yield ('' if first else ',') + ','.join(buffer)
+            first = False
+            buffer = []
+    if buffer:
+        yield ('' if first else ',') + ','.join(buffer)
+    yield ']'
+
+
+def json_list_response(query, serialize, status=200):
+    """
+    Balas query sebagai array JSON yang di-stream.
+
+    Query dijalankan dengan yield_per (server-side cursor di MySQL), jadi
+    hanya STREAM_JSON_BATCH_SIZE baris yang ada di memori pada satu waktu,
+    berapapun jumlah barisnya. Boleh juga iterator baris yang sudah urut
+    (mis. archive.iter_with_archive untuk tabel hot + arsip).
+    """
+    batch_size = current_app.config.get('STREAM_JSON_BATCH_SIZE', 500)
+    rows = query.yield_per(batch_size) if hasattr(query, 'yield_per') else query
+    return current_app.response_class(
+        stream_with_context(iter_json_array(rows, serialize)),
+        status=status,
+        mimetype='application/json')
@@ -0,0 +1,195 @@
+"""
+Generator data sintetis untuk benchmark (users, pets, items, orders +
+detail, bookings). Hasilnya deterministik untuk seed yang sama, jadi dua
+run dengan --seed sama mengukur database yang isinya persis sama.
+
+Dipakai oleh benchmarks.suite; bisa juga dipanggil sendiri untuk mengisi
+database lokal (ISI DATABASE TERSEBUT DIHAPUS DULU):
+
+    BENCH_DATABASE_URI=mysql+pymysql://root:@localhost/petshop_bench \
+        python -m benchmarks.datagen --users 2000 --orders 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+from app import db, stats, booking_slots, order_summary  # noqa: E402
+from app.models import User, Pet, Item, Order, OrderDetail, Booking  # noqa: E402
+
+# Semua user hasil generator memakai password ini
+PASSWORD = 'rahasia123'
+ADMIN_EMAIL = 'admin@bench.local'
+
+# Ukuran dataset default (bisa diganti lewat argumen)
+DEFAULT_SCALE = {
+    'users': 500,
+    'pets_per_user': 2,
+    'items': 2000,
+    'services': 6,
+    'orders': 5000,
+    'lines_per_order': 3,
+    'bookings': 2000,
+}
+
+BRANDS = ['Whiskas', 'Royal Canin', 'Pedigree', 'Me-O', 'Bolt', 'Proplan', 'Felibite', 'Alpo']
+PRODUCTS = ['makanan kucing', 'makanan anjing', 'snack kucing', 'pasir kucing', 'kalung anjing',
+            'mainan kucing', 'shampo anjing', 'vitamin kucing', 'sisir bulu', 'tas kucing']
+FLAVORS = ['tuna', 'salmon', 'ayam', 'daging sapi', 'kambing', 'kitten', 'adult', 'premium']
+SERVICES = ['Grooming', 'Vaksinasi', 'Pet Hotel', 'Konsultasi Dokter', 'Mandi Kutu', 'Potong Kuku',
+            'Steril', 'Cek Gigi']
+JENIS = ['Kucing', 'Anjing', 'Kelinci', 'Hamster']
+WARNA = ['Putih', 'Hitam', 'Oranye', 'Belang', 'Abu-abu']
+BANKS = ['BCA', 'BRI', 'MANDIRI', 'BNI', 'CIMB']
+
+# Distribusi status kira-kira seperti data produksi (kebanyakan sudah selesai)
+ORDER_STATUSES = ['selesai'] * 6 + ['dikirim', 'diproses', 'menunggu_konfirmasi',
+                                    'menunggu_pembayaran', 'batal']
+BOOKING_STATUSES = ['selesai'] * 5 + ['diterima', 'diproses', 'menunggu_pembayaran', 'batal']
+
+INSERT_CHUNK = 5000
+
+
+def _insert(table, rows):
+    for start in range(0, len(rows), INSERT_CHUNK):
+        db.session.execute(table.insert(), rows[start:start + INSERT_CHUNK])
+
+
+def generate(scale, seed=42, now=None, hash_method='pbkdf2:sha256', slot_times=('10:00',)):
+    """
+    Buat semua baris (list dict per tabel) tanpa menyentuh database.
+    ID diisi sendiri supaya detail/booking bisa langsung merujuk ke induknya.
+    """
+    rnd = random.Random(seed)
+    now = now or datetime.utcnow().replace(microsecond=0)
+    # 1 hash untuk semua user: hashing ratusan ribu kali hanya membuang waktu seeding
+    password = generate_password_hash(PASSWORD, method=hash_method)
+
+    users = [{'id': 1, 'nama_lengkap': 'Admin Bench', 'email': ADMIN_EMAIL, 'password': password,
+              'role': 'admin', 'no_hp': None, 'alamat': None, 'created_at': now - timedelta(days=400)}]
+    for i in range(2, scale['users'] + 2):
+        users.append({'id': i, 'nama_lengkap': f'Pelanggan {i}', 'email': f'user{i}@bench.local',
+                      'password': password, 'role': 'client', 'no_hp': f'08{rnd.randint(10**9, 10**10 - 1)}',
+                      'alamat': f'Jl. Benchmark No. {i}',
+                      'created_at': now - timedelta(days=rnd.randint(0, 365))})
+    client_ids = [u['id'] for u in users[1:]]
+
+    pets = []
+    for user_id in client_ids:
+        for _ in range(rnd.randint(0, scale['pets_per_user'] * 2)):
+            pets.append({'id': len(pets) + 1, 'user_id': user_id, 'nama_hewan': f'Pet {len(pets) + 1}',
+                         'jenis': rnd.choice(JENIS), 'warna': rnd.choice(WARNA),
+                         'usia': f'{rnd.randint(1, 12)} tahun', 'created_at': now})
+
+    items = []
+    for i in range(1, scale['items'] + 1):
+        product = rnd.choice(PRODUCTS)
+        items.append({'id': i, 'tipe': 'aksesoris' if 'makanan' not in product and 'snack' not in product
+                      else 'makanan',
+                      'nama': f'{rnd.choice(BRANDS)} {product.title()} {rnd.choice(FLAVORS).title()} {i}',
+                      'harga': rnd.randint(5, 500) * 1000, 'stok': rnd.randint(5000, 20000),
+                      'deskripsi': f'{product} rasa {rnd.choice(FLAVORS)}',
+                      'gambar_url': f'https://img.bench.local/items/{i}.jpg',
+                      'created_at': now - timedelta(minutes=scale['items'] - i)})
+    product_ids = [item['id'] for item in items]
+    services = SERVICES[:scale['services']]
+    for name in services:
+        items.append({'id': len(items) + 1, 'tipe': 'layanan', 'nama': name,
+                      'harga': rnd.randint(5, 30) * 10000, 'stok': 0,
+                      'deskripsi': f'Layanan {name.lower()}', 'gambar_url': None, 'created_at': now})
+    prices = {item['id']: item['harga'] for item in items}
+    service_prices = {item['nama']: item['harga'] for item in items if item['tipe'] == 'layanan'}
+
+    orders, details = [], []
+    for order_id in range(1, scale['orders'] + 1):
+        lines = rnd.sample(product_ids, min(len(product_ids), rnd.randint(1, scale['lines_per_order'])))
+        total = 0
+        for item_id in lines:
+            jumlah = rnd.randint(1, 3)
+            total += prices[item_id] * jumlah
+            details.append({'id': len(details) + 1, 'order_id': order_id, 'item_id': item_id,
+                            'jumlah': jumlah, 'subtotal': prices[item_id] * jumlah})
+        status = rnd.choice(ORDER_STATUSES)
+        orders.append({'id': order_id, 'user_id': rnd.choice(client_ids), 'total_harga': total,
+                       'status': status, 'bank_name': rnd.choice(BANKS),
+                       'va_number': f'8800{rnd.randint(10**9, 10**10 - 1)}', 'payment_method': 'transfer',
+                       'cancel_reason': 'Dibatalkan Pengguna' if status == 'batal' else None,
+                       # Order belum dibayar dibuat baru-baru ini supaya tidak langsung diambil sweeper
+                       'created_at': now - timedelta(minutes=rnd.randint(1, 60) if status == 'menunggu_pembayaran'
+                                                     else rnd.randint(60, 180 * 24 * 60))})
+
+    bookings = []
+    for booking_id in range(1, scale['bookings'] + 1):
+        service = rnd.choice(services)
+        status = rnd.choice(BOOKING_STATUSES)
+        bookings.append({'id': booking_id, 'user_id': rnd.choice(client_ids), 'service_name': service,
+                         'booking_date': (now + timedelta(days=rnd.randint(-180, 30))).date(),
+                         'booking_time': rnd.choice(slot_times), 'keluhan': '-', 'status': status,
+                         'pet_name': f'Pet {booking_id}', 'pet_type': rnd.choice(JENIS),
+                         'pet_color': rnd.choice(WARNA), 'payment_method': 'Transfer Bank',
+                         'bank_name': rnd.choice(BANKS), 'va_number': f'8800{booking_id}',
+                         'total_harga': service_prices[service],
+                         'cancel_reason': 'Dibatalkan Pengguna' if status == 'batal' else None,
+                         'created_at': now - timedelta(minutes=rnd.randint(1, 60))})
+
+    return {'users': users, 'pets': pets, 'items': items, 'orders': orders,
+            'order_details': details, 'bookings': bookings}
+
+
+def seed(app, scale=None, seed=42):
+    """
+    Kosongkan database app, isi dengan data sintetis, lalu bangun ulang
+    tabel turunan (daily_stats, booking_slots). Mengembalikan jumlah baris per tabel.
+    """
+    scale = {**DEFAULT_SCALE, **(scale or {})}
+    with app.app_context():
+        data = generate(scale, seed, hash_method=app.config.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256'),
+                        slot_times=app.config['BOOKING_SLOT_TIMES'])
+        db.drop_all()
+        db.create_all()
+        for model, name in [(User, 'users'), (Pet, 'pets'), (Item, 'items'), (Order, 'orders'),
+                            (OrderDetail, 'order_details'), (Booking, 'bookings')]:
+            _insert(model.__table__, data[name])
+        db.session.commit()
+
+        # Kolom ringkasan order sengaja dikosongkan di generate(): diisi lewat
+        # job backfill yang sama dengan yang dipakai di produksi
+        order_summary.backfill(batch_size=5000)
+        stats.rebuild()
+        with db.engine.begin() as conn:
+            booking_slots.rebuild(conn)
+    return {name: len(rows) for name, rows in data.items()}
+
+
+def add_scale_arguments(parser):
+    for name, default in DEFAULT_SCALE.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    parser.add_argument('--seed', type=int, default=42)
+
+
+def scale_from_args(args):
+    return {name: getattr(args, name) for name in DEFAULT_SCALE}
+
+
+def main():
+    from benchmarks.suite import make_config
+    from app import create_app
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    app = create_app(make_config())
+    counts = seed(app, scale_from_args(args), args.seed)
+    print(f"✅ Database {app.config['SQLALCHEMY_DATABASE_URI']} diisi: "
+          + ', '.join(f'{n} {name}' for name, n in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
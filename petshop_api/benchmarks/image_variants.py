@@ -0,0 +1,72 @@
+"""
+Benchmark pipeline gambar: ukuran file asli vs varian thumb/medium, dan
+waktu pembuatan varian di pool worker.
+
+Memakai gambar asset bawaan aplikasi Flutter (petshop_app/assets/images),
+jadi angkanya sama dengan yang akan diunduh layar daftar item/hewan.
+
+    python -m benchmarks.image_variants --workers 2
+    python -m benchmarks.image_variants --format jpeg
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.images import ImagePipeline  # noqa: E402
+from config import Config  # noqa: E402
+
+DEFAULT_ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                              'petshop_app', 'assets', 'images')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--assets', default=DEFAULT_ASSETS)
+    parser.add_argument('--workers', type=int, default=Config.IMAGE_WORKERS)
+    parser.add_argument('--format', default=Config.IMAGE_FORMAT, choices=['webp', 'jpeg'])
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='petshop-media-')
+    try:
+        pipeline = ImagePipeline(root=root, variants=Config.IMAGE_VARIANTS, fmt=args.format,
+                                 quality=Config.IMAGE_QUALITY, workers=args.workers,
+                                 max_bytes=Config.IMAGE_MAX_UPLOAD_BYTES,
+                                 max_pixels=Config.IMAGE_MAX_PIXELS, wait_timeout=60)
+        files = sorted(f for f in os.listdir(args.assets) if f.lower().endswith(('.jpg', '.jpeg', '.png')))
+        keys = {}
+        for name in files:
+            with open(os.path.join(args.assets, name), 'rb') as f:
+                keys[name] = pipeline.save(f)
+
+        started = time.perf_counter()
+        for future in [pipeline.submit(key) for key in keys.values()]:
+            future.result()
+        elapsed = time.perf_counter() - started
+
+        totals = {'asli': 0, **{variant: 0 for variant in pipeline.variants}}
+        print(f"{'file':<24} {'asli':>10} " + ' '.join(f'{v:>10}' for v in pipeline.variants))
+        for name, key in keys.items():
+            sizes = {'asli': os.path.getsize(pipeline.original_path(key))}
+            for variant in pipeline.variants:
+                sizes[variant] = os.path.getsize(os.path.join(root, pipeline.variant_name(key, variant)))
+            for column, size in sizes.items():
+                totals[column] += size
+            print(f'{name:<24} ' + ' '.join(f'{sizes[c]:>10,}' for c in totals))
+        print(f"{'TOTAL':<24} " + ' '.join(f'{totals[c]:>10,}' for c in totals))
+        for variant in pipeline.variants:
+            print(f'  {variant}: {totals[variant] / totals["asli"]:.1%} dari ukuran asli')
+        print(f'{len(keys)} gambar x {len(pipeline.variants)} varian ({args.format}) dalam {elapsed:.2f} s '
+              f'dengan {args.workers} worker ({elapsed / len(keys) * 1000:.0f} ms/gambar)')
+        pipeline.shutdown()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
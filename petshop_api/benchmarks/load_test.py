@@ -0,0 +1,106 @@
+"""
+Load test HTTP sederhana untuk API yang sedang berjalan.
+
+Membuka N koneksi keep-alive paralel, mengirim request GET ke path yang
+dipilih, lalu mencetak latensi p50/p95/p99 dan throughput.
+
+Contoh (bandingkan server development vs produksi):
+
+    python run.py                 # terminal 1 (Werkzeug, debug)
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --path /api/items
+
+    python serve.py               # terminal 1 (gunicorn/waitress)
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --path /api/items
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+def run_load(url, paths, concurrency, total_requests, timeout=30):
+    """Kembalikan dict hasil: latensi (ms), throughput, jumlah error."""
+    target = urlparse(url)
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(total_requests))
+
+    def worker():
+        conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=timeout)
+        local = []
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                break
+            path = paths[n % len(paths)]
+            started = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status >= 500:
+                    with lock:
+                        errors[0] += 1
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=timeout)
+                continue
+            local.append((time.perf_counter() - started) * 1000)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--path', action='append', help='boleh diulang; default /api/items')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--json', action='store_true', help='cetak hasil sebagai JSON')
+    args = parser.parse_args()
+
+    result = run_load(args.url, args.path or ['/api/items'], args.concurrency, args.requests)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"{result['requests']} request ({result['errors']} error) dalam {result['seconds']} detik")
+        print(f"Throughput: {result['throughput_rps']} req/detik")
+        print(f"Latensi p50 {result['p50_ms']} ms | p95 {result['p95_ms']} ms | p99 {result['p99_ms']} ms")
+
+
+if __name__ == '__main__':
+    main()
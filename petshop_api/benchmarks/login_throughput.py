@@ -0,0 +1,100 @@
+"""
+Benchmark throughput login untuk beberapa konfigurasi hash password.
+
+Setiap konfigurasi: buat app baru (SQLite sementara), daftarkan user,
+lalu jalankan login paralel dan catat login/detik serta latensi p95.
+
+    python -m benchmarks.login_throughput --threads 16 --logins 200
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config  # noqa: E402
+from app import create_app, db  # noqa: E402
+from benchmarks.load_test import percentile  # noqa: E402
+
+# (label, method, workers, pakai proses)
+CONFIGS = [
+    ('pbkdf2 100k, 2 thread', 'pbkdf2:sha256:100000', 2, False),
+    ('pbkdf2 600k, 2 thread', 'pbkdf2:sha256:600000', 2, False),
+    ('pbkdf2 600k, 4 thread', 'pbkdf2:sha256:600000', 4, False),
+    ('pbkdf2 600k, 2 proses', 'pbkdf2:sha256:600000', 2, True),
+    ('scrypt 32768/8/1, 2 thread', 'scrypt:32768:8:1', 2, False),
+]
+
+
+def run_config(method, workers, use_processes, threads, logins):
+    path = os.path.join(tempfile.mkdtemp(prefix='petshop_login_'), 'bench.db')
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        PASSWORD_HASH_METHOD = method
+        PASSWORD_HASH_WORKERS = workers
+        PASSWORD_HASH_USE_PROCESSES = use_processes
+        PASSWORD_HASH_MAX_PENDING = threads
+        PASSWORD_HASH_WAIT_TIMEOUT = 60
+        STATS_RECONCILE_INTERVAL = 0
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.post('/api/users/register', json={
+        'nama_lengkap': 'Bench', 'email': 'bench@example.com', 'password': 'rahasia123'})
+
+    latencies = []
+    status_counts = {}
+    lock = threading.Lock()
+    per_thread = max(1, logins // threads)
+
+    def worker():
+        c = app.test_client()
+        for _ in range(per_thread):
+            started = time.perf_counter()
+            resp = c.post('/api/users/login', json={'email': 'bench@example.com', 'password': 'rahasia123'})
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+                status_counts[resp.status_code] = status_counts.get(resp.status_code, 0) + 1
+
+    workers_list = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for t in workers_list:
+        t.start()
+    for t in workers_list:
+        t.join()
+    elapsed = time.perf_counter() - started
+    app.extensions['password_hasher'].shutdown()
+
+    latencies.sort()
+    return {
+        'logins_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p95_ms': round(percentile(latencies, 95), 1),
+        'status': status_counts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--logins', type=int, default=160)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    for label, method, workers, use_processes in CONFIGS:
+        result = run_config(method, workers, use_processes, args.threads, args.logins)
+        print(f"{label:<28} {result['logins_per_sec']:>7} login/s  "
+              f"p50 {result['p50_ms']:>7} ms  p95 {result['p95_ms']:>7} ms  {result['status']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark serialisasi JSON dan ukuran response di jaringan.
+
+Untuk GET /api/items (katalog penuh) dan GET /api/admin/orders:
+- waktu encode payload: json bawaan vs orjson (PetshopJSONProvider)
+- waktu endpoint (p50) dengan masing-masing provider, cache katalog dibuang tiap request
+- ukuran body: tanpa kompresi, gzip, brotli (kalau terpasang) + waktu kompresinya
+
+    python -m benchmarks.payload_size --items 2000 --orders 5000 --repeat 30
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.catalog_cache import catalog_cache  # noqa: E402
+from app.compression import brotli, compress  # noqa: E402
+from benchmarks import datagen  # noqa: E402
+from benchmarks.load_test import percentile  # noqa: E402
+from benchmarks.suite import make_config  # noqa: E402
+
+ENDPOINTS = ['/api/items', '/api/admin/orders?limit=100']
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return percentile(samples, 50)
+
+
+def make_app(provider, uri):
+    os.environ['BENCH_DATABASE_URI'] = uri
+    config = make_config()
+    config.JSON_PROVIDER = provider
+    # Ukur body mentah; kompresi diukur terpisah di bawah
+    config.COMPRESS_ENABLED = False
+    return create_app(config)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=2000)
+    parser.add_argument('--orders', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    first = create_app(make_config())
+    uri = first.config['SQLALCHEMY_DATABASE_URI']
+    datagen.seed(first, {'items': args.items, 'orders': args.orders})
+    apps = {name: make_app(name, uri) for name in ('json', 'orjson')}
+
+    for path in ENDPOINTS:
+        print(f'\n{path}')
+        payload = None
+        for name, app in apps.items():
+            client = app.test_client()
+
+            def request_once():
+                catalog_cache.bump()
+                return client.get(path)
+
+            resp = request_once()
+            payload = payload or resp.get_json()
+            with app.app_context():
+                encode_ms = timed(lambda: app.json.dumps_bytes(payload), args.repeat)
+            endpoint_ms = timed(request_once, args.repeat)
+            print(f'  {name:<7} encode p50 {encode_ms:7.2f} ms | endpoint p50 {endpoint_ms:7.2f} ms')
+
+        with apps['orjson'].app_context():
+            body = apps['orjson'].json.dumps_bytes(payload)
+        print(f"  {'identity':<9} {len(body):>9,} byte")
+        encodings = ['gzip'] + (['br'] if brotli is not None else [])
+        for encoding in encodings:
+            compressed = compress(body, encoding)
+            ms = timed(lambda: compress(body, encoding), max(3, args.repeat // 3))
+            print(f'  {encoding:<9} {len(compressed):>9,} byte ({len(compressed) / len(body):.0%}), '
+                  f'kompres p50 {ms:.2f} ms')
+        if brotli is None:
+            print('  (paket brotli tidak terpasang, br dilewati)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark pencarian katalog: index di memori vs LIKE '%q%' di database.
+
+Database SQLite sementara diisi N item acak, lalu setiap query dijalankan
+berulang kali dengan kedua cara (halaman pertama 20 item + total hasil).
+
+    python -m benchmarks.search_latency --items 100000 --repeat 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import or_, func  # noqa: E402
+from config import Config  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.models import Item  # noqa: E402
+from app.search_index import search_index  # noqa: E402
+from benchmarks.load_test import percentile  # noqa: E402
+
+BRANDS = ['Whiskas', 'Royal Canin', 'Pedigree', 'Me-O', 'Bolt', 'Proplan', 'Felibite', 'Cat Choize',
+          'Alpo', 'Kitchen Flavor', 'Happy Dog', 'Ziwi', 'Orijen', 'Acana', 'Nutrience']
+PRODUCTS = ['makanan kucing', 'makanan anjing', 'snack kucing', 'pasir kucing', 'kalung anjing',
+            'kandang hamster', 'mainan kucing', 'shampo anjing', 'vitamin kucing', 'tempat makan',
+            'grooming', 'vaksin', 'obat cacing', 'sisir bulu', 'tas kucing']
+FLAVORS = ['tuna', 'salmon', 'ayam', 'daging sapi', 'kambing', 'udang', 'sayuran', 'original',
+           'kitten', 'adult', 'senior', 'hairball', 'indoor', 'sensitive', 'premium']
+TIPE = ['makanan', 'aksesoris', 'layanan']
+
+# (label, q, filter tambahan)
+QUERIES = [
+    ('kata umum', 'kucing', {}),
+    ('2 kata', 'salmon kitten', {}),
+    ('awalan', 'prop', {}),
+    ('salah ketik', 'whiskaz', {}),
+    ('kata + tipe + harga', 'anjing', {'tipe': {'makanan'}, 'min_harga': 50000, 'max_harga': 150000}),
+    ('tidak ada', 'gajah', {}),
+]
+
+
+def seed(app, count):
+    rnd = random.Random(42)
+    base = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        product = rnd.choice(PRODUCTS)
+        rows.append({
+            'nama': f'{rnd.choice(BRANDS)} {product.title()} {rnd.choice(FLAVORS).title()} {rnd.randint(1, 20) * 100}g',
+            'tipe': rnd.choice(TIPE),
+            'harga': rnd.randint(5, 500) * 1000,
+            'stok': rnd.randint(0, 100),
+            'deskripsi': f'{product} rasa {rnd.choice(FLAVORS)}, cocok untuk hewan kesayangan',
+            'created_at': base + timedelta(minutes=i),
+        })
+    with app.app_context():
+        db.create_all()
+        for start in range(0, count, 10000):
+            db.session.execute(Item.__table__.insert(), rows[start:start + 10000])
+        db.session.commit()
+
+
+def like_search(q, tipe=None, min_harga=None, max_harga=None, limit=20):
+    query = Item.query
+    for token in q.split():
+        pattern = f'%{token}%'
+        query = query.filter(or_(Item.nama.ilike(pattern), Item.deskripsi.ilike(pattern)))
+    if tipe:
+        query = query.filter(Item.tipe.in_(tipe))
+    if min_harga is not None:
+        query = query.filter(Item.harga >= min_harga)
+    if max_harga is not None:
+        query = query.filter(Item.harga <= max_harga)
+    total = query.with_entities(func.count(Item.id)).scalar()
+    rows = query.order_by(Item.created_at.desc(), Item.id.desc()).limit(limit).all()
+    return rows, total
+
+
+def index_search(q, limit=20, **filters):
+    ids, total = search_index.search(q=q, limit=limit, **filters)
+    rows = Item.query.filter(Item.id.in_(ids)).all() if ids else []
+    return rows, total
+
+
+def timed(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return result, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='petshop_search_'), 'bench.db')
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        STATS_RECONCILE_INTERVAL = 0
+        SEARCH_INDEX_TTL = 3600
+
+    app = create_app(BenchConfig)
+    seed(app, args.items)
+
+    with app.app_context():
+        started = time.perf_counter()
+        search_index.search(q='x')
+        build_s = time.perf_counter() - started
+        # Bangun sekali lagi di bawah tracemalloc hanya untuk mengukur memori
+        tracemalloc.start()
+        data = search_index._build()
+        index_mb = tracemalloc.get_traced_memory()[0] / 2**20
+        tracemalloc.stop()
+        del data
+        print(f'{args.items} item, bangun index {build_s:.2f} detik, memori index ~{index_mb:.0f} MB\n')
+
+        print(f"{'query':<22} {'hasil':>7} {'LIKE p50':>9} {'p95':>7} {'index p50':>10} {'p95':>7}")
+        for label, q, filters in QUERIES:
+            (_, like_total), like_ms = timed(lambda: like_search(q, **filters), max(3, args.repeat // 10))
+            (_, idx_total), idx_ms = timed(lambda: index_search(q, **filters), args.repeat)
+            print(f"{label:<22} {idx_total:>7} {percentile(like_ms, 50):>8.1f}ms {percentile(like_ms, 95):>5.1f}ms "
+                  f"{percentile(idx_ms, 50):>9.2f}ms {percentile(idx_ms, 95):>5.2f}ms"
+                  + ('' if like_total == idx_total else f'  (LIKE: {like_total})'))
+
+
+if __name__ == '__main__':
+    main()
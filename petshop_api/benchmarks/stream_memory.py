@@ -0,0 +1,118 @@
+"""
+Benchmark memori: response list biasa (jsonify) vs streaming (?stream=1).
+
+Untuk tiap jumlah baris, database SQLite sementara diisi data, lalu setiap
+mode dijalankan di proses terpisah supaya angka RSS tidak saling mempengaruhi.
+Dicatat puncak alokasi Python (tracemalloc) dan max RSS proses.
+
+    python -m benchmarks.stream_memory --rows 10000 50000 200000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.models import User, Item, Order, OrderDetail  # noqa: E402
+
+ENDPOINTS = {
+    'items': '/api/items',
+    'orders': '/api/orders/user/1',
+}
+
+
+def make_app(path):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        STATS_RECONCILE_INTERVAL = 0
+        LOG_SAMPLE_RATE = 0.0
+
+    return create_app(BenchConfig)
+
+
+def seed(path, rows):
+    app = make_app(path)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(nama_lengkap='Bench', email='bench@example.com', password='x'))
+        db.session.commit()
+        base = datetime(2024, 1, 1)
+        db.session.execute(Item.__table__.insert(), [
+            {'nama': f'Item {i}', 'tipe': 'produk', 'harga': 1000 + i, 'stok': 10,
+             'deskripsi': 'Deskripsi barang untuk benchmark', 'gambar_url': f'/img/{i}.png',
+             'created_at': base + timedelta(seconds=i)}
+            for i in range(rows)])
+        db.session.execute(Order.__table__.insert(), [
+            {'user_id': 1, 'total_harga': 2000, 'status': 'selesai',
+             'created_at': base + timedelta(seconds=i)}
+            for i in range(rows)])
+        db.session.execute(OrderDetail.__table__.insert(), [
+            {'order_id': i + 1, 'item_id': i + 1, 'jumlah': 2, 'subtotal': 2000}
+            for i in range(rows)])
+        db.session.commit()
+
+
+def measure(path, endpoint, stream):
+    """Dijalankan di proses anak: 1 request, body dibaca sampai habis lalu dibuang."""
+    app = make_app(path)
+    client = app.test_client()
+    url = ENDPOINTS[endpoint] + ('?stream=1' if stream else '?stream=0')
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    resp = client.get(url, buffered=False)
+    size = 0
+    for chunk in resp.response:
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # ru_maxrss: KB di Linux, byte di macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss //= 1024
+    print(json.dumps({'status': resp.status_code, 'bytes': size, 'seconds': elapsed,
+                      'peak_mb': peak / 2**20, 'rss_mb': rss / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 50000, 200000])
+    parser.add_argument('--endpoints', nargs='+', choices=sorted(ENDPOINTS), default=sorted(ENDPOINTS))
+    parser.add_argument('--child', nargs=3, metavar=('DB', 'ENDPOINT', 'STREAM'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        path, endpoint, stream = args.child
+        measure(path, endpoint, stream == '1')
+        return
+
+    print(f"{'endpoint':<8} {'baris':>8} {'mode':<7} {'body MB':>8} {'detik':>7} {'puncak MB':>10} {'RSS MB':>8}")
+    for rows in args.rows:
+        path = os.path.join(tempfile.mkdtemp(prefix='petshop_stream_'), 'bench.db')
+        seed(path, rows)
+        for endpoint in args.endpoints:
+            for stream in ('0', '1'):
+                out = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.stream_memory', '--child', path, endpoint, stream],
+                    cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                    capture_output=True, text=True, check=True)
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                mode = 'stream' if stream == '1' else 'jsonify'
+                print(f"{endpoint:<8} {rows:>8} {mode:<7} {r['bytes'] / 2**20:>8.1f} {r['seconds']:>7.2f} "
+                      f"{r['peak_mb']:>10.1f} {r['rss_mb']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Stress test checkout: banyak thread membeli item yang sama bersamaan.
+
+Membuktikan stok tidak pernah oversell (stok akhir >= 0 dan jumlah yang
+terjual == stok awal - stok akhir) sekaligus mencatat throughput.
+
+Jalankan dari folder petshop_api:
+
+    python -m benchmarks.stress_checkout --threads 16 --orders 50 --stock 300
+
+Default memakai file SQLite sementara. Untuk MySQL lokal:
+
+    BENCH_DATABASE_URI=mysql+pymysql://root:@localhost/petshop_bench python -m benchmarks.stress_checkout
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.models import User, Item, Order, OrderDetail  # noqa: E402
+
+
+def make_config():
+    uri = os.environ.get('BENCH_DATABASE_URI')
+    if not uri:
+        path = os.path.join(tempfile.mkdtemp(prefix='petshop_bench_'), 'bench.db')
+        uri = f'sqlite:///{path}'
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = uri
+        # SQLite: tunggu lock tulis, jangan langsung error "database is locked"
+        SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': 30}} if uri.startswith('sqlite') else {}
+
+    return BenchConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--orders', type=int, default=50, help='checkout per thread')
+    parser.add_argument('--stock', type=int, default=300, help='stok awal tiap item')
+    parser.add_argument('--qty', type=int, default=2, help='jumlah per baris checkout')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    app = create_app(make_config())
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        users = [User(nama_lengkap=f'Bench {i}', email=f'bench{i}@example.com', password='-')
+                 for i in range(args.threads)]
+        items = [Item(nama=f'Produk Laris {i}', tipe='makanan', harga=10000, stok=args.stock)
+                 for i in range(2)]
+        db.session.add_all(users + items)
+        db.session.commit()
+        user_ids = [u.id for u in users]
+        item_ids = [i.id for i in items]
+
+    results = {'ok': 0, 'habis': 0, 'error': 0}
+    lock = threading.Lock()
+
+    def worker(user_id, n):
+        client = app.test_client()
+        for k in range(n):
+            # Urutan item diacak per checkout supaya deadlock akan kelihatan kalau ada
+            lines = item_ids if k % 2 == 0 else list(reversed(item_ids))
+            resp = client.post('/api/orders', json={
+                'user_id': user_id,
+                'items_list': [{'item_id': i, 'jumlah': args.qty} for i in lines],
+            })
+            key = 'ok' if resp.status_code == 201 else 'habis' if resp.status_code == 400 else 'error'
+            with lock:
+                results[key] += 1
+
+    threads = [threading.Thread(target=worker, args=(uid, args.orders)) for uid in user_ids]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        ok = True
+        for item_id in item_ids:
+            stok_akhir = db.session.get(Item, item_id).stok
+            terjual = (db.session.query(db.func.coalesce(db.func.sum(OrderDetail.jumlah), 0))
+                       .filter(OrderDetail.item_id == item_id).scalar())
+            consistent = stok_akhir >= 0 and terjual == args.stock - stok_akhir
+            ok = ok and consistent
+            print(f'Item {item_id}: stok akhir {stok_akhir}, terjual {terjual} -> {"OK" if consistent else "OVERSELL!"}')
+        total_orders = Order.query.count()
+
+    total = sum(results.values())
+    print(f'Checkout: {total} request, {results["ok"]} sukses, {results["habis"]} stok habis, '
+          f'{results["error"]} error, {total_orders} order tersimpan')
+    print(f'Waktu: {elapsed:.2f} detik, throughput {total / elapsed:.1f} checkout/detik')
+    sys.exit(0 if ok and results['error'] == 0 and total_orders == results['ok'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,382 @@
+"""
+Benchmark suite: alur pengguna nyata ke semua blueprint, di atas database
+yang diisi data sintetis (benchmarks.datagen).
+
+Alur (dipilih acak sesuai bobot, tiap thread = 1 pengguna paralel):
+
+    belanja : login -> lihat katalog -> cari -> sinkron keranjang -> checkout
+              -> bayar -> riwayat order -> detail order
+    booking : login -> cek slot -> booking -> bayar -> riwayat booking -> daftar pet
+    admin   : dashboard -> daftar order (2 halaman) -> daftar booking
+              -> konfirmasi massal order yang sudah dibayar
+
+Hasilnya JSON: latensi p50/p95/p99, throughput, status HTTP dan jumlah
+statement SQL per request, per endpoint dan per alur. Simpan sebagai
+baseline lalu bandingkan run berikutnya:
+
+    python -m benchmarks.suite --out baseline.json
+    python -m benchmarks.suite --baseline baseline.json      # exit 1 kalau regresi
+
+Default memakai file SQLite sementara. Untuk MySQL lokal (ISI DATABASE DIHAPUS):
+
+    BENCH_DATABASE_URI=mysql+pymysql://root:@localhost/petshop_bench python -m benchmarks.suite
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+from config import Config  # noqa: E402
+from app import create_app, db  # noqa: E402
+from benchmarks import datagen  # noqa: E402
+from benchmarks.load_test import percentile  # noqa: E402
+
+JOURNEY_WEIGHTS = {'belanja': 6, 'booking': 3, 'admin': 1}
+SEARCH_WORDS = ['kucing', 'anjing', 'salmon', 'royal', 'vitamin', 'pasir']
+
+
+def make_config(hash_method=None):
+    uri = os.environ.get('BENCH_DATABASE_URI')
+    if not uri:
+        path = os.path.join(tempfile.mkdtemp(prefix='petshop_suite_'), 'bench.db')
+        uri = f'sqlite:///{path}'
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = uri
+        # SQLite: tunggu lock tulis, jangan langsung error "database is locked"
+        SQLALCHEMY_ENGINE_OPTIONS = ({'connect_args': {'timeout': 30}} if uri.startswith('sqlite')
+                                     else Config.SQLALCHEMY_ENGINE_OPTIONS)
+        DATABASE_REPLICA_URL = None
+        PASSWORD_HASH_METHOD = hash_method or Config.PASSWORD_HASH_METHOD
+        # Thread background dimatikan supaya tidak ikut terukur
+        STATS_RECONCILE_INTERVAL = 0
+        EXPIRY_SWEEP_INTERVAL = 0
+        # Yang diukur jalur sukses booking, bukan slot penuh
+        BOOKING_SLOT_CAPACITY = 10 ** 6
+
+    return BenchConfig
+
+
+class SqlCounter:
+    """
+    Hitung statement SQL per request di thread yang menjalankannya.
+    test_client menjalankan request di thread pemanggil, jadi hitungan
+    tiap thread tidak tercampur walaupun banyak request jalan paralel.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._local = threading.local()
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+    def reset(self):
+        self._local.count = 0
+
+    def read(self):
+        return getattr(self._local, 'count', 0)
+
+
+class Recorder:
+    """Kumpulkan sampel (latensi, status, SQL) per endpoint dan per alur."""
+
+    def __init__(self, sql_counter):
+        self.sql = sql_counter
+        self._lock = threading.Lock()
+        self.endpoints = {}
+        self.journeys = {}
+
+    def call(self, client, label, method, path, **kwargs):
+        self.sql.reset()
+        started = time.perf_counter()
+        resp = client.open(path, method=method, **kwargs)
+        elapsed = (time.perf_counter() - started) * 1000
+        queries = self.sql.read()
+        with self._lock:
+            self.endpoints.setdefault(label, []).append((elapsed, resp.status_code, queries))
+        return resp
+
+    def journey(self, name, elapsed, ok):
+        with self._lock:
+            self.journeys.setdefault(name, []).append((elapsed, ok))
+
+
+# ---------------------------------------------------------------------
+# ALUR PENGGUNA
+# ---------------------------------------------------------------------
+def _login(rec, client, email):
+    resp = rec.call(client, 'POST /api/users/login', 'POST', '/api/users/login',
+                    json={'email': email, 'password': datagen.PASSWORD})
+    return resp.get_json()['user']['id'] if resp.status_code == 200 else None
+
+
+def journey_belanja(rec, client, rnd, ctx):
+    user_id = _login(rec, client, f"user{rnd.choice(ctx['user_ids'])}@bench.local")
+    if user_id is None:
+        return False
+    rec.call(client, 'GET /api/items', 'GET', '/api/items')
+    found = rec.call(client, 'GET /api/items?q=', 'GET',
+                     f'/api/items?q={rnd.choice(SEARCH_WORDS)}&sort=harga_asc&limit=20').get_json()
+    item_ids = [item['id'] for item in (found or {}).get('data', [])] or rnd.sample(ctx['item_ids'], 2)
+    lines = [{'item_id': i, 'jumlah': rnd.randint(1, 2)} for i in rnd.sample(item_ids, min(2, len(item_ids)))]
+
+    rec.call(client, 'POST /api/cart/user/<id>/sync', 'POST', f'/api/cart/user/{user_id}/sync',
+             json={'mode': 'replace', 'items': lines})
+    resp = rec.call(client, 'POST /api/orders', 'POST', '/api/orders',
+                    json={'user_id': user_id, 'items_list': lines, 'bank': 'BCA'},
+                    headers={'Idempotency-Key': str(uuid.uuid4())})
+    if resp.status_code != 201:
+        return False
+    order_id = resp.get_json()['order_id']
+    resp = rec.call(client, 'PUT /api/orders/<id>/pay', 'PUT', f'/api/orders/{order_id}/pay',
+                    headers={'Idempotency-Key': str(uuid.uuid4())})
+    rec.call(client, 'GET /api/orders/user/<id>', 'GET', f'/api/orders/user/{user_id}')
+    rec.call(client, 'GET /api/orders/<id>', 'GET', f'/api/orders/{order_id}')
+    return resp.status_code == 200
+
+
+def journey_booking(rec, client, rnd, ctx):
+    user_id = _login(rec, client, f"user{rnd.choice(ctx['user_ids'])}@bench.local")
+    if user_id is None:
+        return False
+    service = rnd.choice(ctx['services'])
+    start = date.today() + timedelta(days=1)
+    rec.call(client, 'GET /api/bookings/availability', 'GET',
+             f'/api/bookings/availability?service_name={service}&days=7&start={start}')
+    resp = rec.call(client, 'POST /api/bookings', 'POST', '/api/bookings', json={
+        'user_id': user_id, 'service_name': service,
+        'booking_date': str(start + timedelta(days=rnd.randint(0, 6))),
+        'booking_time': rnd.choice(ctx['slot_times']), 'pet_name': 'Bench', 'pet_type': 'Kucing',
+        'payment_method': 'Transfer Bank', 'bank_name': 'BCA',
+    }, headers={'Idempotency-Key': str(uuid.uuid4())})
+    if resp.status_code != 201:
+        return False
+    booking_id = resp.get_json()['booking_id']
+    resp = rec.call(client, 'PUT /api/bookings/<id>/pay', 'PUT', f'/api/bookings/{booking_id}/pay',
+                    headers={'Idempotency-Key': str(uuid.uuid4())})
+    rec.call(client, 'GET /api/bookings/user/<id>', 'GET', f'/api/bookings/user/{user_id}')
+    rec.call(client, 'GET /api/pets/user/<id>', 'GET', f'/api/pets/user/{user_id}')
+    return resp.status_code == 200
+
+
+def journey_admin(rec, client, rnd, ctx):
+    ok = rec.call(client, 'GET /api/admin/stats', 'GET', '/api/admin/stats?days=30').status_code == 200
+    page = rec.call(client, 'GET /api/admin/orders', 'GET', '/api/admin/orders?limit=20').get_json()
+    if page and page.get('next_cursor'):
+        rec.call(client, 'GET /api/admin/orders', 'GET',
+                 f"/api/admin/orders?limit=20&cursor={page['next_cursor']}")
+    rec.call(client, 'GET /api/admin/bookings', 'GET', '/api/admin/bookings?limit=20')
+
+    paid = rec.call(client, 'GET /api/admin/orders?status=', 'GET',
+                    '/api/admin/orders?status=menunggu_konfirmasi&limit=20').get_json()
+    ids = [order['id'] for order in (paid or {}).get('data', [])]
+    if ids:
+        resp = rec.call(client, 'POST /api/admin/orders/status', 'POST', '/api/admin/orders/status',
+                        json={'ids': ids, 'status': 'diproses'})
+        ok = ok and resp.status_code == 200
+    return ok
+
+
+JOURNEYS = {'belanja': journey_belanja, 'booking': journey_booking, 'admin': journey_admin}
+
+
+# ---------------------------------------------------------------------
+# RINGKASAN & PERBANDINGAN
+# ---------------------------------------------------------------------
+def _latency(values):
+    values = sorted(values)
+    return {
+        'p50_ms': round(percentile(values, 50), 2),
+        'p95_ms': round(percentile(values, 95), 2),
+        'p99_ms': round(percentile(values, 99), 2),
+    }
+
+
+def summarize(rec, elapsed):
+    endpoints = {}
+    for label, samples in sorted(rec.endpoints.items()):
+        statuses = {}
+        for _, status, _ in samples:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        sql = [queries for _, _, queries in samples]
+        endpoints[label] = {
+            'requests': len(samples),
+            'errors': sum(1 for _, status, _ in samples if status >= 400),
+            'status': statuses,
+            **_latency(ms for ms, _, _ in samples),
+            'sql_avg': round(sum(sql) / len(sql), 2),
+            'sql_max': max(sql),
+        }
+    journeys = {}
+    for name, samples in sorted(rec.journeys.items()):
+        journeys[name] = {'count': len(samples), 'failed': sum(1 for _, ok in samples if not ok),
+                          **_latency(ms for ms, _ in samples)}
+
+    all_samples = [s for samples in rec.endpoints.values() for s in samples]
+    total = len(all_samples)
+    return {
+        'overall': {
+            'requests': total,
+            'errors': sum(1 for _, status, _ in all_samples if status >= 400),
+            'seconds': round(elapsed, 3),
+            'throughput_rps': round(total / elapsed, 1) if elapsed else 0.0,
+            **_latency(ms for ms, _, _ in all_samples),
+            'sql_per_request': round(sum(q for _, _, q in all_samples) / total, 2) if total else 0.0,
+        },
+        'endpoints': endpoints,
+        'journeys': journeys,
+    }
+
+
+def compare(result, baseline, tolerance, min_delta_ms=5.0):
+    """
+    Daftar regresi dibanding baseline: p95 naik lebih dari `tolerance`
+    (mis. 0.2 = 20%) DAN lebih dari `min_delta_ms` (endpoint yang sangat
+    cepat tidak dianggap regresi karena noise), jumlah SQL per request naik,
+    atau endpoint mulai error.
+    """
+    problems = []
+    for label, now in result['endpoints'].items():
+        before = baseline.get('endpoints', {}).get(label)
+        if before is None:
+            continue
+        if now['p95_ms'] > max(before['p95_ms'] * (1 + tolerance), before['p95_ms'] + min_delta_ms):
+            problems.append(f"{label}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+        # SQL per request deterministik; toleransi kecil hanya untuk rata-rata
+        if now['sql_max'] > before['sql_max'] or now['sql_avg'] > before['sql_avg'] + 0.5:
+            problems.append(f"{label}: SQL/request {before['sql_avg']} (max {before['sql_max']}) "
+                            f"-> {now['sql_avg']} (max {now['sql_max']})")
+        if now['errors'] > before['errors']:
+            problems.append(f"{label}: error {before['errors']} -> {now['errors']}")
+    old_rps = baseline.get('overall', {}).get('throughput_rps')
+    if old_rps and result['overall']['throughput_rps'] < old_rps * (1 - tolerance):
+        problems.append(f"throughput {old_rps} -> {result['overall']['throughput_rps']} req/detik")
+    return problems
+
+
+# ---------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------
+def run_suite(app, journeys, concurrency, seed, warmup=1):
+    with app.app_context():
+        from app.models import User, Item
+        ctx = {
+            'user_ids': [u.id for u in User.query.filter(User.role != 'admin').with_entities(User.id)],
+            'item_ids': [i.id for i in Item.query.filter(Item.tipe != 'layanan').with_entities(Item.id)],
+            'services': [i.nama for i in Item.query.filter(Item.tipe == 'layanan').with_entities(Item.nama)],
+            'slot_times': list(app.config['BOOKING_SLOT_TIMES']),
+        }
+        engine = db.engine
+
+    names = list(JOURNEY_WEIGHTS)
+    weights = [JOURNEY_WEIGHTS[n] for n in names]
+    counter = iter(range(journeys))
+    lock = threading.Lock()
+
+    with SqlCounter(engine) as sql:
+        # Pemanasan (cache katalog, index pencarian, pool koneksi) tidak ikut dihitung
+        warm = Recorder(sql)
+        for name in names * warmup:
+            JOURNEYS[name](warm, app.test_client(), random.Random(seed), ctx)
+
+        rec = Recorder(sql)
+
+        def worker(index):
+            client = app.test_client()
+            rnd = random.Random(seed * 1000 + index)
+            while True:
+                with lock:
+                    n = next(counter, None)
+                if n is None:
+                    break
+                name = rnd.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    ok = JOURNEYS[name](rec, client, rnd, ctx)
+                except Exception:
+                    ok = False
+                rec.journey(name, (time.perf_counter() - started) * 1000, ok)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+    return summarize(rec, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    datagen.add_scale_arguments(parser)
+    parser.add_argument('--journeys', type=int, default=300, help='jumlah alur yang dijalankan')
+    parser.add_argument('--concurrency', type=int, default=8, help='jumlah pengguna paralel')
+    parser.add_argument('--hash-method', help='default: PASSWORD_HASH_METHOD di Config')
+    parser.add_argument('--out', help='simpan hasil JSON ke file ini')
+    parser.add_argument('--baseline', help='file JSON hasil run sebelumnya untuk dibandingkan')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='batas kenaikan p95/penurunan throughput')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help='kenaikan p95 minimal yang dianggap regresi')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    app = create_app(make_config(args.hash_method))
+
+    started = time.perf_counter()
+    scale = datagen.scale_from_args(args)
+    counts = datagen.seed(app, scale, args.seed)
+    seed_seconds = time.perf_counter() - started
+
+    result = {
+        'meta': {
+            'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+            'python': platform.python_version(),
+            'seed': args.seed,
+            'scale': scale,
+            'rows': counts,
+            'seed_seconds': round(seed_seconds, 2),
+            'journeys': args.journeys,
+            'concurrency': args.concurrency,
+            'hash_method': app.config['PASSWORD_HASH_METHOD'],
+        },
+        **run_suite(app, args.journeys, args.concurrency, args.seed),
+    }
+    app.extensions['password_hasher'].shutdown()
+
+    output = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(result, json.load(f), args.tolerance, args.min_delta_ms)
+        for problem in problems:
+            print(f'REGRESI: {problem}', file=sys.stderr)
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+# File: gunicorn.conf.py
+#
+# Konfigurasi gunicorn, nilainya diambil dari Config (bisa diubah lewat env).
+# Jalankan: gunicorn -c gunicorn.conf.py wsgi:app
+
+from config import Config
+
+bind = f"{Config.SERVER_HOST}:{Config.SERVER_PORT}"
+workers = Config.SERVER_WORKERS
+threads = Config.SERVER_THREADS
+worker_class = 'gthread'
+keepalive = Config.SERVER_KEEPALIVE
+timeout = Config.SERVER_TIMEOUT
+graceful_timeout = Config.SERVER_GRACEFUL_TIMEOUT
+
+# Worker di-restart berkala supaya kebocoran memori tidak menumpuk
+max_requests = 10000
+max_requests_jitter = 1000
+
+accesslog = None
+errorlog = '-'
@@ -0,0 +1,8 @@
+"""Index di items.nama untuk pencarian layanan berdasarkan nama (booking)."""
+
+import sqlalchemy as sa
+
+
+def upgrade(conn):
+    items = sa.Table('items', sa.MetaData(), sa.Column('nama', sa.String(100)))
+    sa.Index('ix_items_nama', items.c.nama).create(conn, checkfirst=True)
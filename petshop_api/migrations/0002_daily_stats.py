@@ -0,0 +1,32 @@
+"""Tabel daily_stats untuk dashboard admin + isi awal dari data yang sudah ada."""
+
+import sqlalchemy as sa
+
+
+def upgrade(conn):
+    meta = sa.MetaData()
+    daily_stats = sa.Table(
+        'daily_stats', meta,
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('kind', sa.String(20), nullable=False),
+        sa.Column('day', sa.Date, nullable=False),
+        sa.Column('status', sa.String(50), nullable=False),
+        sa.Column('jumlah', sa.Integer, nullable=False, default=0),
+        sa.Column('total_harga', sa.BigInteger, nullable=False, default=0),
+        sa.UniqueConstraint('kind', 'day', 'status', name='uq_daily_stats_kind_day_status'),
+    )
+    daily_stats.create(conn, checkfirst=True)
+
+    conn.execute(sa.text("DELETE FROM daily_stats"))
+    conn.execute(sa.text(
+        "INSERT INTO daily_stats (kind, day, status, jumlah, total_harga) "
+        "SELECT 'order', COALESCE(DATE(created_at), '1970-01-01'), COALESCE(status, '-'), COUNT(*), COALESCE(SUM(total_harga), 0) "
+        "FROM orders GROUP BY COALESCE(DATE(created_at), '1970-01-01'), COALESCE(status, '-')"))
+    conn.execute(sa.text(
+        "INSERT INTO daily_stats (kind, day, status, jumlah, total_harga) "
+        "SELECT 'booking', booking_date, COALESCE(status, '-'), COUNT(*), COALESCE(SUM(total_harga), 0) "
+        "FROM bookings GROUP BY booking_date, COALESCE(status, '-')"))
+    conn.execute(sa.text(
+        "INSERT INTO daily_stats (kind, day, status, jumlah, total_harga) "
+        "SELECT 'user', COALESCE(DATE(created_at), '1970-01-01'), role, COUNT(*), 0 "
+        "FROM users WHERE role <> 'admin' GROUP BY COALESCE(DATE(created_at), '1970-01-01'), role"))
@@ -0,0 +1,17 @@
+"""Kunci unik (user_id, item_id) di carts. Baris dobel digabung dulu (jumlah dijumlahkan)."""
+
+import sqlalchemy as sa
+
+
+def upgrade(conn):
+    duplicates = conn.execute(sa.text(
+        "SELECT user_id, item_id, MIN(id) AS keep_id, SUM(jumlah) AS total "
+        "FROM carts GROUP BY user_id, item_id HAVING COUNT(*) > 1")).fetchall()
+    for row in duplicates:
+        conn.execute(sa.text("UPDATE carts SET jumlah = :total WHERE id = :keep_id"),
+                     {'total': row.total, 'keep_id': row.keep_id})
+        conn.execute(sa.text("DELETE FROM carts WHERE user_id = :u AND item_id = :i AND id <> :keep_id"),
+                     {'u': row.user_id, 'i': row.item_id, 'keep_id': row.keep_id})
+
+    carts = sa.Table('carts', sa.MetaData(), sa.Column('user_id', sa.Integer), sa.Column('item_id', sa.Integer))
+    sa.Index('uq_carts_user_item', carts.c.user_id, carts.c.item_id, unique=True).create(conn, checkfirst=True)
@@ -0,0 +1,66 @@
+"""
+Kapasitas slot layanan: kolom items.kapasitas_slot, index booking, tabel booking_slots + isi awal.
+
+Isi awal dihitung dengan 1 INSERT ... SELECT memakai jadwal slot bawaan
+saat migrasi ini dibuat (09:00-16:00, 60 menit) dan hanya jam format 'HH:MM'.
+Kalau BOOKING_SLOT_TIMES/BOOKING_SLOT_MINUTES diubah, atau ada booking lama
+dengan format jam lain ('2:00 PM'), hitung ulang dengan:
+    flask --app run slots-rebuild
+"""
+
+import sqlalchemy as sa
+
+# Salinan jadwal slot saat migrasi dibuat (bukan dibaca dari kode aplikasi)
+SLOT_TIMES = ['09:00', '10:00', '11:00', '12:00', '13:00', '14:00', '15:00', '16:00']
+SLOT_MINUTES = 60
+
+
+def _slot_end(start):
+    hour, minute = map(int, start.split(':'))
+    end = hour * 60 + minute + SLOT_MINUTES
+    return f"{end // 60:02d}:{end % 60:02d}"
+
+
+def _quoted(value):
+    return sa.literal_column(f"'{value}'", sa.String)
+
+
+def upgrade(conn):
+    columns = {c['name'] for c in sa.inspect(conn).get_columns('items')}
+    if 'kapasitas_slot' not in columns:
+        conn.execute(sa.text("ALTER TABLE items ADD COLUMN kapasitas_slot INTEGER NULL"))
+
+    bookings = sa.Table('bookings', sa.MetaData(), sa.Column('service_name', sa.String(100)),
+                        sa.Column('booking_date', sa.Date), sa.Column('booking_time', sa.String(10)),
+                        sa.Column('status', sa.String(50)))
+    sa.Index('ix_bookings_service_date_time', bookings.c.service_name, bookings.c.booking_date,
+             bookings.c.booking_time).create(conn, checkfirst=True)
+
+    booking_slots = sa.Table(
+        'booking_slots', sa.MetaData(),
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('service_name', sa.String(100), nullable=False),
+        sa.Column('booking_date', sa.Date, nullable=False),
+        sa.Column('slot_time', sa.String(5), nullable=False),
+        sa.Column('terisi', sa.Integer, nullable=False, default=0),
+        sa.UniqueConstraint('service_name', 'booking_date', 'slot_time', name='uq_booking_slots_service_date_time'),
+    )
+    booking_slots.create(conn, checkfirst=True)
+
+    # booking_time 'HH:MM' -> jam mulai slot-nya (perbandingan teks aman karena
+    # 2 digit); jam di luar jadwal jadi NULL dan tidak dihitung. Konstanta ditulis
+    # literal supaya ekspresi di SELECT & GROUP BY sama persis (PostgreSQL)
+    slot_time = sa.case(
+        *[(sa.and_(bookings.c.booking_time >= _quoted(start), bookings.c.booking_time < _quoted(_slot_end(start))),
+           _quoted(start))
+          for start in SLOT_TIMES],
+        else_=sa.null())
+    counts = (sa.select(bookings.c.service_name, bookings.c.booking_date, slot_time.label('slot_time'),
+                        sa.func.count().label('terisi'))
+              .where(bookings.c.status.is_(None) | (bookings.c.status != 'batal'),
+                     sa.func.length(bookings.c.booking_time) == 5,
+                     slot_time.is_not(None))
+              .group_by(bookings.c.service_name, bookings.c.booking_date, slot_time))
+    conn.execute(booking_slots.delete())
+    conn.execute(booking_slots.insert().from_select(
+        ['service_name', 'booking_date', 'slot_time', 'terisi'], counts))
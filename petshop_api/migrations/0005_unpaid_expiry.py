@@ -0,0 +1,20 @@
+"""Pembatalan otomatis: bookings.created_at + index (status, created_at) di orders & bookings."""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+
+
+def upgrade(conn):
+    columns = {c['name'] for c in sa.inspect(conn).get_columns('bookings')}
+    if 'created_at' not in columns:
+        conn.execute(sa.text("ALTER TABLE bookings ADD COLUMN created_at DATETIME NULL"))
+        # Booking lama tidak punya waktu dibuat: anggap dibuat saat migrasi,
+        # jadi yang belum dibayar baru kadaluarsa setelah 1 TTL penuh
+        conn.execute(sa.text("UPDATE bookings SET created_at = :now WHERE created_at IS NULL"),
+                     {'now': datetime.utcnow()})
+
+    meta = sa.MetaData()
+    for name in ('orders', 'bookings'):
+        table = sa.Table(name, meta, sa.Column('status', sa.String(50)), sa.Column('created_at', sa.DateTime))
+        sa.Index(f'ix_{name}_status_created_at', table.c.status, table.c.created_at).create(conn, checkfirst=True)
@@ -0,0 +1,20 @@
+"""Tabel idempotency_keys untuk header Idempotency-Key (checkout & pembayaran)."""
+
+import sqlalchemy as sa
+
+
+def upgrade(conn):
+    idempotency_keys = sa.Table(
+        'idempotency_keys', sa.MetaData(),
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('scope', sa.String(200), nullable=False),
+        sa.Column('key', sa.String(100), nullable=False),
+        sa.Column('fingerprint', sa.String(64), nullable=False),
+        sa.Column('status_code', sa.Integer, nullable=True),
+        sa.Column('response_body', sa.Text, nullable=True),
+        sa.Column('mimetype', sa.String(100), nullable=True),
+        sa.Column('created_at', sa.DateTime),
+        sa.Column('expires_at', sa.DateTime, nullable=False, index=True),
+        sa.UniqueConstraint('scope', 'key', name='uq_idempotency_keys_scope_key'),
+    )
+    idempotency_keys.create(conn, checkfirst=True)
@@ -0,0 +1,41 @@
+"""Index komposit untuk query yang paling sering jalan (riwayat user, daftar admin, katalog)."""
+
+import sqlalchemy as sa
+
+# (tabel, nama index, kolom) -- sama dengan __table_args__/index=True di app/models.py
+INDEXES = [
+    # GET /api/orders/user/<id>: WHERE user_id = ? ORDER BY created_at DESC
+    ('orders', 'ix_orders_user_id_created_at', ('user_id', 'created_at')),
+    # GET /api/admin/orders: keyset ORDER BY created_at DESC, id DESC
+    ('orders', 'ix_orders_created_at_id', ('created_at', 'id')),
+    # Detail order dimuat per halaman: WHERE order_id IN (...)
+    ('order_details', 'ix_order_details_order_id', ('order_id',)),
+    # GET /api/bookings/user/<id>: WHERE user_id = ? ORDER BY id DESC
+    ('bookings', 'ix_bookings_user_id_id', ('user_id', 'id')),
+    # GET /api/admin/bookings: keyset ORDER BY booking_date DESC, id DESC
+    ('bookings', 'ix_bookings_booking_date_id', ('booking_date', 'id')),
+    # GET /api/items: ORDER BY created_at DESC
+    ('items', 'ix_items_created_at', ('created_at',)),
+    # GET /api/pets/user/<id>
+    ('pets', 'ix_pets_user_id', ('user_id',)),
+    # Rekonsiliasi statistik & daftar user per role
+    ('users', 'ix_users_role', ('role',)),
+]
+
+
+def _leading_column(index):
+    return index['column_names'][0] if index['column_names'] else None
+
+
+def upgrade(conn):
+    inspector = sa.inspect(conn)
+    for table_name, index_name, columns in INDEXES:
+        existing = inspector.get_indexes(table_name)
+        if any(index['name'] == index_name for index in existing):
+            continue
+        # Index 1 kolom dilewati kalau sudah ada index yang diawali kolom itu
+        # (dump MySQL lama punya KEY `user_id`/`order_id` per foreign key)
+        if len(columns) == 1 and any(_leading_column(index) == columns[0] for index in existing):
+            continue
+        table = sa.Table(table_name, sa.MetaData(), *(sa.Column(c) for c in columns))
+        sa.Index(index_name, *(table.c[c] for c in columns)).create(conn)
@@ -0,0 +1,13 @@
+"""Key gambar hasil upload (app/images.py): items.gambar_key & pets.foto_key."""
+
+import sqlalchemy as sa
+
+COLUMNS = [('items', 'gambar_key'), ('pets', 'foto_key')]
+
+
+def upgrade(conn):
+    inspector = sa.inspect(conn)
+    for table_name, column in COLUMNS:
+        existing = {c['name'] for c in inspector.get_columns(table_name)}
+        if column not in existing:
+            conn.execute(sa.text(f"ALTER TABLE {table_name} ADD COLUMN {column} VARCHAR(40) NULL"))
@@ -0,0 +1,26 @@
+"""
+Ringkasan order saat checkout (orders.line_count/items_summary/first_image_*)
+dan snapshot nama & harga barang di order_details.
+
+Kolom dibuat kosong; isi order lama dengan perintah terpisah (per batch):
+    flask --app run orders-backfill-summary
+"""
+
+import sqlalchemy as sa
+
+COLUMNS = [
+    ('orders', 'line_count', 'INTEGER'),
+    ('orders', 'items_summary', 'VARCHAR(500)'),
+    ('orders', 'first_image_url', 'VARCHAR(255)'),
+    ('orders', 'first_image_key', 'VARCHAR(40)'),
+    ('order_details', 'nama_barang', 'VARCHAR(100)'),
+    ('order_details', 'harga', 'INTEGER'),
+]
+
+
+def upgrade(conn):
+    inspector = sa.inspect(conn)
+    existing = {table: {c['name'] for c in inspector.get_columns(table)} for table in ('orders', 'order_details')}
+    for table_name, column, column_type in COLUMNS:
+        if column not in existing[table_name]:
+            conn.execute(sa.text(f"ALTER TABLE {table_name} ADD COLUMN {column} {column_type} NULL"))
@@ -0,0 +1,40 @@
+"""
+Tabel arsip orders_archive, order_details_archive, bookings_archive (app/archive.py).
+
+Kolom disalin dari tabel sumbernya (sama persis, ID tanpa auto increment)
+ditambah archived_at; tanpa foreign key karena hanya dibaca.
+"""
+
+import sqlalchemy as sa
+
+# (tabel sumber, tabel arsip, [(nama index, kolom)])
+ARCHIVES = [
+    ('orders', 'orders_archive', [
+        ('ix_orders_archive_user_id_created_at', ('user_id', 'created_at')),
+        ('ix_orders_archive_created_at_id', ('created_at', 'id')),
+    ]),
+    ('order_details', 'order_details_archive', [
+        ('ix_order_details_archive_order_id', ('order_id',)),
+    ]),
+    ('bookings', 'bookings_archive', [
+        ('ix_bookings_archive_user_id_id', ('user_id', 'id')),
+        ('ix_bookings_archive_booking_date_id', ('booking_date', 'id')),
+    ]),
+]
+
+
+def upgrade(conn):
+    inspector = sa.inspect(conn)
+    existing = set(inspector.get_table_names())
+    meta = sa.MetaData()
+    for source_name, archive_name, indexes in ARCHIVES:
+        if archive_name in existing:
+            continue
+        columns = [sa.Column(c['name'], c['type'], primary_key=(c['name'] == 'id'), autoincrement=False,
+                             nullable=(c['name'] != 'id' and c['nullable']))
+                   for c in inspector.get_columns(source_name)]
+        columns.append(sa.Column('archived_at', sa.DateTime, nullable=False))
+        table = sa.Table(archive_name, meta, *columns)
+        for index_name, index_columns in indexes:
+            sa.Index(index_name, *(table.c[c] for c in index_columns))
+        table.create(conn)
@@ -0,0 +1,16 @@
+"""
+Lease klaim Idempotency-Key: idempotency_keys.claimed_at (kapan klaim
+terakhir diambil) dan committed_at (diisi di transaksi yang sama dengan
+perubahan data handler). Klaim yang belum selesai dan lebih tua dari
+IDEMPOTENCY_LEASE_SECONDS boleh diambil alih request ulang.
+"""
+
+import sqlalchemy as sa
+
+
+def upgrade(conn):
+    existing = {c['name'] for c in sa.inspect(conn).get_columns('idempotency_keys')}
+    for column in ('claimed_at', 'committed_at'):
+        if column not in existing:
+            conn.execute(sa.text(f"ALTER TABLE idempotency_keys ADD COLUMN {column} DATETIME NULL"))
+    conn.execute(sa.text("UPDATE idempotency_keys SET claimed_at = created_at WHERE claimed_at IS NULL"))
@@ -0,0 +1,10 @@
+"""Index items(tipe, id) untuk cache layanan: WHERE tipe = 'layanan' ORDER BY id DESC."""
+
+import sqlalchemy as sa
+
+
+def upgrade(conn):
+    if any(index['name'] == 'ix_items_tipe_id' for index in sa.inspect(conn).get_indexes('items')):
+        return
+    items = sa.Table('items', sa.MetaData(), sa.Column('tipe', sa.String(20)), sa.Column('id', sa.Integer))
+    sa.Index('ix_items_tipe_id', items.c.tipe, items.c.id).create(conn)
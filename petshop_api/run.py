@@ -15,4 +15,6 @@ if __name__ == '__main__':
     # port=5000 adalah 'pintu' yang kita gunakan
     # debug=True artinya server akan auto-restart kalau kita ubah kode
     #     (Sangat berguna saat development)
+    # JANGAN pakai file ini di server produksi: jalankan 'python serve.py'
+    #     (multi-worker, multi-thread, tanpa debug)
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
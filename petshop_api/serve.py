@@ -0,0 +1,47 @@
+# File: serve.py
+#
+# Menjalankan API dalam mode produksi (tanpa debug, tanpa auto-reload).
+#   - Linux/macOS: gunicorn (multi-proses + multi-thread), pakai gunicorn.conf.py
+#   - Windows (Laragon) / gunicorn tidak terpasang: waitress (multi-thread)
+#
+# Contoh:
+#   python serve.py
+#   SERVER_WORKERS=4 SERVER_THREADS=8 python serve.py
+
+import importlib.util
+import os
+import sys
+
+from config import Config
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+
+
+def run_gunicorn():
+    # Ganti proses ini dengan gunicorn, supaya sinyal SIGTERM/SIGHUP
+    # (graceful shutdown/reload) langsung diterima oleh master gunicorn
+    os.chdir(basedir)
+    os.execv(sys.executable, [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'])
+
+
+def run_waitress():
+    from waitress import serve
+    from wsgi import app
+
+    print(f"🚀 Waitress jalan di {Config.SERVER_HOST}:{Config.SERVER_PORT} "
+          f"({Config.SERVER_THREADS} thread)")
+    serve(app,
+          host=Config.SERVER_HOST,
+          port=Config.SERVER_PORT,
+          threads=Config.SERVER_THREADS,
+          channel_timeout=Config.SERVER_CHANNEL_TIMEOUT,
+          # Antrian koneksi yang menunggu thread kosong
+          backlog=2048,
+          connection_limit=Config.SERVER_THREADS * 100)
+
+
+if __name__ == '__main__':
+    if os.name != 'nt' and importlib.util.find_spec('gunicorn'):
+        run_gunicorn()
+    else:
+        run_waitress()
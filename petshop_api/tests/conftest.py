@@ -0,0 +1,33 @@
+# File: tests/conftest.py
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from config import TestingConfig  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    class Config(TestingConfig):
+        MEDIA_DIR = str(tmp_path / 'media')
+        STATS_RECONCILE_INTERVAL = 0
+        EXPIRY_SWEEP_INTERVAL = 0
+        ARCHIVE_INTERVAL = 0
+
+    app = create_app(Config)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,72 @@
+# File: tests/test_archive.py
+
+from datetime import datetime, timedelta
+
+from app import db
+from app.archive import run_archive
+from app.models import User, Item, Order, OrderDetail, OrderArchive
+
+
+def _order(user_id, item, status, created_at):
+    order = Order(user_id=user_id, total_harga=item.harga, status=status, created_at=created_at)
+    db.session.add(order)
+    db.session.flush()
+    db.session.add(OrderDetail(order_id=order.id, item_id=item.id, jumlah=1, subtotal=item.harga))
+    return order
+
+
+def test_archived_ids_are_not_reused(app, client):
+    old = datetime.utcnow() - timedelta(days=400)
+    with app.app_context():
+        user = User(nama_lengkap='Arsip', email='arsip@test.local', password='x')
+        item = Item(nama='Whiskas', tipe='makanan', harga=1000, stok=100)
+        db.session.add_all([user, item])
+        db.session.flush()
+        for _ in range(3):
+            _order(user.id, item, 'selesai', old)
+        db.session.commit()
+        user_id = user.id
+
+        run_archive({'ARCHIVE_AFTER_DAYS': 180})
+        archived = {order_id for (order_id,) in db.session.query(OrderArchive.id)}
+        # Order ID terbesar tetap di tabel hot supaya ID berikutnya tidak turun
+        assert len(archived) == 2 and Order.query.count() == 1
+
+        new_order = _order(user_id, item, 'menunggu_pembayaran', datetime.utcnow())
+        db.session.commit()
+        assert new_order.id not in archived
+        new_id = new_order.id
+
+    page = client.get(f'/api/orders/user/{user_id}?limit=2').get_json()
+    ids = [order['id'] for order in page['data']]
+    page = client.get(f'/api/orders/user/{user_id}?limit=2&cursor={page["next_cursor"]}').get_json()
+    ids += [order['id'] for order in page['data']]
+    assert page['next_cursor'] is None
+    assert ids[0] == new_id and len(set(ids)) == 4
+
+    # Detail order yang sudah diarsip tetap bisa dibuka dengan ID yang sama
+    detail = client.get(f'/api/orders/{min(archived)}').get_json()
+    assert detail['status'] == 'selesai' and detail['items'][0]['nama'] == 'Whiskas'
+
+
+def test_stream_merges_hot_and_archive_in_order(app, client):
+    app.config['STREAM_JSON_BATCH_SIZE'] = 2
+    now = datetime.utcnow()
+    with app.app_context():
+        user = User(nama_lengkap='Stream', email='stream@test.local', password='x')
+        item = Item(nama='Pasir', tipe='aksesoris', harga=500, stok=100)
+        db.session.add_all([user, item])
+        db.session.flush()
+        # Order lama yang masih dikirim tetap di tabel hot, di antara order yang diarsip
+        for days, status in [(400, 'selesai'), (390, 'dikirim'), (380, 'batal'), (370, 'dikirim'),
+                             (360, 'selesai'), (10, 'menunggu_pembayaran'), (1, 'selesai')]:
+            _order(user.id, item, status, now - timedelta(days=days))
+        db.session.commit()
+        user_id = user.id
+        run_archive({'ARCHIVE_AFTER_DAYS': 180})
+        assert OrderArchive.query.count() == 3
+
+    listed = client.get(f'/api/orders/user/{user_id}?stream=0').get_json()
+    streamed = client.get(f'/api/orders/user/{user_id}?stream=1').get_json()
+    assert [o['id'] for o in streamed] == [o['id'] for o in listed]
+    assert [o['id'] for o in streamed] == list(range(7, 0, -1))
@@ -0,0 +1,28 @@
+# File: tests/test_compression.py
+
+import gzip
+
+from app import db
+from app.models import Item
+
+
+def test_catalog_etag_differs_per_encoding(app, client):
+    with app.app_context():
+        db.session.add_all([Item(nama=f'Makanan {i}', tipe='makanan', harga=1000 + i, stok=10,
+                                 deskripsi='Makanan kucing dewasa rasa tuna ' * 4)
+                            for i in range(30)])
+        db.session.commit()
+
+    plain = client.get('/api/items', headers={'Accept-Encoding': 'identity'})
+    zipped = client.get('/api/items', headers={'Accept-Encoding': 'gzip'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(zipped.data) == plain.data
+    # Byte berbeda -> ETag berbeda (cache perantara tidak boleh tertukar)
+    assert zipped.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+
+    # Validasi ulang dengan ETag versi gzip tetap dapat 304 dengan validator yang sama
+    again = client.get('/api/items', headers={'Accept-Encoding': 'gzip',
+                                             'If-None-Match': zipped.headers['ETag']})
+    assert again.status_code == 304 and again.headers['ETag'] == zipped.headers['ETag']
+    again = client.get('/api/items', headers={'If-None-Match': plain.headers['ETag']})
+    assert again.status_code == 304 and again.headers['ETag'] == plain.headers['ETag']
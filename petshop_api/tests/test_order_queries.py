@@ -0,0 +1,57 @@
+# File: tests/test_order_queries.py
+#
+# Jumlah statement SQL endpoint order harus tetap sama walaupun riwayat
+# order user bertambah (tidak ada N+1 per order / per detail / per item).
+
+import pytest
+
+from app import db
+from app.models import User, Item, Order, OrderDetail
+from app.profiling import count_queries
+
+
+def _user_with_orders(order_count, lines_per_order=3):
+    user = User(nama_lengkap=f'User {order_count}', email=f'user{order_count}@test.local', password='x')
+    db.session.add(user)
+    items = [Item(nama=f'Item {order_count}-{i}', tipe='makanan', harga=1000 * (i + 1), stok=100)
+             for i in range(lines_per_order)]
+    db.session.add_all(items)
+    db.session.flush()
+    for _ in range(order_count):
+        order = Order(user_id=user.id, total_harga=0, status='selesai')
+        db.session.add(order)
+        db.session.flush()
+        for item in items:
+            db.session.add(OrderDetail(order_id=order.id, item_id=item.id, jumlah=2, subtotal=item.harga * 2))
+            order.total_harga += item.harga * 2
+    db.session.commit()
+    return user.id, order.id
+
+
+def _statements(app, client, path):
+    client.get(path)  # pemanasan: cache katalog/layanan tidak ikut dihitung
+    with app.app_context():
+        with count_queries(db.engine) as counter:
+            response = client.get(path)
+    assert response.status_code == 200
+    return counter.count
+
+
+@pytest.mark.parametrize('path', ['/api/orders/user/{user_id}', '/api/orders/{order_id}'])
+def test_statement_count_does_not_grow_with_history(app, client, path):
+    with app.app_context():
+        small = _user_with_orders(1)
+        large = _user_with_orders(50)
+
+    small_count = _statements(app, client, path.format(user_id=small[0], order_id=small[1]))
+    large_count = _statements(app, client, path.format(user_id=large[0], order_id=large[1]))
+    assert small_count == large_count
+
+
+def test_user_orders_returns_full_history(app, client):
+    with app.app_context():
+        user_id, _ = _user_with_orders(50)
+
+    orders = client.get(f'/api/orders/user/{user_id}').get_json()
+    assert len(orders) == 50
+    assert all(len(order['items']) == 3 for order in orders)
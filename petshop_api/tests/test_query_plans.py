@@ -0,0 +1,19 @@
+# File: tests/test_query_plans.py
+#
+# Sama dengan `flask db-explain-check`: semua SELECT endpoint hot harus
+# memakai index (tidak ada full table scan / sort tanpa index).
+
+from app.query_plans import check_query_plans, HOT_ENDPOINTS
+from benchmarks import datagen
+
+SMALL_SCALE = {'users': 50, 'items': 200, 'orders': 500, 'bookings': 200}
+
+
+def test_hot_endpoints_use_indexes(app):
+    datagen.seed(app, SMALL_SCALE)
+
+    problems, checked = check_query_plans(app)
+
+    assert checked >= len(HOT_ENDPOINTS)
+    assert problems == [], '\n'.join(f'{kind} {table} di {path}: {" ".join(sql.split())[:200]}'
+                                     for path, kind, table, sql in problems)
@@ -0,0 +1,11 @@
+# File: wsgi.py
+#
+# Pintu masuk WSGI untuk server produksi (gunicorn/waitress).
+# Contoh: gunicorn -c gunicorn.conf.py wsgi:app
+
+import os
+
+from app import create_app
+from config import config_by_name
+
+app = create_app(config_by_name[os.environ.get('APP_ENV', 'production')])
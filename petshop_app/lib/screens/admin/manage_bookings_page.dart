@@ -15,10 +15,23 @@ class ManageBookingsPage extends StatefulWidget {
 class _ManageBookingsPageState extends State<ManageBookingsPage> with SingleTickerProviderStateMixin {
   final String _apiUrl = 'http://127.0.0.1:5000'; 
   bool _isLoading = true;
-  List<dynamic> _allBookings = [];
+
+  // Data per tab, diambil per halaman dari server (bukan semua booking sekaligus)
+  final Map<String, List<dynamic>> _bookingsByTab = {};
+  final Map<String, String?> _nextCursor = {};
+  final Set<String> _loadingTabs = {};
+  final int _pageSize = 20;
   
   late TabController _tabController;
   final List<String> _tabs = ['Perlu Konfirmasi', 'Jadwal Aktif', 'Selesai', 'Dibatalkan'];
+
+  // Status yang dikirim ke server untuk tiap tab
+  final Map<String, String> _tabStatus = {
+    'Perlu Konfirmasi': 'pending,menunggu_pembayaran,diproses',
+    'Jadwal Aktif': 'confirmed,diterima',
+    'Selesai': 'finished,selesai',
+    'Dibatalkan': 'batal',
+  };
   
   final formatRupiah = NumberFormat.currency(locale: 'id_ID', symbol: 'Rp ', decimalDigits: 0);
 
@@ -40,19 +53,39 @@ class _ManageBookingsPageState extends State<ManageBookingsPage> with SingleTick
     _fetchBookings();
   }
 
+  // Muat ulang dari halaman pertama (dipanggil saat buka halaman & setelah update status)
   Future<void> _fetchBookings() async {
     print("[ManageBookings] Fetching booking list...");
+    _bookingsByTab.clear();
+    _nextCursor.clear();
+    await _fetchPage(_tabs[_tabController.index]);
+  }
+
+  Future<void> _fetchPage(String tabName) async {
+    if (_loadingTabs.contains(tabName)) return;
+    final String? cursor = _nextCursor[tabName];
+    // Sudah halaman terakhir
+    if (_bookingsByTab.containsKey(tabName) && cursor == null) return;
+
+    _loadingTabs.add(tabName);
     try {
-      final response = await http.get(Uri.parse('$_apiUrl/api/admin/bookings'));
+      final uri = Uri.parse('$_apiUrl/api/admin/bookings').replace(queryParameters: {
+        'status': _tabStatus[tabName]!,
+        'limit': '$_pageSize',
+        if (cursor != null) 'cursor': cursor,
+      });
+      final response = await http.get(uri);
       print("[ManageBookings] API Status: ${response.statusCode}");
       
       if (response.statusCode == 200) {
+        final body = json.decode(response.body);
         if (mounted) {
           setState(() {
-            _allBookings = json.decode(response.body);
+            _bookingsByTab[tabName] = [...?_bookingsByTab[tabName], ...body['data']];
+            _nextCursor[tabName] = body['next_cursor'];
             _isLoading = false;
           });
-          print("[ManageBookings] Loaded ${_allBookings.length} bookings.");
+          print("[ManageBookings] Loaded ${_bookingsByTab[tabName]!.length} bookings ($tabName).");
         }
       } else {
         print("[ManageBookings] Failed to load bookings.");
@@ -61,35 +94,8 @@ class _ManageBookingsPageState extends State<ManageBookingsPage> with SingleTick
     } catch (e) {
       print("[ManageBookings] Error fetching bookings: $e");
       if (mounted) setState(() => _isLoading = false);
-    }
-  }
-
-  List<dynamic> _getBookingsByStatus(String tabName) {
-    switch (tabName) {
-      case 'Perlu Konfirmasi':
-        return _allBookings.where((b) => 
-            b['status'] == 'pending' || 
-            b['status'] == 'menunggu_pembayaran' || 
-            b['status'] == 'diproses'
-        ).toList();
-        
-      case 'Jadwal Aktif':
-        return _allBookings.where((b) => 
-            b['status'] == 'confirmed' || 
-            b['status'] == 'diterima'
-        ).toList();
-        
-      case 'Selesai':
-        return _allBookings.where((b) => 
-            b['status'] == 'finished' || 
-            b['status'] == 'selesai'
-        ).toList();
-        
-      case 'Dibatalkan':
-        return _allBookings.where((b) => b['status'] == 'batal').toList();
-        
-      default:
-        return [];
+    } finally {
+      _loadingTabs.remove(tabName);
     }
   }
 
@@ -209,7 +215,12 @@ class _ManageBookingsPageState extends State<ManageBookingsPage> with SingleTick
         : TabBarView(
             controller: _tabController,
             children: _tabs.map((tabName) {
-              final bookings = _getBookingsByStatus(tabName);
+              final bookings = _bookingsByTab[tabName];
+              if (bookings == null) {
+                // Tab lain baru diambil datanya saat pertama kali dibuka
+                _fetchPage(tabName);
+                return Center(child: CircularProgressIndicator(color: _accentColor));
+              }
               if (bookings.isEmpty) {
                 return Center(
                   child: Column(
@@ -223,10 +234,19 @@ class _ManageBookingsPageState extends State<ManageBookingsPage> with SingleTick
                 );
               }
 
+              final bool hasMore = _nextCursor[tabName] != null;
               return ListView.builder(
                 padding: const EdgeInsets.all(16),
-                itemCount: bookings.length,
-                itemBuilder: (ctx, i) => _buildBookingCard(bookings[i], tabName),
+                itemCount: bookings.length + (hasMore ? 1 : 0),
+                itemBuilder: (ctx, i) {
+                  if (i < bookings.length) return _buildBookingCard(bookings[i], tabName);
+                  // Baris terakhir terlihat -> ambil halaman berikutnya
+                  _fetchPage(tabName);
+                  return Padding(
+                    padding: const EdgeInsets.all(16),
+                    child: Center(child: CircularProgressIndicator(color: _accentColor)),
+                  );
+                },
               );
             }).toList(),
           ),
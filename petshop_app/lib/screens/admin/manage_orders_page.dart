@@ -15,10 +15,24 @@ class ManageOrdersPage extends StatefulWidget {
 class _ManageOrdersPageState extends State<ManageOrdersPage> with SingleTickerProviderStateMixin {
   final String _apiUrl = 'http://127.0.0.1:5000'; 
   bool _isLoading = true;
-  List<dynamic> _allOrders = [];
+
+  // Data per tab, diambil per halaman dari server (bukan semua order sekaligus)
+  final Map<String, List<dynamic>> _ordersByTab = {};
+  final Map<String, String?> _nextCursor = {};
+  final Set<String> _loadingTabs = {};
+  final int _pageSize = 20;
   
   late TabController _tabController;
   final List<String> _tabs = ['Perlu Cek', 'Perlu Kemas', 'Dikirim', 'Selesai', 'Dibatalkan'];
+
+  // Status yang dikirim ke server untuk tiap tab
+  final Map<String, String> _tabStatus = {
+    'Perlu Cek': 'pending,menunggu_pembayaran',
+    'Perlu Kemas': 'diproses',
+    'Dikirim': 'dikirim',
+    'Selesai': 'selesai',
+    'Dibatalkan': 'batal',
+  };
   final formatRupiah = NumberFormat.currency(locale: 'id_ID', symbol: 'Rp ', decimalDigits: 0);
 
   // --- PALET WARNA ELEGANT MIDNIGHT ---
@@ -39,19 +53,39 @@ class _ManageOrdersPageState extends State<ManageOrdersPage> with SingleTickerPr
     _fetchOrders();
   }
 
+  // Muat ulang dari halaman pertama (dipanggil saat buka halaman & setelah update status)
   Future<void> _fetchOrders() async {
     print("[ManageOrders] Fetching order list...");
+    _ordersByTab.clear();
+    _nextCursor.clear();
+    await _fetchPage(_tabs[_tabController.index]);
+  }
+
+  Future<void> _fetchPage(String tabName) async {
+    if (_loadingTabs.contains(tabName)) return;
+    final String? cursor = _nextCursor[tabName];
+    // Sudah halaman terakhir
+    if (_ordersByTab.containsKey(tabName) && cursor == null) return;
+
+    _loadingTabs.add(tabName);
     try {
-      final response = await http.get(Uri.parse('$_apiUrl/api/admin/orders'));
+      final uri = Uri.parse('$_apiUrl/api/admin/orders').replace(queryParameters: {
+        'status': _tabStatus[tabName]!,
+        'limit': '$_pageSize',
+        if (cursor != null) 'cursor': cursor,
+      });
+      final response = await http.get(uri);
       print("[ManageOrders] API Status: ${response.statusCode}");
       
       if (response.statusCode == 200) {
+        final body = json.decode(response.body);
         if (mounted) {
           setState(() {
-            _allOrders = json.decode(response.body);
+            _ordersByTab[tabName] = [...?_ordersByTab[tabName], ...body['data']];
+            _nextCursor[tabName] = body['next_cursor'];
             _isLoading = false;
           });
-          print("[ManageOrders] Loaded ${_allOrders.length} orders.");
+          print("[ManageOrders] Loaded ${_ordersByTab[tabName]!.length} orders ($tabName).");
         }
       } else {
         print("[ManageOrders] Failed to load orders.");
@@ -60,17 +94,8 @@ class _ManageOrdersPageState extends State<ManageOrdersPage> with SingleTickerPr
     } catch (e) {
       print("[ManageOrders] Error fetching orders: $e");
       if (mounted) setState(() => _isLoading = false);
-    }
-  }
-
-  List<dynamic> _getOrdersByStatus(String tabName) {
-    switch (tabName) {
-      case 'Perlu Cek': return _allOrders.where((o) => o['status'] == 'pending' || o['status'] == 'menunggu_pembayaran').toList();
-      case 'Perlu Kemas': return _allOrders.where((o) => o['status'] == 'diproses').toList();
-      case 'Dikirim': return _allOrders.where((o) => o['status'] == 'dikirim').toList();
-      case 'Selesai': return _allOrders.where((o) => o['status'] == 'selesai').toList();
-      case 'Dibatalkan': return _allOrders.where((o) => o['status'] == 'batal').toList();
-      default: return [];
+    } finally {
+      _loadingTabs.remove(tabName);
     }
   }
 
@@ -180,7 +205,12 @@ class _ManageOrdersPageState extends State<ManageOrdersPage> with SingleTickerPr
         : TabBarView(
             controller: _tabController,
             children: _tabs.map((tabName) {
-              final orders = _getOrdersByStatus(tabName);
+              final orders = _ordersByTab[tabName];
+              if (orders == null) {
+                // Tab lain baru diambil datanya saat pertama kali dibuka
+                _fetchPage(tabName);
+                return Center(child: CircularProgressIndicator(color: _accentColor));
+              }
               if (orders.isEmpty) {
                 return Center(
                   child: Column(
@@ -194,10 +224,19 @@ class _ManageOrdersPageState extends State<ManageOrdersPage> with SingleTickerPr
                 );
               }
               
+              final bool hasMore = _nextCursor[tabName] != null;
               return ListView.builder(
                 padding: const EdgeInsets.all(16),
-                itemCount: orders.length,
-                itemBuilder: (ctx, i) => _buildOrderCard(orders[i], tabName),
+                itemCount: orders.length + (hasMore ? 1 : 0),
+                itemBuilder: (ctx, i) {
+                  if (i < orders.length) return _buildOrderCard(orders[i], tabName);
+                  // Baris terakhir terlihat -> ambil halaman berikutnya
+                  _fetchPage(tabName);
+                  return Padding(
+                    padding: const EdgeInsets.all(16),
+                    child: Center(child: CircularProgressIndicator(color: _accentColor)),
+                  );
+                },
               );
             }).toList(),
           ),
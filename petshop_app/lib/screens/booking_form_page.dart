@@ -4,6 +4,7 @@ import 'package:flutter/material.dart';
 import 'package:http/http.dart' as http;
 import 'dart:convert';
 import 'package:intl/intl.dart';
+import '../services/idempotency.dart';
 
 class BookingFormPage extends StatefulWidget {
   final Map<String, dynamic> serviceData; 
@@ -37,6 +38,8 @@ class _BookingFormPageState extends State<BookingFormPage> {
   final List<String> _bankList = ['BCA', 'Mandiri', 'BRI', 'BNI', 'BSI'];
 
   bool _isSubmitting = false;
+  // Dipakai ulang kalau kirim booking diulang; diganti setelah server menjawab gagal
+  String _idempotencyKey = newIdempotencyKey();
   final String _apiUrl = 'http://127.0.0.1:5000'; 
 
   final formatRupiah = NumberFormat.currency(
@@ -140,7 +143,7 @@ class _BookingFormPageState extends State<BookingFormPage> {
 
       final response = await http.post(
         Uri.parse('$_apiUrl/api/bookings'),
-        headers: {'Content-Type': 'application/json'},
+        headers: {'Content-Type': 'application/json', 'Idempotency-Key': _idempotencyKey},
         body: json.encode(payload),
       );
 
@@ -150,6 +153,10 @@ class _BookingFormPageState extends State<BookingFormPage> {
         if (!mounted) return;
         _showSuccessDialog(); 
       } else {
+        // 409 + Retry-After = request yang sama masih diproses: kirim ulang dengan key yang sama
+        if (!isStillProcessing(response.statusCode, response.headers)) {
+          _idempotencyKey = newIdempotencyKey();
+        }
         throw Exception("Gagal booking status: ${response.statusCode}");
       }
     } catch (e) {
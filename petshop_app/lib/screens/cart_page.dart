@@ -189,7 +189,7 @@ class _CartPageState extends State<CartPage> {
                         ),
                         ClipRRect(
                           borderRadius: BorderRadius.circular(8), 
-                          child: Image(image: _getImage(item['gambar_url']), width: 60, height: 60, fit: BoxFit.cover)
+                          child: Image(image: _getImage(item['thumb_url'] ?? item['gambar_url']), width: 60, height: 60, fit: BoxFit.cover)
                         ),
                         const SizedBox(width: 12),
                         Expanded(
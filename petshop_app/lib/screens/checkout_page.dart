@@ -5,6 +5,7 @@ import 'package:intl/intl.dart';
 import 'package:http/http.dart' as http;
 import 'dart:convert';
 import '../services/cart_service.dart';
+import '../services/idempotency.dart';
 import 'payment_page.dart'; 
 
 class CheckoutPage extends StatefulWidget {
@@ -21,6 +22,8 @@ class CheckoutPage extends StatefulWidget {
 class _CheckoutPageState extends State<CheckoutPage> {
   final String _apiUrl = 'http://127.0.0.1:5000'; 
   bool _isLoading = false;
+  // Sama untuk setiap percobaan ulang checkout ini; diganti kalau server sudah menjawab gagal
+  String _idempotencyKey = newIdempotencyKey();
   final formatRupiah = NumberFormat.currency(locale: 'id_ID', symbol: 'Rp ', decimalDigits: 0);
   
   String _selectedBank = 'BCA';
@@ -66,7 +69,7 @@ class _CheckoutPageState extends State<CheckoutPage> {
 
       final response = await http.post(
         Uri.parse('$_apiUrl/api/orders'),
-        headers: {'Content-Type': 'application/json'},
+        headers: {'Content-Type': 'application/json', 'Idempotency-Key': _idempotencyKey},
         body: json.encode(bodyData),
       );
 
@@ -94,6 +97,10 @@ class _CheckoutPageState extends State<CheckoutPage> {
           ),
         );
       } else {
+        // 409 + Retry-After = request yang sama masih diproses: kirim ulang dengan key yang sama
+        if (!isStillProcessing(response.statusCode, response.headers)) {
+          _idempotencyKey = newIdempotencyKey();
+        }
         throw Exception(responseData['message']);
       }
     } catch (e) {
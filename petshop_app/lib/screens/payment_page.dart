@@ -5,6 +5,7 @@ import 'package:flutter/services.dart';
 import 'package:http/http.dart' as http;
 import 'package:intl/intl.dart';
 import 'dart:convert';
+import '../services/idempotency.dart';
 
 class PaymentPage extends StatefulWidget {
   final int orderId;
@@ -29,6 +30,8 @@ class PaymentPage extends StatefulWidget {
 class _PaymentPageState extends State<PaymentPage> {
   final String _apiUrl = 'http://127.0.0.1:5000'; 
   bool _isLoading = false;
+  // Tombol bayar ditekan ulang / request diulang -> server tidak memproses 2x
+  final String _idempotencyKey = newIdempotencyKey();
 
   final formatRupiah = NumberFormat.currency(
     locale: 'id_ID', symbol: 'Rp ', decimalDigits: 0,
@@ -63,7 +66,7 @@ class _PaymentPageState extends State<PaymentPage> {
     try {
       final response = await http.put(
         Uri.parse(url),
-        headers: {'Content-Type': 'application/json'},
+        headers: {'Content-Type': 'application/json', 'Idempotency-Key': _idempotencyKey},
         body: json.encode({}),
       );
 
@@ -150,7 +150,7 @@ class _SearchResultPageState extends State<SearchResultPage> {
                         ? const ColorFilter.mode(Colors.grey, BlendMode.saturation) 
                         : const ColorFilter.mode(Colors.transparent, BlendMode.multiply),
                     child: Image(
-                      image: _getImage(item['gambar_url']),
+                      image: _getImage(item['thumb_url'] ?? item['gambar_url']),
                       width: double.infinity,
                       fit: BoxFit.cover,
                       errorBuilder: (ctx, err, stack) => Icon(Icons.broken_image, color: _textGrey),
@@ -272,7 +272,7 @@ class _HomeTabState extends State<HomeTab> {
                   borderRadius: const BorderRadius.vertical(top: Radius.circular(16)), 
                   child: ColorFiltered(
                     colorFilter: isHabis ? const ColorFilter.mode(Colors.grey, BlendMode.saturation) : const ColorFilter.mode(Colors.transparent, BlendMode.multiply), 
-                    child: Image(image: _getImage(item['gambar_url']), width: double.infinity, fit: BoxFit.cover)
+                    child: Image(image: _getImage(item['thumb_url'] ?? item['gambar_url']), width: double.infinity, fit: BoxFit.cover)
                   )
                 ),
                 if (isHabis) Center(child: Container(padding: const EdgeInsets.symmetric(horizontal: 10, vertical: 5), decoration: BoxDecoration(color: Colors.black.withOpacity(0.8), borderRadius: BorderRadius.circular(5)), child: const Text("HABIS", style: TextStyle(color: Colors.white, fontWeight: FontWeight.bold)))),
@@ -23,6 +23,15 @@ class _OrdersTabState extends State<OrdersTab> with SingleTickerProviderStateMix
   List<dynamic> _productOrders = [];
   List<dynamic> _bookingOrders = [];
 
+  // Riwayat dimuat per halaman (?limit=&cursor=); halaman berikutnya diambil
+  // saat list di-scroll sampai bawah. Riwayat lama (arsip) hanya dibaca server
+  // kalau halaman sudah sampai ke sana.
+  static const int _pageSize = 20;
+  String? _orderCursor;
+  String? _bookingCursor;
+  bool _loadingMoreOrders = false;
+  bool _loadingMoreBookings = false;
+
   // Format Rupiah
   final formatRupiah = NumberFormat.currency(locale: 'id_ID', symbol: 'Rp ', decimalDigits: 0);
 
@@ -52,29 +61,50 @@ class _OrdersTabState extends State<OrdersTab> with SingleTickerProviderStateMix
     if(mounted) setState(() => _isLoading = false);
   }
 
-  Future<void> _fetchOrders() async {
+  // 1 halaman riwayat: {'data': [...], 'next_cursor': '...' / null}
+  Future<Map<String, dynamic>?> _fetchPage(String path, String? cursor) async {
+    final query = 'limit=$_pageSize${cursor != null ? '&cursor=${Uri.encodeQueryComponent(cursor)}' : ''}';
+    final res = await http.get(Uri.parse('$_apiUrl$path?$query'));
+    print("[OrdersTab] $path API Status: ${res.statusCode}");
+    if (res.statusCode != 200) return null;
+    return json.decode(res.body);
+  }
+
+  Future<void> _fetchOrders({bool more = false}) async {
+    if (more && (_orderCursor == null || _loadingMoreOrders)) return;
+    _loadingMoreOrders = more;
     try {
-      final res = await http.get(Uri.parse('$_apiUrl/api/orders/user/${widget.userId}'));
-      print("[OrdersTab] Orders API Status: ${res.statusCode}");
-      if (res.statusCode == 200) {
-        if(mounted) setState(() => _productOrders = json.decode(res.body));
+      final page = await _fetchPage('/api/orders/user/${widget.userId}', more ? _orderCursor : null);
+      if (page != null && mounted) {
+        setState(() {
+          _productOrders = more ? [..._productOrders, ...page['data']] : page['data'];
+          _orderCursor = page['next_cursor'];
+        });
         print("[OrdersTab] Loaded ${_productOrders.length} product orders.");
       }
     } catch (e) {
       debugPrint("[OrdersTab] Error fetching orders: $e");
+    } finally {
+      _loadingMoreOrders = false;
     }
   }
 
-  Future<void> _fetchBookings() async {
+  Future<void> _fetchBookings({bool more = false}) async {
+    if (more && (_bookingCursor == null || _loadingMoreBookings)) return;
+    _loadingMoreBookings = more;
     try {
-      final res = await http.get(Uri.parse('$_apiUrl/api/bookings/user/${widget.userId}'));
-      print("[OrdersTab] Bookings API Status: ${res.statusCode}");
-      if (res.statusCode == 200) {
-        if(mounted) setState(() => _bookingOrders = json.decode(res.body));
+      final page = await _fetchPage('/api/bookings/user/${widget.userId}', more ? _bookingCursor : null);
+      if (page != null && mounted) {
+        setState(() {
+          _bookingOrders = more ? [..._bookingOrders, ...page['data']] : page['data'];
+          _bookingCursor = page['next_cursor'];
+        });
         print("[OrdersTab] Loaded ${_bookingOrders.length} bookings.");
       }
     } catch (e) {
       debugPrint("[OrdersTab] Error fetching bookings: $e");
+    } finally {
+      _loadingMoreBookings = false;
     }
   }
 
@@ -209,14 +239,24 @@ class _OrdersTabState extends State<OrdersTab> with SingleTickerProviderStateMix
       );
     }
 
+    final hasMore = type == 'order' ? _orderCursor != null : _bookingCursor != null;
+
     return RefreshIndicator(
       onRefresh: _fetchAllData,
       color: _accentColor,
       backgroundColor: _bgLight,
       child: ListView.builder(
         padding: const EdgeInsets.all(16),
-        itemCount: data.length,
+        itemCount: data.length + (hasMore ? 1 : 0),
         itemBuilder: (context, index) {
+          // Baris terakhir = loading halaman berikutnya
+          if (index >= data.length) {
+            type == 'order' ? _fetchOrders(more: true) : _fetchBookings(more: true);
+            return Padding(
+              padding: const EdgeInsets.symmetric(vertical: 16),
+              child: Center(child: CircularProgressIndicator(color: _accentColor)),
+            );
+          }
           final item = data[index];
           final status = item['status'] ?? 'pending';
           
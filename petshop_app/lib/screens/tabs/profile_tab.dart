@@ -251,7 +251,7 @@ class _ProfileTabState extends State<ProfileTab> {
                                       child: CircleAvatar(
                                         radius: 35,
                                         backgroundColor: Colors.white.withOpacity(0.05),
-                                        backgroundImage: _getImage(pet['foto_url']),
+                                        backgroundImage: _getImage(pet['thumb_url'] ?? pet['foto_url']),
                                       ),
                                     ),
                                     const SizedBox(height: 10),
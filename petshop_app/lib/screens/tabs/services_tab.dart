@@ -119,7 +119,7 @@ class _ServicesTabState extends State<ServicesTab> {
                               child: ColorFiltered(
                                 colorFilter: const ColorFilter.mode(Colors.transparent, BlendMode.multiply), 
                                 child: Image(
-                                  image: _getImage(service['gambar_url']),
+                                  image: _getImage(service['thumb_url'] ?? service['gambar_url']),
                                   fit: BoxFit.cover,
                                   errorBuilder: (ctx, err, stack) => Icon(Icons.broken_image, color: _textGrey),
                                 ),
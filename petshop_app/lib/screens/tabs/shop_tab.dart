@@ -124,7 +124,7 @@ class _ShopTabState extends State<ShopTab> {
                         ? const ColorFilter.mode(Colors.grey, BlendMode.saturation) 
                         : const ColorFilter.mode(Colors.transparent, BlendMode.multiply),
                     child: Image(
-                      image: _getImage(item['gambar_url']),
+                      image: _getImage(item['thumb_url'] ?? item['gambar_url']),
                       width: double.infinity,
                       fit: BoxFit.cover,
                       errorBuilder: (ctx, err, stack) => Icon(Icons.broken_image, color: _textGrey),
@@ -0,0 +1,17 @@
+// File: lib/services/idempotency.dart
+
+import 'dart:math';
+
+// Key acak untuk header Idempotency-Key. Dipakai ulang saat request yang
+// sama dikirim lagi (mis. jaringan putus), supaya server tidak membuat
+// order/booking/pembayaran dobel.
+String newIdempotencyKey() {
+  final random = Random.secure();
+  return List.generate(16, (_) => random.nextInt(256).toRadixString(16).padLeft(2, '0')).join();
+}
+
+// Server membalas 409 + Retry-After kalau request dengan key ini masih diproses.
+// Key jangan diganti: request ulang akan dibalas dengan hasil request pertama.
+bool isStillProcessing(int statusCode, Map<String, String> headers) {
+  return statusCode == 409 && headers.containsKey('retry-after');
+}